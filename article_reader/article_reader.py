@@ -13,19 +13,64 @@ Uruchomienie skryptu odbywa się poprzez wywołanie:
 `python article_reader.py -i` - informacje o ilości przechowywanych artykułów
 `python article_reader.py -r id` - ustawia jako przeczytany artykuł o podanym numerze id
 `python article_reader.py -u id` - ustawia jako nieprzeczytany artykuł o podanym numerze id
+`python article_reader.py -w n` - odczyt artykułów z parsowaniem stron www w n procesach
+`python article_reader.py --stream` - odczyt artykułów z przyrostowym parsowaniem pobieranych stron www
+`python article_reader.py -e format` - eksport artykułów w formacie: jsonl, csv, rss, atom
+`python article_reader.py -e format --cursor name` - eksport artykułów dodanych od poprzedniego eksportu z kursorem name
+`python article_reader.py --serve port` - uruchomienie lokalnego serwera HTTP z artykułami
+`python article_reader.py --bodies` - odczyt artykułów oraz pobranie treści nowych artykułów
+`python article_reader.py --record archive` - odczyt artykułów z nagraniem odpowiedzi HTTP do archiwum
+`python article_reader.py --replay archive --latency s` - odczyt artykułów z archiwum, bez dostępu do sieci
+`python article_reader.py --host-rate r --host-burst b --fetch-stats` - odczyt artykułów z limitem r zapytań na
+sekundę do jednego serwera i wyświetleniem statystyk pobierania
+`python article_reader.py --sync-workers n` - odczyt artykułów w n procesach roboczych ze wspólną kolejką źródeł
+`python article_reader.py --worker --queue path` - proces roboczy dla kolejki źródeł (np. na innym komputerze)
+`python article_reader.py --search phrase` - wyszukanie artykułów po tytule (również w archiwum)
+`python article_reader.py --compact --retention-days n` - przeniesienie przeczytanych artykułów starszych niż n dni do
+skompresowanego archiwum
+`python article_reader.py --changes --cursor name` - wyświetlenie zmian (dodane, zmienione i usunięte artykuły)
+zapisanych w dzienniku zmian od poprzedniego odczytu z kursorem name
 
 Skrypt zawiera funkcje:
 - main - ...
 - get_command_arguments - Pobranie parametrów linii komend
 - show_articles_info - Wyświetlenie informacji o ilości artykułów
 - show_script_info - Wyświetlenie informacji o skrypcie
+- set_article_as_read - Ustawienie artykułu jako przeczytanego lub nieprzeczytanego
+- compact_store - Przeniesienie starych, przeczytanych artykułów do archiwum i wyświetlenie raportu
+- show_changes - Wyświetlenie zmian zapisanych w dzienniku zmian
 - get_page_content - Pobranie zawartości strony www
+- get_pages_content - Współbieżne pobranie surowej zawartości wielu stron www
+- show_fetch_stats - Wyświetlenie statystyk pobierania stron dla poszczególnych serwerów
+- get_page_stream - Strumieniowe pobranie zawartości strony www
 - get_articles - Pobranie informacji o artykułach
+- parse_page - Parsowanie jednej strony www do listy krotek (tytuł, link)
+- parse_pages - Parsowanie wielu stron www
+- get_articles_from_pages - Pobranie informacji o artykułach z wielu stron www
+- sync_sources - Synchronizacja artykułów z wielu źródeł
+- run_worker - Proces roboczy synchronizacji korzystający ze wspólnej kolejki źródeł
+- run_coordinator - Synchronizacja artykułów z wielu źródeł w wielu procesach roboczych
+- fetch_article_bodies - Pobranie treści nieprzeczytanych artykułów do magazynu treści
+- search_articles - Wyświetlenie artykułów wyszukanych po tytule (również w archiwum)
+- export_store - Eksport artykułów na standardowe wyjście
+- select_commands - Wybór poleceń podanych w linii komend
+- read_articles - Odczyt artykułów ze stron www i zapis do lokalnego źródła danych
 - sen_email - Wysłanie maila z informacją o nowych artykułach
 """
 
 # Standard library imports
-import os, smtplib, ssl, sys, pathlib
+import hashlib
+import json
+import multiprocessing
+import os
+import pathlib
+import smtplib
+import socket
+import ssl
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -36,15 +81,33 @@ from bs4 import BeautifulSoup
 
 # Local imports
 # sys.path.insert(0, str(pathlib.Path(__file__).parent)) # potrzebne do uruchomienia z pliki cli.py
-# from . import xml_helper
-# from . import common_helper
+# from . import normalize_helper
 # from . import logger_helper
-import xml_helper
-import common_helper
+# from . import stream_helper
+# from . import export_helper
+# from . import server_helper
+# from . import state_helper
+# from . import body_helper
+# from . import fetch_helper
+# from . import scheduler_helper
+# from . import queue_helper
+# from . import store_helper
+# from . import diff_helper
+import normalize_helper
 import logger_helper
-
-
-def get_command_arguments() -> tuple:
+import stream_helper
+import export_helper
+import server_helper
+import state_helper
+import body_helper
+import fetch_helper
+import scheduler_helper
+import queue_helper
+import store_helper
+import diff_helper
+
+
+def get_command_arguments() -> argparse.Namespace:
     """ Pobranie parametrów linii komend
 
     Funkcja sprawdza, czy w linii komend podane zostały parametry skryptu. Możliwe parametry:
@@ -53,10 +116,36 @@ def get_command_arguments() -> tuple:
     - set-read - Set article as read
     - set-unread - Set article as unread
     - show - Show articles: all, read, unread
-
-    :return: Zwracana jest informacja: version (True/False), info (True/False), set-read (None/number),
-    set-unread (None/number), show (all, read, unread)
-    :rtype: bool, bool, int, int, str, str
+    - workers - Number of processes used to parse downloaded pages
+    - stream - Parse pages incrementally while they are downloaded
+    - export - Export articles: jsonl, csv, rss, atom
+    - cursor - Name of the cursor used by incremental export and by the change log
+    - serve - Start local read-only HTTP server on the given port
+    - host - Address used by the HTTP server
+    - search - Search articles by title, including archived articles
+    - compact - Move old read articles to compressed archive
+    - retention-days - Age in days after which read articles are archived
+    - cold-format - Compression of archive partitions: gz, xz
+    - bodies - Fetch text of new articles after reading articles from the website
+    - body-workers - Maximum number of article pages downloaded at the same time
+    - record - Record HTTP responses to the given archive
+    - replay - Replay HTTP responses from the given archive instead of using the network
+    - latency - Simulated network latency in seconds used by replay
+    - host-rate - Maximum number of requests per second sent to one host
+    - host-burst - Number of requests that can be sent to one host without waiting
+    - fetch-stats - Show queue depth and wait time for every host after reading articles
+    - sync-workers - Read articles in the given number of worker processes sharing a queue of sources
+    - worker - Run a worker process for the shared queue of sources
+    - queue - Path to the shared queue of sources (SQLite database)
+    - changes - Show added, updated and removed articles from the change log
+
+    :return: Obiekt z parametrami: version (True/False), info (True/False), set_read (None/number),
+    set_unread (None/number), show (all, read, unread), workers (number), stream (True/False),
+    export (None/jsonl/csv/rss/atom), cursor (None/str), serve (None/number), host (str), search (None/str),
+    compact (True/False), retention_days (number), cold_format (gz/xz), bodies (True/False), body_workers (number),
+    record (None/str), replay (None/str), latency (number), host_rate (number), host_burst (number),
+    fetch_stats (True/False), sync_workers (None/number), worker (True/False), queue (None/str), changes (True/False)
+    :rtype: argparse.Namespace
     """
     parser = argparse.ArgumentParser(prog='Article reader',
                                      description='Management of articles. If you do not provide arguments, the script'
@@ -70,22 +159,66 @@ def get_command_arguments() -> tuple:
                         dest='set_unread')
     parser.add_argument('-s', '--show', help="Show articles: all, read, unread", action='store',
                         choices=['all', 'read', 'unread'], dest='show')
-    args = parser.parse_args()
-    return args.version, args.info, args.set_read, args.set_unread, args.show
-
-
-def show_articles_info(xml_file_path: str):
+    parser.add_argument('-w', '--workers', help="Number of processes used to parse downloaded pages", action='store',
+                        type=int, dest='workers', default=1)
+    parser.add_argument('--stream', help="Parse pages incrementally while they are downloaded", action='store_true',
+                        dest='stream', default=False)
+    parser.add_argument('-e', '--export', help="Export articles to standard output: jsonl, csv, rss, atom",
+                        action='store', choices=export_helper.EXPORT_FORMATS, dest='export')
+    parser.add_argument('--cursor', help="Export only articles added (or show only changes recorded) since the last "
+                                         "run with this cursor name", action='store', dest='cursor')
+    parser.add_argument('--serve', help="Start local HTTP server with articles on the given port", action='store',
+                        type=int, dest='serve')
+    parser.add_argument('--host', help="Address used by the HTTP server", action='store', dest='host',
+                        default='127.0.0.1')
+    parser.add_argument('--search', help="Search articles by title, including archived articles", action='store',
+                        dest='search')
+    parser.add_argument('--compact', help="Move old read articles to compressed archive", action='store_true',
+                        dest='compact', default=False)
+    parser.add_argument('--retention-days', help="Age in days after which read articles are archived",
+                        action='store', type=int, dest='retention_days', default=store_helper.RETENTION_DAYS)
+    parser.add_argument('--cold-format', help="Compression of archive partitions: gz, xz", action='store',
+                        choices=sorted(store_helper.COLD_FORMATS), dest='cold_format', default='gz')
+    parser.add_argument('--bodies', help="Fetch text of new articles after reading articles from the website",
+                        action='store_true', dest='bodies', default=False)
+    parser.add_argument('--body-workers', help="Maximum number of article pages downloaded at the same time",
+                        action='store', type=int, dest='body_workers', default=body_helper.DEFAULT_WORKERS)
+    fetch_group = parser.add_mutually_exclusive_group()
+    fetch_group.add_argument('--record', help="Record HTTP responses to the given archive", action='store',
+                             dest='record')
+    fetch_group.add_argument('--replay', help="Replay HTTP responses from the given archive instead of using the "
+                                              "network", action='store', dest='replay')
+    parser.add_argument('--latency', help="Simulated network latency in seconds used by replay", action='store',
+                        type=float, dest='latency', default=0.0)
+    parser.add_argument('--host-rate', help="Maximum number of requests per second sent to one host", action='store',
+                        type=float, dest='host_rate', default=scheduler_helper.DEFAULT_RATE)
+    parser.add_argument('--host-burst', help="Number of requests that can be sent to one host without waiting",
+                        action='store', type=int, dest='host_burst', default=scheduler_helper.DEFAULT_BURST)
+    parser.add_argument('--fetch-stats', help="Show queue depth and wait time for every host after reading articles",
+                        action='store_true', dest='fetch_stats', default=False)
+    parser.add_argument('--sync-workers', help="Read articles in the given number of worker processes sharing a queue "
+                                               "of sources", action='store', type=int, dest='sync_workers')
+    parser.add_argument('--worker', help="Run a worker process for the shared queue of sources", action='store_true',
+                        dest='worker', default=False)
+    parser.add_argument('--queue', help="Path to the shared queue of sources (SQLite database)", action='store',
+                        dest='queue')
+    parser.add_argument('--changes', help="Show added, updated and removed articles from the change log (JSON Lines)",
+                        action='store_true', dest='changes', default=False)
+    return parser.parse_args()
+
+
+def show_articles_info(store_dir: str):
     """ Wyświetlenie informacji o ilości artykułów.
 
     Funkcja zlicza artykuły przechowywane w lokalnym źródle danych i wyświetla informacje o wszystkich artykułach,
-    nowych artykułach, przeczytanych artykułach.
+    nowych artykułach, przeczytanych artykułach. Ilości są odczytywane z manifestu źródła danych.
 
-    :param xml_file_path: ścieżka do pliku xml z artykułami (lokalne źródło danych)
-    :type xml_file_path: str
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
     :return: ---
     :rtype: ---
     """
-    amount_all, amount_read = xml_helper.xml_find_all_articles(xml_file_path)
+    amount_all, amount_read = store_helper.store_info(store_dir)
     print(f"All articles: {amount_all}\nRead articles: {amount_read}")
 
 
@@ -111,21 +244,90 @@ def show_script_info(path_xml: str, path_logger: str, url: str) -> str:
     return info
 
 
-def get_page_content(url: str):
+def set_article_as_read(store_dir: str, article_id: int, read: bool):
+    """ Ustawienie artykułu jako przeczytanego lub nieprzeczytanego
+
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param article_id: identyfikator artykułu
+    :type article_id: int
+    :param read: True - artykuł został już przeczytany. False - artykuł jeszcze nie był czytany
+    :type read: bool
+    :return: ---
+    :rtype: ---
+    """
+    if store_helper.store_set_read(store_dir, article_id, read) is None:
+        msg = f"Node with the identifier {article_id} was not found"
+        logger_helper.log_error(msg)
+        print(msg)
+    elif read:
+        print(f"Article {article_id} was set as read")
+    else:
+        print(f"Article {article_id} was set as unread")
+
+
+def compact_store(store_dir: str, retention_days: int, cold_format: str):
+    """ Przeniesienie starych, przeczytanych artykułów do archiwum i wyświetlenie raportu
+
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param retention_days: wiek (w dniach), po którym przeczytane artykuły trafiają do archiwum
+    :type retention_days: int
+    :param cold_format: format kompresji archiwum: gz, xz
+    :type cold_format: str
+    :return: ---
+    :rtype: ---
+    """
+    report = store_helper.store_compact(store_dir, retention_days, cold_format)
+    print(f"Przeniesiono do archiwum {report['moved']} przeczytanych artykułów.")
+    print(f"Odzyskano {report['bytes_before'] - report['bytes_after']} bajtów "
+          f"(dane aktywne: {report['hot_bytes_before']} -> {report['hot_bytes_after']} bajtów).")
+    print(f"Czas ładowania danych aktywnych: {report['load_time_before']:.4f} s -> {report['load_time_after']:.4f} s")
+
+
+def show_changes(store_dir: str, cursor_path: str = None) -> int:
+    """ Wyświetlenie zmian zapisanych w dzienniku zmian
+
+    Zmiany są wypisywane na standardowe wyjście w formacie JSON Lines. Kursor przechowuje pozycję w dzienniku za
+    ostatnią wyświetloną zmianą, dzięki czemu kolejne wywołanie z tym samym kursorem wyświetla tylko nowe zmiany.
+
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param cursor_path: ścieżka do pliku z kursorem. None - wyświetlenie wszystkich zmian bez zapisu kursora
+    :type cursor_path: str
+    :return: Ilość wyświetlonych zmian
+    :rtype: int
+    """
+    offset = export_helper.export_read_cursor(cursor_path) if cursor_path else 0
+    amount = 0
+    for offset, change in diff_helper.diff_log_read(os.path.join(store_dir, store_helper.CHANGE_LOG_NAME), offset):
+        sys.stdout.write(json.dumps(change, ensure_ascii=False) + '\n')
+        amount += 1
+    if cursor_path and amount:
+        export_helper.export_write_cursor(cursor_path, offset)
+    return amount
+
+
+def get_page_content(url: str, raw: bool = False):
     """ Pobranie zawartości strony www
 
-    Na podstawie podanego adresu url funkcja pobiera i zwraca zawartość strony internetowej.
+    Na podstawie podanego adresu url funkcja pobiera i zwraca zawartość strony internetowej. Strona jest pobierana przez
+    warstwę pobierania (fetch_helper), dlatego w trybie replay jest odczytywana z archiwum zamiast z sieci.
 
     :param url: Pełny adres strony internetowej
     :type url: str
+    :param raw: True - zwracane są surowe bajty odpowiedzi (bez dekodowania znaków). False - zwracany jest tekst
+    :type raw: bool
     :return: HTML z zawartością strony spod podanego adresu url. Jeżeli pobranie zawartości nie powiodło się, to
     funkcja zwraca pustą wartość i zapisuje informację o błędzie do pliku logu
-    :rtype: str
+    :rtype: str | bytes
     """
     try:
-        response = requests.get(url)
+        response = fetch_helper.fetch_get(url)
         if not response.ok:
             response.raise_for_status()
+        elif raw:
+            return response.content
         else:
             return response.text
     except requests.exceptions.RequestException:
@@ -133,11 +335,67 @@ def get_page_content(url: str):
         return None
 
 
+def get_pages_content(urls: List[str]) -> List[Optional[bytes]]:
+    """ Współbieżne pobranie surowej zawartości wielu stron www
+
+    Strony są pobierane w puli wątków. O kolejności i tempie zapytań decyduje harmonogram pobrań (scheduler_helper),
+    który przeplata zapytania do różnych serwerów i przestrzega limitu zapytań dla każdego z nich.
+
+    :param urls: Lista pełnych adresów stron internetowych
+    :type urls: list[str]
+    :return: Lista surowych zawartości stron w kolejności adresów. None - nie udało się pobrać strony
+    :rtype: list[bytes]
+    """
+    if len(urls) <= 1:
+        return [get_page_content(url=url, raw=True) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(len(urls), scheduler_helper.DEFAULT_MAX_CONCURRENCY)) as executor:
+        return list(executor.map(lambda url: get_page_content(url=url, raw=True), urls))
+
+
+def show_fetch_stats() -> str:
+    """ Wyświetlenie statystyk pobierania stron dla poszczególnych serwerów
+
+    :return: Tekst ze statystykami: ilość zapytań, ilość odpowiedzi 429/503, największa kolejka, średni i najdłuższy
+    czas oczekiwania na zapytanie
+    :rtype: str
+    """
+    lines = []
+    for host, stats in sorted(scheduler_helper.scheduler_stats().items()):
+        lines.append(f"{host}: requests: {stats['requests']}, throttled: {stats['throttled']}, "
+                     f"queue: {stats['queue']} (max {stats['max_queue']}), wait: avg {stats['avg_wait']:.3f} s, "
+                     f"max {stats['max_wait']:.3f} s")
+    return '\n'.join(lines)
+
+
+def get_page_stream(url: str, chunk_size: int = 65536) -> Iterator[bytes]:
+    """ Strumieniowe pobranie zawartości strony www
+
+    Funkcja pobiera stronę internetową w kawałkach (response.iter_content), bez buforowania całej odpowiedzi i bez
+    dekodowania znaków. Jeżeli pobranie zawartości nie powiodło się, to generator nie zwraca żadnych danych, a
+    informacja o błędzie zapisywana jest do pliku logu.
+
+    :param url: Pełny adres strony internetowej
+    :type url: str
+    :param chunk_size: Wielkość pojedynczego kawałka w bajtach
+    :type chunk_size: int
+    :return: Generator kolejnych kawałków strony
+    :rtype: Iterator[bytes]
+    """
+    try:
+        with fetch_helper.fetch_get(url, stream=True) as response:
+            if not response.ok:
+                response.raise_for_status()
+            else:
+                yield from response.iter_content(chunk_size=chunk_size)
+    except requests.exceptions.RequestException:
+        logger_helper.log_error(f"Błędny adres URL: {url}")
+
+
 def get_articles(html: str) -> list:
     """ Pobranie informacji o artykułach.
 
     Funkcja wyszukuje w otrzymanym html-u artykuły i zwraca informacje o nich. Każdy artykuł zawiera tytuł oraz link do
-    strony www
+    strony www. Tytuł jest oczyszczany funkcją normalize_helper.normalize_text
 
     :param html: Html, w którym zawarte są artykuły
     :type html: str
@@ -151,12 +409,12 @@ def get_articles(html: str) -> list:
     for tag in soup.find_all('h2'):
         parent = tag.find_parent('a')
         link = parent.get('href')
-        list_articles.append([common_helper.remove_characters(tag.text), link])
+        list_articles.append([normalize_helper.normalize_text(tag.text), link])
 
     for tag in soup.find_all(class_='standard-promo perspective-color'):
         parent = tag.find_parent('a')
         link = parent.get('href')
-        list_articles.append([common_helper.remove_characters(tag.h3.text), link])
+        list_articles.append([normalize_helper.normalize_text(tag.h3.text), link])
 
     if len(list_articles) == 0:
         raise Exception("ERROR: I did not find the articles")
@@ -164,6 +422,433 @@ def get_articles(html: str) -> list:
     return list_articles
 
 
+def parse_page(content: bytes) -> List[Tuple[str, str]]:
+    """ Parsowanie jednej strony www do listy krotek (tytuł, link)
+
+    Funkcja jest wykonywana w procesach roboczych puli procesów. Otrzymuje surowe bajty strony i zwraca zwięzłe krotki,
+    dzięki czemu pomiędzy procesami przesyłana (pickle) jest jak najmniejsza ilość danych.
+
+    :param content: Surowa zawartość strony www
+    :type content: bytes
+    :return: Lista artykułów w postaci krotek (tytuł, link)
+    :rtype: list[(str, str)]
+    """
+    return [(title, link) for title, link in get_articles(content)]
+
+
+def parse_pages(pages: List[bytes], workers: int = 1) -> List[List[Tuple[str, str]]]:
+    """ Parsowanie wielu stron www
+
+    Funkcja parsuje podane strony www. Parsowanie w BeautifulSoup obciąża procesor i blokuje GIL, dlatego przy
+    workers > 1 strony są parsowane równolegle w puli procesów (ProcessPoolExecutor).
+
+    :param pages: Lista surowych zawartości stron www
+    :type pages: list[bytes]
+    :param workers: Ilość procesów parsujących. Wartość 1 oznacza parsowanie w bieżącym procesie
+    :type workers: int
+    :return: Lista artykułów dla każdej strony, w kolejności stron
+    :rtype: list[list[(str, str)]]
+    """
+    if workers <= 1 or len(pages) <= 1:
+        return [parse_page(content) for content in pages]
+    with ProcessPoolExecutor(max_workers=min(workers, len(pages))) as executor:
+        return list(executor.map(parse_page, pages))
+
+
+def get_articles_from_pages(pages: List[bytes], workers: int = 1) -> List[Tuple[str, str]]:
+    """ Pobranie informacji o artykułach z wielu stron www
+
+    Funkcja parsuje podane strony www (zob. parse_pages) i łączy znalezione artykuły w jedną listę. Kolejność
+    artykułów w wyniku odpowiada kolejności stron.
+
+    :param pages: Lista surowych zawartości stron www
+    :type pages: list[bytes]
+    :param workers: Ilość procesów parsujących. Wartość 1 oznacza parsowanie w bieżącym procesie
+    :type workers: int
+    :return: Lista artykułów w postaci krotek (tytuł, link)
+    :rtype: list[(str, str)]
+    """
+    list_articles = []
+    for page_articles in parse_pages(pages, workers):
+        list_articles.extend(page_articles)
+    return list_articles
+
+
+def _hash_chunks(chunks: Iterator[bytes], digest) -> Iterator[bytes]:
+    """ Przekazanie kawałków strony dalej z jednoczesnym wyliczaniem skrótu zawartości """
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+def _remember_first_title(articles: Iterator[Tuple[str, str]], first_titles: list) -> Iterator[Tuple[str, str]]:
+    """ Przekazanie artykułów dalej z zapamiętaniem tytułu pierwszego (najnowszego) artykułu """
+    for article in articles:
+        if not first_titles:
+            first_titles.append(article[0])
+        yield article
+
+
+def _parse_page_or_none(url: str, content: bytes):
+    """ Parsowanie strony www. W przypadku błędu zwracana jest pusta wartość, a błąd zapisywany do pliku logu """
+    try:
+        return parse_page(content)
+    except Exception:
+        logger_helper.log_exception(f"Błąd odczytu artykułów ze strony: {url}")
+        return None
+
+
+def sync_sources(urls: List[str], store_dir: str, state_file_path: str, workers: int = 1,
+                 stream: bool = False) -> Tuple[int, int]:
+    """ Synchronizacja artykułów z wielu źródeł
+
+    Funkcja przetwarza źródła, które nie zostały zatwierdzone w bieżącym przebiegu synchronizacji (zob. state_helper).
+    Strony są pobierane współbieżnie (get_pages_content), z limitami zapytań dla każdego serwera (scheduler_helper).
+    Strony, których zawartość nie zmieniła się od ostatniej synchronizacji, nie są parsowane. Zmiany artykułów każdego
+    źródła (nowe, zmienione i usunięte artykuły) są zapisywane osobno (store_helper.store_sync_source), a źródło jest
+    zatwierdzane zaraz po zapisie, dzięki czemu przerwany przebieg można wznowić.
+
+    :param urls: Lista adresów stron www z artykułami
+    :type urls: list[str]
+    :param store_dir: Katalog lokalnego źródła danych
+    :type store_dir: str
+    :param state_file_path: Ścieżka do pliku ze stanem synchronizacji
+    :type state_file_path: str
+    :param workers: Ilość procesów parsujących
+    :type workers: int
+    :param stream: True - strony są parsowane przyrostowo w trakcie pobierania
+    :type stream: bool
+    :return: Ilość nowo dodanych artykułów, ilość źródeł, których nie udało się przetworzyć
+    :rtype: int, int
+    """
+    state = state_helper.state_load(state_file_path)
+    pending = state_helper.state_begin_run(state, urls)
+    if stream:
+        added_articles, failed_sources = _sync_stream(state, pending, store_dir)
+    else:
+        added_articles, failed_sources = _sync_buffered(state, pending, store_dir, workers)
+    state_helper.state_end_run(state)
+    return added_articles, failed_sources
+
+
+def _sync_stream(state: dict, pending: List[str], store_dir: str) -> Tuple[int, int]:
+    """ Synchronizacja źródeł z parsowaniem stron w trakcie pobierania. Zwraca ilość nowo dodanych artykułów i ilość
+    źródeł, których nie udało się przetworzyć """
+    added_articles, failed_sources = 0, 0
+    for url in pending:
+        digest, first_titles = hashlib.sha256(), []
+        try:
+            articles = _remember_first_title(
+                stream_helper.stream_articles(_hash_chunks(get_page_stream(url), digest)), first_titles)
+            added_articles += store_helper.store_sync_source(store_dir, url, articles)['added']
+            state_helper.state_source_committed(state, url, digest.hexdigest(),
+                                                first_titles[0] if first_titles else None)
+        except Exception:
+            logger_helper.log_exception(f"Błąd odczytu artykułów ze strony: {url}")
+            state_helper.state_source_failed(state, url)
+            failed_sources += 1
+    return added_articles, failed_sources
+
+
+def _sync_buffered(state: dict, pending: List[str], store_dir: str, workers: int) -> Tuple[int, int]:
+    """ Synchronizacja źródeł z parsowaniem tylko zmienionych stron po pobraniu wszystkich stron. Zwraca ilość nowo
+    dodanych artykułów i ilość źródeł, których nie udało się przetworzyć """
+    added_articles, failed_sources = 0, 0
+    changed = []
+    for url, content in zip(pending, get_pages_content(pending)):
+        if not content:
+            state_helper.state_source_failed(state, url)
+            failed_sources += 1
+            continue
+        content_hash = state_helper.state_content_hash(content)
+        if state_helper.state_page_changed(state, url, content_hash):
+            changed.append((url, content, content_hash))
+        else:
+            state_helper.state_source_committed(state, url)
+    contents = [content for _, content, _ in changed]
+    try:
+        pages_articles = parse_pages(contents, workers=workers)
+    except Exception:
+        # Błąd jednej strony przerywa całą pulę - ustalenie, które strony nie dały się sparsować
+        pages_articles = [_parse_page_or_none(url, content) for url, content, _ in changed]
+    for (url, _, content_hash), articles in zip(changed, pages_articles):
+        if articles is None:
+            state_helper.state_source_failed(state, url)
+            failed_sources += 1
+            continue
+        added_articles += store_helper.store_sync_source(store_dir, url, articles)['added']
+        state_helper.state_source_committed(state, url, content_hash, articles[0][0])
+    return added_articles, failed_sources
+
+
+def run_worker(queue_path: str, fetch_config: dict = None, scheduler_config: dict = None, worker: str = None) -> int:
+    """ Proces roboczy synchronizacji korzystający ze wspólnej kolejki źródeł
+
+    Proces pobiera z kolejki (queue_helper) kolejne źródła, pobiera i parsuje ich strony, a znalezione artykuły zapisuje
+    w tabeli wyników kolejki. Strony, których zawartość nie zmieniła się od ostatniej synchronizacji, nie są parsowane.
+    Proces kończy działanie, gdy w kolejce nie ma już źródeł do przetworzenia.
+
+    :param queue_path: Ścieżka do kolejki źródeł
+    :type queue_path: str
+    :param fetch_config: Tryb pracy warstwy pobierania (fetch_helper.fetch_current_config). None - bez zmian
+    :type fetch_config: dict
+    :param scheduler_config: Limity harmonogramu pobrań (scheduler_helper.scheduler_current_config). None - bez zmian
+    :type scheduler_config: dict
+    :param worker: Identyfikator procesu roboczego. None - nazwa komputera i numer procesu
+    :type worker: str
+    :return: Ilość przetworzonych źródeł
+    :rtype: int
+    """
+    if fetch_config:
+        fetch_helper.fetch_configure(**fetch_config)
+    if scheduler_config:
+        scheduler_helper.scheduler_configure(**scheduler_config)
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    connection = queue_helper.queue_open(queue_path)
+    processed = 0
+    try:
+        while True:
+            job = queue_helper.queue_claim(connection, worker)
+            if job is None:
+                break
+            url, previous_hash = job
+            processed += 1
+            content = get_page_content(url=url, raw=True)
+            if not content:
+                queue_helper.queue_fail(connection, url)
+                continue
+            content_hash = state_helper.state_content_hash(content)
+            if content_hash == previous_hash:
+                queue_helper.queue_complete(connection, url, None, [])
+                continue
+            articles = _parse_page_or_none(url, content)
+            if articles is None:
+                queue_helper.queue_fail(connection, url)
+            else:
+                queue_helper.queue_complete(connection, url, content_hash, articles)
+    finally:
+        connection.close()
+    return processed
+
+
+def _merge_results(connection, state: dict, store_dir: str) -> Tuple[int, int]:
+    """ Przeniesienie wyników kolejki do lokalnego źródła danych - tak samo jak w sync_sources, osobno dla każdego
+    źródła. Zwraca ilość nowo dodanych artykułów i ilość źródeł, których nie udało się przetworzyć """
+    added_articles = 0
+    for url, (content_hash, articles) in queue_helper.queue_pending_results(connection).items():
+        try:
+            if content_hash is not None:
+                added_articles += store_helper.store_sync_source(store_dir, url, articles)['added']
+            state_helper.state_source_committed(state, url, content_hash, articles[0][0] if articles else None)
+            queue_helper.queue_mark_merged(connection, url)
+        except Exception:
+            logger_helper.log_exception(f"Błąd zapisu artykułów ze strony: {url}")
+            queue_helper.queue_fail(connection, url)
+    failed = queue_helper.queue_failed_sources(connection)
+    for url in failed:
+        state_helper.state_source_failed(state, url)
+    return added_articles, len(failed)
+
+
+def run_coordinator(urls: List[str], store_dir: str, state_file_path: str, queue_path: str,
+                    workers: int) -> Tuple[int, int]:
+    """ Synchronizacja artykułów z wielu źródeł w wielu procesach roboczych
+
+    Koordynator dodaje do wspólnej kolejki źródła, które nie zostały zatwierdzone w bieżącym przebiegu synchronizacji
+    (zob. state_helper), uruchamia podaną ilość procesów roboczych (run_worker) i czeka na przetworzenie wszystkich
+    źródeł - również przez procesy robocze uruchomione na innych komputerach. Następnie przenosi wyniki do lokalnego
+    źródła danych tak samo jak sync_sources: zmiany artykułów każdego źródła są zapisywane osobno
+    (store_helper.store_sync_source), a źródło jest zatwierdzane zaraz po zapisie. Źródło jest oznaczane w kolejce jako
+    przeniesione dopiero po zatwierdzeniu, dlatego przerwane przenoszenie można bezpiecznie powtórzyć.
+
+    Każdy proces roboczy ma własny harmonogram pobrań, dlatego limit zapytań do jednego serwera (rate) i pojemność
+    kubełka (burst, co najmniej 1) są dzielone przez ilość procesów roboczych - łącznie procesy nie przekraczają limitu.
+
+    :param urls: Lista adresów stron www z artykułami
+    :type urls: list[str]
+    :param store_dir: Katalog lokalnego źródła danych
+    :type store_dir: str
+    :param state_file_path: Ścieżka do pliku ze stanem synchronizacji
+    :type state_file_path: str
+    :param queue_path: Ścieżka do kolejki źródeł
+    :type queue_path: str
+    :param workers: Ilość procesów roboczych
+    :type workers: int
+    :return: Ilość nowo dodanych artykułów, ilość źródeł, których nie udało się przetworzyć
+    :rtype: int, int
+    """
+    state = state_helper.state_load(state_file_path)
+    pending = state_helper.state_begin_run(state, urls)
+    scheduler_config = scheduler_helper.scheduler_current_config()
+    scheduler_config.update(rate=scheduler_config['rate'] / workers, burst=max(1, scheduler_config['burst'] // workers))
+    connection = queue_helper.queue_open(queue_path)
+    try:
+        queue_helper.queue_enqueue(connection, pending, state_helper.state_content_hashes(state, pending))
+        processes = [multiprocessing.Process(target=run_worker,
+                                             args=(queue_path, fetch_helper.fetch_current_config(), scheduler_config))
+                     for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        # Źródła przetwarzane przez inne procesy - oczekiwanie na ich zakończenie lub przejęcie po upływie czasu
+        while True:
+            run_worker(queue_path)
+            if not queue_helper.queue_status(connection).get('claimed'):
+                break
+            time.sleep(1)
+        added_articles, failed_sources = _merge_results(connection, state, store_dir)
+    finally:
+        connection.close()
+    state_helper.state_end_run(state)
+    return added_articles, failed_sources
+
+
+def fetch_article_bodies(store_dir: str, cache_dir: str, workers: int = body_helper.DEFAULT_WORKERS) -> int:
+    """ Pobranie treści nieprzeczytanych artykułów do magazynu treści
+
+    Funkcja wybiera nieprzeczytane artykuły, które nie mają jeszcze zapisanej treści, pobiera ich strony współbieżnie
+    (body_helper.body_fetch_all) i zapisuje skróty treści w lokalnym źródle danych. Strony, których treść jest już w
+    magazynie (np. pobrana przez inny program), nie są pobierane ponownie.
+
+    :param store_dir: Katalog lokalnego źródła danych
+    :type store_dir: str
+    :param cache_dir: Katalog magazynu treści artykułów
+    :type cache_dir: str
+    :param workers: Maksymalna ilość jednocześnie pobieranych stron
+    :type workers: int
+    :return: Ilość artykułów, dla których zapisano treść
+    :rtype: int
+    """
+    links = {}
+    for article in store_helper.store_iter_articles(store_dir, 'unread'):
+        if 'body' not in article and article['link']:
+            links[int(article['id'])] = body_helper.body_canonical_link(article['link'], article['source'])
+    if not links:
+        return 0
+    hashes = body_helper.body_fetch_all(links.values(), cache_dir, lambda url: get_page_content(url, raw=True), workers)
+    bodies = {article_id: hashes[link] for article_id, link in links.items() if hashes.get(link)}
+    return store_helper.store_set_bodies(store_dir, bodies)
+
+
+def search_articles(store_dir: str, phrase: str) -> None:
+    """ Wyświetlenie artykułów wyszukanych po tytule (również w archiwum)
+
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param phrase: szukana fraza
+    :type phrase: str
+    :return: ---
+    :rtype: ---
+    """
+    for article in store_helper.store_search_articles(store_dir, phrase):
+        print(f"Artykuł o id: {article['id']}")
+        print(article['title'])
+        print(article['link'])
+
+
+def export_store(store_dir: str, export_format: str, cursor: str = None) -> None:
+    """ Eksport artykułów na standardowe wyjście
+
+    Przy eksporcie z kursorem partycje z artykułami wyeksportowanymi już wcześniej nie są w ogóle czytane.
+
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param export_format: format eksportu: jsonl, csv, rss, atom
+    :type export_format: str
+    :param cursor: nazwa kursora eksportu przyrostowego. None - eksport wszystkich artykułów
+    :type cursor: str
+    :return: ---
+    :rtype: ---
+    """
+    cursor_path, since_id = None, 0
+    if cursor:
+        cursor_path = os.path.join(store_dir, f'export_{cursor}.cursor')
+        since_id = export_helper.export_read_cursor(cursor_path)
+    articles = store_helper.store_iter_articles(store_dir, since_id=since_id)
+    for part in export_helper.export_articles(articles, export_format, cursor_path):
+        sys.stdout.write(part)
+
+
+def select_commands(args, store_dir: str, queue_path: str, logger_file_path: str,
+                    urls: List[str]) -> List[Tuple[bool, Optional[str], Callable[[], None]]]:
+    """ Wybór poleceń podanych w linii komend
+
+    :param args: parametry linii komend (get_command_arguments)
+    :type args: argparse.Namespace
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param queue_path: ścieżka do kolejki źródeł
+    :type queue_path: str
+    :param logger_file_path: ścieżka do pliku logów
+    :type logger_file_path: str
+    :param urls: adresy stron z artykułami
+    :type urls: list[str]
+    :return: Lista poleceń do wykonania w postaci (czy polecenie korzysta ze źródła danych, nagłówek lub None, funkcja
+    bez parametrów). Pusta lista - odczyt artykułów ze stron www
+    :rtype: list[(bool, str, Callable)]
+    """
+    changes_cursor = os.path.join(store_dir, f'changes_{args.cursor}.cursor') if args.cursor else None
+    commands = [
+        (args.version, False, "ABOUT SCRIPT:",
+         lambda: print(show_script_info(store_dir, logger_file_path, ', '.join(urls)))),
+        (args.info, True, "ARTICLES INFORMATION:", lambda: show_articles_info(store_dir)),
+        (args.set_read, True, "SET READ:", lambda: set_article_as_read(store_dir, args.set_read, True)),
+        (args.set_unread, True, "SET UNREAD:", lambda: set_article_as_read(store_dir, args.set_unread, False)),
+        (args.show, True, f"SHOW {args.show} ARTICLES:",
+         lambda: store_helper.store_show_articles(store_dir, args.show)),
+        (args.search, True, "SEARCH ARTICLES:", lambda: search_articles(store_dir, args.search)),
+        (args.compact, True, "COMPACT ARTICLES:",
+         lambda: compact_store(store_dir, args.retention_days, args.cold_format)),
+        (args.changes, True, None, lambda: show_changes(store_dir, changes_cursor)),
+        (args.export, True, None, lambda: export_store(store_dir, args.export, args.cursor)),
+        (args.worker, False, "SYNC WORKER:", lambda: print(f"Przetworzono {run_worker(queue_path)} źródeł.")),
+        (args.serve is not None, True, "HTTP SERVER:", lambda: server_helper.serve(store_dir, args.host, args.serve)),
+    ]
+    return [(uses_store, header, command) for enabled, uses_store, header, command in commands if enabled]
+
+
+def read_articles(args, urls: List[str], store_dir: str, state_file_path: str, queue_path: str,
+                  logger_file_path: str, body_cache_dir: str) -> None:
+    """ Odczyt artykułów ze stron www i zapis do lokalnego źródła danych
+
+    :param args: parametry linii komend (get_command_arguments)
+    :type args: argparse.Namespace
+    :param urls: adresy stron z artykułami
+    :type urls: list[str]
+    :param store_dir: katalog z artykułami (lokalne źródło danych)
+    :type store_dir: str
+    :param state_file_path: ścieżka do pliku ze stanem synchronizacji
+    :type state_file_path: str
+    :param queue_path: ścieżka do kolejki źródeł
+    :type queue_path: str
+    :param logger_file_path: ścieżka do pliku logów
+    :type logger_file_path: str
+    :param body_cache_dir: katalog magazynu treści artykułów
+    :type body_cache_dir: str
+    :return: ---
+    :rtype: ---
+    """
+    print('-' * 50, "READ ARTICLES FROM WWW PAGE:", '-' * 50)
+    if args.sync_workers:
+        added_articles, failed_sources = run_coordinator(urls, store_dir, state_file_path, queue_path,
+                                                         args.sync_workers)
+    else:
+        added_articles, failed_sources = sync_sources(urls, store_dir, state_file_path, args.workers, args.stream)
+    # przetestowałem wysyłanie poczty. Na razie je usuwam, aby nie trzymać na Githubie danych logowania do konta
+    # if added_articles:
+    #     send_email()
+    if failed_sources:
+        print(f"Błąd ładowania {failed_sources} stron www !!! Zajrzyj do pliku logu: {logger_file_path} !!!")
+    print(f"Dodano {added_articles} nowych artykułów.")
+    if args.bodies:
+        fetched_bodies = fetch_article_bodies(store_dir, body_cache_dir, args.body_workers)
+        print(f"Pobrano treść {fetched_bodies} artykułów.")
+    if args.fetch_stats:
+        print(show_fetch_stats())
+    print("Działanie programu zakończone.")
+
+
 def send_email():
     """ Wysłanie maila z informacją o nowych artykułach
 
@@ -206,54 +891,37 @@ def main():
     # Poniższa kombinacja z parentPath powoduje, że folder do zapisu danych programu zawsze jest szukany w tym samym
     # miejscu na dysku - niezależnie od folderu, z którego został uruchomiony program
     script_parent_folder = pathlib.Path(__file__).parent.parent
-    xml_file_path = os.path.join(f"{script_parent_folder}/data/saved_articles", 'articles.xml')
+    store_dir = f"{script_parent_folder}/data/saved_articles"
+    state_file_path = os.path.join(store_dir, 'sync_state.json')
     logger_file_path = f"{script_parent_folder}/data/app.log"
+    body_cache_dir = f"{script_parent_folder}/data/article_bodies"
 
-    url = 'https://www.deloitte.com/pl/pl/pages/technology/topics/blog-agile.html'
+    urls = ['https://www.deloitte.com/pl/pl/pages/technology/topics/blog-agile.html']
     logger_helper.init_logging(logger_file_path)
     # -------------------------------------------
 
     logger_helper.start_script()
 
     try:
-        get_data_from_web = True
         # Parser parametrów linii komend
-        version, info, set_read, set_unread, show = get_command_arguments()
-        if version:
-            print('-' * 50, "ABOUT SCRIPT:", '-' * 50)
-            print(show_script_info(xml_file_path, logger_file_path, url))
-            get_data_from_web = False
-        if info:
-            print('-' * 50, "ARTICLES INFORMATION:", '-' * 50)
-            show_articles_info(xml_file_path)
-            get_data_from_web = False
-        if set_read:
-            print('-' * 50, "SET READ:", '-' * 50)
-            xml_helper.xml_set_article_as_read(xml_file_path, set_read, True)
-            get_data_from_web = False
-        if set_unread:
-            print('-' * 50, "SET UNREAD:", '-' * 50)
-            xml_helper.xml_set_article_as_read(xml_file_path, set_unread, False)
-            get_data_from_web = False
-        if show:
-            print('-' * 50, f"SHOW {show} ARTICLES:", '-' * 50)
-            xml_helper.xml_show_articles(show, xml_file_path)
-            get_data_from_web = False
-
-        if get_data_from_web:
+        args = get_command_arguments()
+        scheduler_helper.scheduler_configure(args.host_rate, args.host_burst)
+        queue_path = args.queue or os.path.join(store_dir, 'sync_queue.sqlite')
+        if args.record:
+            fetch_helper.fetch_configure('record', args.record)
+        elif args.replay:
+            fetch_helper.fetch_configure('replay', args.replay, args.latency)
+        commands = select_commands(args, store_dir, queue_path, logger_file_path, urls)
+        if not commands or any(uses_store for uses_store, _, _ in commands):
+            # Polecenia, które nie korzystają ze źródła danych (np. -v), nie tworzą ani nie migrują katalogu
+            store_helper.store_open(store_dir, urls[0])
+        for _, header, command in commands:
+            if header:
+                print('-' * 50, header, '-' * 50)
+            command()
+        if not commands:
             # Pobranie zawartości strony www, odczyt nagłówków artykułów, zapis do lokalnego źródła danych
-            print('-' * 50, f"READ ARTICLES FROM WWW PAGE:", '-' * 50)
-            content = get_page_content(url=url)
-            if content:
-                articles = get_articles(html=content)
-                added_articles = xml_helper.xml_save_articles(articles, xml_file_path)
-                # przetestowałem wysyłanie poczty. Na razie je usuwam, aby nie trzymać na Githubie danych logowania do
-                # konta
-                # if added_articles:
-                #     send_email()
-                print(f"Dodano {added_articles} nowych artykułów.\nDziałanie programu zakończone.")
-            else:
-                print(f"Błąd ładowania strony www !!! Zajrzyj do pliku logu: {logger_file_path} !!!")
+            read_articles(args, urls, store_dir, state_file_path, queue_path, logger_file_path, body_cache_dir)
     except Exception:
         logger_helper.log_exception("!!! Niespodziewany wyjątek !!!")
         print(f"Program zakończony nieprawidłowo. Pojawił się niespodziewany wyjątek. Zajrzyj do pliku logu.")
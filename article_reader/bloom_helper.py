@@ -0,0 +1,274 @@
+"""
+Moduł zawiera funkcje do obsługi filtra Blooma z kluczami artykułów zapisanych w lokalnym pliku xml.
+
+Filtr jest zapisywany w pliku obok pliku z artykułami (articles.xml -> articles.bloom). Pozwala sprawdzić bez
+ładowania pliku xml, czy artykuł na pewno nie został jeszcze zapisany. Odpowiedź "być może jest zapisany" wymaga
+dokładnego sprawdzenia w pliku xml. W nagłówku filtra zapisywana jest sygnatura pliku xml (czas modyfikacji i wielkość).
+Filtr z inną sygnaturą jest nieaktualny i nie jest używany.
+
+Format pliku: MAGIC, nagłówek (k, m, count, mtime_ns, size), tablica bitów. Filtr niezwiązany z jednym plikiem xml
+(bloom_read, bloom_write) zapisuje w nagłówku w miejscu sygnatury pliku xml dowolną parę liczb podaną przez
+wywołującego.
+
+Klasy:
+- brak klas
+
+Funkcje:
+- bloom_path - Ścieżka do pliku filtra dla podanego pliku xml
+- bloom_article_key - Klucz artykułu w filtrze
+- bloom_create - Utworzenie pustego filtra
+- bloom_add - Dodanie klucza do filtra
+- bloom_contains - Sprawdzenie czy klucz może być w filtrze
+- bloom_xml_signature - Sygnatura pliku xml
+- bloom_load - Odczyt aktualnego filtra z pliku
+- bloom_save - Zapis filtra do pliku
+- bloom_read - Odczyt filtra z podaną sygnaturą
+- bloom_write - Zapis filtra z podaną sygnaturą
+- bloom_file_signature - Odczyt sygnatury pliku xml zapisanej w filtrze
+- bloom_after_rewrite - Aktualizacja sygnatury filtra po zapisie pliku xml bez zmiany kluczy
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- MAGIC - Znacznik początku pliku filtra
+- ERROR_RATE - Docelowe prawdopodobieństwo fałszywie pozytywnej odpowiedzi
+"""
+# Standard library imports
+import hashlib
+import math
+import os
+import struct
+from typing import Iterable, Optional
+
+# Local application import
+# from . import normalize_helper
+import normalize_helper
+
+MAGIC = b'ARBF2'
+ERROR_RATE = 0.001
+_HEADER = struct.Struct('<IQQqQ')
+_MIN_CAPACITY = 1024
+
+
+def bloom_path(xml_file_path: str) -> str:
+    """ Ścieżka do pliku filtra dla podanego pliku xml
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :return: Ścieżka do pliku filtra
+    :rtype: str
+    """
+    return os.path.splitext(xml_file_path)[0] + '.bloom'
+
+
+def bloom_article_key(title: str) -> str:
+    """ Klucz artykułu w filtrze
+
+    Kluczem jest klucz kanoniczny tytułu (normalize_helper.normalize_key), tak samo jak przy sprawdzaniu duplikatów w
+    store_helper.store_save_articles. Filtry zapisane z innym kluczem mają inny MAGIC i są budowane od nowa.
+
+    :param title: Tytuł artykułu
+    :type title: str
+    :return: Klucz artykułu
+    :rtype: str
+    """
+    return normalize_helper.normalize_key(title or '')
+
+
+def bloom_create(capacity: int) -> dict:
+    """ Utworzenie pustego filtra
+
+    Wielkość tablicy bitów oraz ilość funkcji skrótu są dobierane dla podanej pojemności i ERROR_RATE.
+
+    :param capacity: Przewidywana ilość kluczy w filtrze
+    :type capacity: int
+    :return: Filtr w postaci słownika z kluczami: k, m, count, bits
+    :rtype: dict
+    """
+    capacity = max(capacity, _MIN_CAPACITY)
+    m = int(math.ceil(-capacity * math.log(ERROR_RATE) / (math.log(2) ** 2)))
+    k = max(1, int(round(m / capacity * math.log(2))))
+    return {'k': k, 'm': m, 'count': 0, 'capacity': capacity, 'bits': bytearray((m + 7) // 8)}
+
+
+def _positions(bloom: dict, key: str):
+    """ Wyliczenie pozycji bitów klucza (podwójne haszowanie) """
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1, h2 = struct.unpack('<QQ', digest)
+    m = bloom['m']
+    return ((h1 + i * h2) % m for i in range(bloom['k']))
+
+
+def bloom_add(bloom: dict, key: str) -> None:
+    """ Dodanie klucza do filtra
+
+    :param bloom: Filtr
+    :type bloom: dict
+    :param key: Klucz artykułu
+    :type key: str
+    :return: ---
+    :rtype: ---
+    """
+    bits = bloom['bits']
+    for position in _positions(bloom, key):
+        bits[position >> 3] |= 1 << (position & 7)
+    bloom['count'] += 1
+
+
+def bloom_contains(bloom: dict, key: str) -> bool:
+    """ Sprawdzenie czy klucz może być w filtrze
+
+    :param bloom: Filtr
+    :type bloom: dict
+    :param key: Klucz artykułu
+    :type key: str
+    :return: False - klucza na pewno nie ma w filtrze. True - klucz być może jest w filtrze
+    :rtype: bool
+    """
+    bits = bloom['bits']
+    return all(bits[position >> 3] & (1 << (position & 7)) for position in _positions(bloom, key))
+
+
+def bloom_xml_signature(xml_file_path: str) -> Optional[tuple]:
+    """ Sygnatura pliku xml
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :return: Czas modyfikacji (ns) i wielkość pliku. None - jeżeli plik nie istnieje
+    :rtype: (int, int)
+    """
+    if not os.path.exists(xml_file_path):
+        return None
+    stat = os.stat(xml_file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def bloom_file_signature(xml_file_path: str) -> Optional[tuple]:
+    """ Odczyt sygnatury pliku xml zapisanej w filtrze
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :return: Sygnatura pliku xml zapisana w nagłówku filtra. None - jeżeli filtr nie istnieje lub jest uszkodzony
+    :rtype: (int, int)
+    """
+    path = bloom_path(xml_file_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as bloom_file:
+        data = bloom_file.read(len(MAGIC) + _HEADER.size)
+    if len(data) != len(MAGIC) + _HEADER.size or not data.startswith(MAGIC):
+        return None
+    _, _, _, mtime_ns, size = _HEADER.unpack_from(data, len(MAGIC))
+    return mtime_ns, size
+
+
+def bloom_load(xml_file_path: str) -> Optional[dict]:
+    """ Odczyt aktualnego filtra z pliku
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :return: Filtr. None - jeżeli filtr nie istnieje, jest uszkodzony albo nieaktualny względem pliku xml
+    :rtype: dict
+    """
+    signature = bloom_xml_signature(xml_file_path)
+    if signature is None:
+        return None
+    return bloom_read(bloom_path(xml_file_path), signature)
+
+
+def bloom_save(bloom: dict, xml_file_path: str, keys: Iterable[str] = None) -> dict:
+    """ Zapis filtra do pliku
+
+    Filtr jest zapisywany z aktualną sygnaturą pliku xml, dlatego funkcję należy wywołać po zapisie pliku xml. Jeżeli
+    ilość kluczy przekroczyła pojemność filtra, a podano wszystkie klucze (keys), to filtr jest budowany od nowa z
+    większą pojemnością.
+
+    :param bloom: Filtr
+    :type bloom: dict
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :param keys: Wszystkie klucze artykułów zapisanych w pliku xml (opcjonalnie)
+    :type keys: Iterable[str]
+    :return: Zapisany filtr (nowy, jeżeli został zbudowany od nowa)
+    :rtype: dict
+    """
+    signature = bloom_xml_signature(xml_file_path)
+    if signature is None:
+        return bloom
+    if keys is not None and bloom['count'] > bloom['capacity']:
+        keys = list(keys)
+        bloom = bloom_create(2 * len(keys))
+        for key in keys:
+            bloom_add(bloom, key)
+    bloom_write(bloom, bloom_path(xml_file_path), signature)
+    return bloom
+
+
+def bloom_read(path: str, signature: tuple) -> Optional[dict]:
+    """ Odczyt filtra z podaną sygnaturą
+
+    :param path: Ścieżka do pliku filtra
+    :type path: str
+    :param signature: Oczekiwana sygnatura (dwie liczby całkowite)
+    :type signature: (int, int)
+    :return: Filtr. None - jeżeli filtr nie istnieje, jest uszkodzony albo ma inną sygnaturę
+    :rtype: dict
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as bloom_file:
+        data = bloom_file.read()
+    if len(data) < len(MAGIC) + _HEADER.size or not data.startswith(MAGIC):
+        return None
+    k, m, count, *file_signature = _HEADER.unpack_from(data, len(MAGIC))
+    bits = bytearray(data[len(MAGIC) + _HEADER.size:])
+    if tuple(file_signature) != tuple(signature) or len(bits) != (m + 7) // 8:
+        return None
+    capacity = int(round(m * (math.log(2) ** 2) / -math.log(ERROR_RATE)))
+    return {'k': k, 'm': m, 'count': count, 'capacity': capacity, 'bits': bits}
+
+
+def bloom_write(bloom: dict, path: str, signature: tuple) -> None:
+    """ Zapis filtra z podaną sygnaturą
+
+    Zapis jest atomowy - dane trafiają do pliku tymczasowego, który następnie zastępuje plik filtra.
+
+    :param bloom: Filtr
+    :type bloom: dict
+    :param path: Ścieżka do pliku filtra
+    :type path: str
+    :param signature: Sygnatura zapisywana w nagłówku (dwie liczby całkowite)
+    :type signature: (int, int)
+    :return: ---
+    :rtype: ---
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as bloom_file:
+        bloom_file.write(MAGIC)
+        bloom_file.write(_HEADER.pack(bloom['k'], bloom['m'], bloom['count'], *signature))
+        bloom_file.write(bloom['bits'])
+    os.replace(temp_path, path)
+
+
+def bloom_after_rewrite(xml_file_path: str, previous_signature: Optional[tuple]) -> None:
+    """ Aktualizacja sygnatury filtra po zapisie pliku xml bez zmiany kluczy
+
+    Zmiana flagi read artykułu zapisuje plik xml ponownie, ale nie zmienia kluczy artykułów. Jeżeli przed zapisem
+    filtr był aktualny, to po zapisie aktualizowana jest tylko jego sygnatura.
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :param previous_signature: Sygnatura pliku xml sprzed zapisu (bloom_xml_signature)
+    :type previous_signature: (int, int)
+    :return: ---
+    :rtype: ---
+    """
+    if previous_signature is None or bloom_file_signature(xml_file_path) != previous_signature:
+        return
+    signature = bloom_xml_signature(xml_file_path)
+    with open(bloom_path(xml_file_path), 'r+b') as bloom_file:
+        bloom_file.seek(len(MAGIC))
+        k, m, count, _, _ = _HEADER.unpack(bloom_file.read(_HEADER.size))
+        bloom_file.seek(len(MAGIC))
+        bloom_file.write(_HEADER.pack(k, m, count, *signature))
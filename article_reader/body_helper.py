@@ -0,0 +1,212 @@
+"""
+Moduł zawiera funkcje do pobierania treści artykułów oraz do obsługi podręcznego magazynu (cache) tych treści.
+
+Treść artykułu jest pobierana ze strony wskazanej przez link, a następnie wyodrębniany jest z niej główny tekst. Tekst
+jest zapisywany w skompresowanym magazynie adresowanym zawartością: plik z tekstem ma nazwę równą skrótowi sha256
+tekstu, a osobny, mały plik wiąże kanoniczną postać linku ze skrótem tekstu. Dzięki temu każdy adres jest pobierany co
+najwyżej raz - niezależnie od tego, który program korzysta z magazynu - a identyczne treści są przechowywane tylko raz.
+
+Struktura katalogu:
+- objects/<ab>/<skrót tekstu>.gz - tekst artykułu (gzip, utf-8)
+- links/<ab>/<skrót linku> - skrót tekstu artykułu dla kanonicznego linku
+
+Klasy:
+- brak klas
+
+Funkcje:
+- body_canonical_link - Kanoniczna postać linku do artykułu
+- body_extract_text - Wyodrębnienie głównego tekstu artykułu ze strony www
+- body_cache_lookup - Odczyt skrótu treści zapisanej dla linku
+- body_cache_read - Odczyt treści artykułu z magazynu
+- body_cache_store - Zapis treści artykułu w magazynie
+- body_fetch_all - Współbieżne pobranie treści wielu artykułów
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- DEFAULT_WORKERS - Domyślna ilość jednocześnie pobieranych stron
+"""
+# Standard library imports
+import gzip
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Third party imports
+from bs4 import BeautifulSoup
+
+# Local application import
+# from . import logger_helper
+import logger_helper
+
+DEFAULT_WORKERS = 8
+_SKIPPED_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form')
+_TRACKING_PARAMETER = re.compile(r'^(utm_\w+|fbclid|gclid)$')
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def body_canonical_link(link: str, base_url: str = None) -> str:
+    """ Kanoniczna postać linku do artykułu
+
+    Link względny jest rozwijany względem adresu źródła. Schemat i nazwa serwera są zapisywane małymi literami, a
+    domyślny port, fragment (#...) oraz parametry śledzące (utm_*, fbclid, gclid) są usuwane. Pozostałe parametry są
+    sortowane.
+
+    :param link: Link do artykułu
+    :type link: str
+    :param base_url: Adres strony, na której znaleziono link
+    :type base_url: str
+    :return: Kanoniczna postać linku
+    :rtype: str
+    """
+    parts = urlsplit(urljoin(base_url, link.strip()) if base_url else link.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _TRACKING_PARAMETER.match(key))
+    return urlunsplit((scheme, netloc, parts.path or '/', urlencode(query), ''))
+
+
+def body_extract_text(html) -> str:
+    """ Wyodrębnienie głównego tekstu artykułu ze strony www
+
+    Ze strony usuwane są elementy niezwiązane z treścią (skrypty, nawigacja, nagłówek, stopka itp.). Tekst jest
+    pobierany z elementu <article>, a jeżeli go nie ma - z elementu <main> albo <body>. Akapity są rozdzielane pustą
+    linią.
+
+    :param html: Zawartość strony www
+    :type html: str | bytes
+    :return: Główny tekst artykułu
+    :rtype: str
+    """
+    soup = BeautifulSoup(html, features="lxml")
+    for tag in soup.find_all(_SKIPPED_TAGS):
+        tag.decompose()
+    content = soup.find('article') or soup.find('main') or soup.body or soup
+    paragraphs = [' '.join(tag.get_text(' ').split()) for tag in content.find_all(['h1', 'h2', 'h3', 'p', 'li'])]
+    paragraphs = [paragraph for paragraph in paragraphs if paragraph]
+    if not paragraphs:
+        paragraphs = [' '.join(content.get_text(' ').split())]
+    return '\n\n'.join(paragraphs)
+
+
+def _link_path(cache_dir: str, canonical_link: str) -> str:
+    digest = hashlib.sha256(canonical_link.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, 'links', digest[:2], digest)
+
+
+def _object_path(cache_dir: str, content_hash: str) -> str:
+    return os.path.join(cache_dir, 'objects', content_hash[:2], f"{content_hash}.gz")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """ Atomowy zapis pliku - dane trafiają do pliku tymczasowego, który następnie zastępuje plik docelowy """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as temp_file:
+        temp_file.write(data)
+    os.replace(temp_path, path)
+
+
+def body_cache_lookup(cache_dir: str, link: str) -> Optional[str]:
+    """ Odczyt skrótu treści zapisanej dla linku
+
+    :param cache_dir: Katalog magazynu treści artykułów
+    :type cache_dir: str
+    :param link: Link do artykułu (w postaci kanonicznej, zob. body_canonical_link)
+    :type link: str
+    :return: Skrót sha256 treści artykułu. None - treść nie została jeszcze pobrana
+    :rtype: str
+    """
+    path = _link_path(cache_dir, link)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='ascii') as link_file:
+        content_hash = link_file.read().strip()
+    return content_hash if os.path.exists(_object_path(cache_dir, content_hash)) else None
+
+
+def body_cache_read(cache_dir: str, content_hash: str) -> Optional[str]:
+    """ Odczyt treści artykułu z magazynu
+
+    :param cache_dir: Katalog magazynu treści artykułów
+    :type cache_dir: str
+    :param content_hash: Skrót sha256 treści artykułu
+    :type content_hash: str
+    :return: Treść artykułu. None - treści nie ma w magazynie
+    :rtype: str
+    """
+    path = _object_path(cache_dir, content_hash)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, 'rt', encoding='utf-8') as object_file:
+        return object_file.read()
+
+
+def body_cache_store(cache_dir: str, link: str, text: str) -> str:
+    """ Zapis treści artykułu w magazynie
+
+    Treść, która jest już w magazynie (ten sam skrót), nie jest zapisywana ponownie.
+
+    :param cache_dir: Katalog magazynu treści artykułów
+    :type cache_dir: str
+    :param link: Link do artykułu (w postaci kanonicznej, zob. body_canonical_link)
+    :type link: str
+    :param text: Treść artykułu
+    :type text: str
+    :return: Skrót sha256 treści artykułu
+    :rtype: str
+    """
+    data = text.encode('utf-8')
+    content_hash = hashlib.sha256(data).hexdigest()
+    object_path = _object_path(cache_dir, content_hash)
+    if not os.path.exists(object_path):
+        _write_atomic(object_path, gzip.compress(data))
+    _write_atomic(_link_path(cache_dir, link), content_hash.encode('ascii'))
+    return content_hash
+
+
+def body_fetch_all(links: Iterable[str], cache_dir: str, fetch: Callable[[str], bytes],
+                   workers: int = DEFAULT_WORKERS) -> Dict[str, Optional[str]]:
+    """ Współbieżne pobranie treści wielu artykułów
+
+    Linki, dla których treść jest już w magazynie, nie są pobierane. Pozostałe strony są pobierane w puli wątków, w
+    której jednocześnie działa co najwyżej workers pobrań. Błąd pobrania jednej strony jest zapisywany w logu i nie
+    przerywa pobierania pozostałych.
+
+    :param links: Linki do artykułów (w postaci kanonicznej, zob. body_canonical_link)
+    :type links: Iterable[str]
+    :param cache_dir: Katalog magazynu treści artykułów
+    :type cache_dir: str
+    :param fetch: Funkcja pobierająca surową zawartość strony www dla podanego adresu (None - błąd pobrania)
+    :type fetch: Callable[[str], bytes]
+    :param workers: Maksymalna ilość jednocześnie pobieranych stron
+    :type workers: int
+    :return: Słownik link -> skrót treści artykułu. None - nie udało się pobrać treści
+    :rtype: dict
+    """
+    result = {}
+    missing = []
+    for link in dict.fromkeys(links):
+        result[link] = body_cache_lookup(cache_dir, link)
+        if result[link] is None:
+            missing.append(link)
+
+    def fetch_one(link: str) -> Optional[str]:
+        try:
+            content = fetch(link)
+            return body_cache_store(cache_dir, link, body_extract_text(content)) if content is not None else None
+        except Exception:
+            logger_helper.log_exception(f"Błąd pobrania treści artykułu: {link}")
+            return None
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as executor:
+            result.update(zip(missing, executor.map(fetch_one, missing)))
+    return result
@@ -6,7 +6,6 @@ Klasy:
 
 Funkcje:
 - complete_link - Uzupełnienie linku do artykułu
-- remove_characters - Usuwanie zbędnych znaków z tekstu
 
 Wyjątki (exceptions):
 - brak
@@ -28,17 +27,3 @@ def complete_link(link):
     :rtype: str
     """
     return "https://www2.deloitte.com" + link
-
-
-def remove_characters(string: str) -> str:
-    """ Usuwanie zbędnych znaków z tekstu
-
-    Funkcja usuwa znak u'\xa0' (No-Break Space - &nbsp) oraz białe znaki z podanego ciągu znaków.
-
-    :param string: Ciąg znaków, z którego usuwane są znaki
-    :type string: str
-    :return: Ciąg znaków po usunięciu wskazanych znaków
-    :rtype: str
-    """
-    string = string.strip()
-    return string.replace(u'\xa0', ' ')
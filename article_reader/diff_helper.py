@@ -0,0 +1,168 @@
+"""
+Moduł zawiera funkcje do wykrywania zmian na liście artykułów źródła oraz do obsługi dziennika zmian.
+
+Migawka źródła (snapshot) to słownik: klucz kanoniczny tytułu (normalize_helper.normalize_key) -> [skrót, link], gdzie
+skrót jest wyliczany z tytułu i linku artykułu. Porównanie migawki z listą artykułów odczytaną ze strony www odbywa się
+w jednym przebiegu po liście i klasyfikuje artykuły jako:
+- dodane (added) - artykułu nie ma w migawce,
+- zmienione (updated) - artykuł o tym samym kluczu ma inny skrót (zmienił się link albo zapis tytułu) lub artykuł o
+  innym kluczu ma ten sam link co niedopasowany artykuł z migawki (zmienił się tytuł),
+- usunięte (removed) - artykuł z migawki nie występuje już na liście.
+
+Porównanie przyrostowe (diff_iter_compare) zwraca nowe artykuły od razu po ich odczytaniu, dzięki czemu mogą być
+zapisywane jeszcze w trakcie pobierania strony www.
+
+Dziennik zmian jest plikiem JSON Lines, do którego zmiany są tylko dopisywane. Każdy wiersz zawiera: ts (czas),
+src (źródło), op (add, upd, del), key (klucz artykułu - dla upd i del klucz z migawki), title i link (dla del link z
+migawki). Odbiorcy czytają dziennik od zapamiętanej pozycji w pliku (diff_log_read).
+
+Klasy:
+- brak klas
+
+Funkcje:
+- diff_digest - Skrót tytułu i linku artykułu
+- diff_iter_compare - Przyrostowe porównanie migawki źródła z listą artykułów odczytywaną ze strony www
+- diff_compare - Porównanie migawki źródła z listą artykułów odczytaną ze strony www
+- diff_log_append - Dopisanie zmian do dziennika zmian
+- diff_log_read - Odczyt dziennika zmian od podanej pozycji
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Local application import
+# from . import normalize_helper
+import normalize_helper
+
+
+def diff_digest(title: str, link: str) -> str:
+    """ Skrót tytułu i linku artykułu
+
+    :param title: Tytuł artykułu
+    :type title: str
+    :param link: Link do artykułu
+    :type link: str
+    :return: Skrót w postaci tekstowej (16 znaków)
+    :rtype: str
+    """
+    return hashlib.sha1(f"{title}\0{link}".encode('utf-8')).hexdigest()[:16]
+
+
+def diff_iter_compare(snapshot: Dict[str, List[str]], articles: Iterable[Sequence[str]], changes: Dict[str, list],
+                      new_snapshot: Dict[str, List[str]]) -> Iterator[Sequence[str]]:
+    """ Przyrostowe porównanie migawki źródła z listą artykułów odczytywaną ze strony www
+
+    Artykuły są porównywane w jednym przebiegu po liście - wyszukiwanie w migawce po kluczu oraz po linku odbywa się w
+    słownikach. Powtórzony artykuł (ten sam klucz) jest pomijany. Nowy artykuł jest zwracany przez generator od razu po
+    odczytaniu, zmiany są dopisywane do słownika changes, a nowa migawka jest budowana w słowniku new_snapshot.
+    Usunięte artykuły są zapisywane w changes['removed'] po wyczerpaniu listy artykułów.
+
+    :param snapshot: Migawka źródła: klucz -> [skrót, link]
+    :type snapshot: dict
+    :param articles: Artykuły w postaci [tytuł, link]. Dalsze elementy artykułu są pomijane przy porównaniu
+    :type articles: Iterable[list[str]]
+    :param changes: Zmiany ze słownikami: added - lista (tytuł, link), updated - lista (klucz z migawki, tytuł, link),
+    removed - lista (klucz z migawki, link z migawki)
+    :type changes: dict
+    :param new_snapshot: Nowa migawka źródła (początkowo pusta)
+    :type new_snapshot: dict
+    :return: Generator nowych artykułów (w postaci przekazanej w articles)
+    :rtype: Iterator[list[str]]
+    """
+    old_keys_by_link = {entry[1]: key for key, entry in snapshot.items()}
+    matched = set()
+    for article in articles:
+        title, link = article[0], article[1]
+        key = normalize_helper.normalize_key(title)
+        if key in new_snapshot:
+            continue
+        digest = diff_digest(title, link)
+        new_snapshot[key] = [digest, link]
+        old_key = key if key in snapshot and key not in matched else old_keys_by_link.get(link)
+        if old_key is None or old_key in matched or old_key in new_snapshot and old_key != key:
+            changes['added'].append((title, link))
+            yield article
+            continue
+        matched.add(old_key)
+        if old_key != key or snapshot[old_key][0] != digest:
+            changes['updated'].append((old_key, title, link))
+    changes['removed'] = [(key, entry[1]) for key, entry in snapshot.items() if key not in matched]
+
+
+def diff_compare(snapshot: Dict[str, List[str]],
+                 articles: Iterable[Sequence[str]]) -> Tuple[Dict[str, list], Dict[str, List[str]]]:
+    """ Porównanie migawki źródła z listą artykułów odczytaną ze strony www
+
+    :param snapshot: Migawka źródła: klucz -> [skrót, link]
+    :type snapshot: dict
+    :param articles: Artykuły w postaci [tytuł, link]
+    :type articles: Iterable[list[str]]
+    :return: Zmiany ze słownikami: added - lista (tytuł, link), updated - lista (klucz z migawki, tytuł, link), removed
+    - lista (klucz z migawki, link z migawki) oraz nowa migawka źródła
+    :rtype: dict, dict
+    """
+    changes = {'added': [], 'updated': [], 'removed': []}  # type: Dict[str, list]
+    new_snapshot = {}  # type: Dict[str, List[str]]
+    for _ in diff_iter_compare(snapshot, articles, changes, new_snapshot):
+        pass
+    return changes, new_snapshot
+
+
+def diff_log_append(log_path: str, source: str, changes: Dict[str, list]) -> int:
+    """ Dopisanie zmian do dziennika zmian
+
+    Wszystkie zmiany źródła są dopisywane jednym zapisem do pliku otwartego w trybie dopisywania.
+
+    :param log_path: Ścieżka do pliku dziennika zmian
+    :type log_path: str
+    :param source: Adres źródła
+    :type source: str
+    :param changes: Zmiany (wynik funkcji diff_compare)
+    :type changes: dict
+    :return: Ilość dopisanych wierszy
+    :rtype: int
+    """
+    ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    entries = [{'op': 'add', 'key': normalize_helper.normalize_key(title), 'title': title, 'link': link}
+               for title, link in changes['added']]
+    entries += [{'op': 'upd', 'key': key, 'title': title, 'link': link} for key, title, link in changes['updated']]
+    entries += [{'op': 'del', 'key': key, 'link': link} for key, link in changes['removed']]
+    if entries:
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        lines = ''.join(json.dumps(dict(ts=ts, src=source, **entry), ensure_ascii=False, separators=(',', ':')) + '\n'
+                        for entry in entries)
+        with open(log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write(lines)
+    return len(entries)
+
+
+def diff_log_read(log_path: str, offset: int = 0) -> Iterator[Tuple[int, dict]]:
+    """ Odczyt dziennika zmian od podanej pozycji
+
+    Dziennik jest czytany strumieniowo. Niekompletny ostatni wiersz (zapis w toku) jest pomijany.
+
+    :param log_path: Ścieżka do pliku dziennika zmian
+    :type log_path: str
+    :param offset: Pozycja w pliku (w bajtach), od której rozpoczyna się odczyt
+    :type offset: int
+    :return: Generator par: pozycja w pliku za odczytanym wierszem, zmiana w postaci słownika
+    :rtype: Iterator[(int, dict)]
+    """
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, 'rb') as log_file:
+        log_file.seek(offset)
+        for line in log_file:
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            yield offset, json.loads(line)
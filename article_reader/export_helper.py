@@ -0,0 +1,179 @@
+"""
+Moduł zawiera funkcje do eksportu artykułów z lokalnego źródła danych.
+
+Artykuły mogą być eksportowane w formatach: JSON Lines, CSV, RSS 2.0 oraz Atom. Wszystkie funkcje eksportu są
+generatorami, które zwracają kolejne fragmenty tekstu, dzięki czemu zużycie pamięci nie zależy od wielkości archiwum.
+Eksport przyrostowy korzysta z kursora - pliku z identyfikatorem ostatniego wyeksportowanego artykułu.
+
+Klasy:
+- brak klas
+
+Funkcje:
+- export_json_lines - Eksport artykułów w formacie JSON Lines
+- export_csv - Eksport artykułów w formacie CSV
+- export_rss - Eksport nieprzeczytanych artykułów jako kanał RSS 2.0
+- export_atom - Eksport nieprzeczytanych artykułów jako kanał Atom
+- export_articles - Eksport artykułów w podanym formacie
+- export_read_cursor - Odczyt kursora eksportu przyrostowego
+- export_write_cursor - Zapis kursora eksportu przyrostowego
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- EXPORT_FORMATS - Obsługiwane formaty eksportu
+"""
+# Standard library imports
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List
+from xml.sax.saxutils import escape
+
+EXPORT_FORMATS = ['jsonl', 'csv', 'rss', 'atom']
+_FEED_TITLE = 'Article reader - unread articles'
+
+
+def export_json_lines(articles: Iterable[Dict[str, str]]) -> Iterator[str]:
+    """ Eksport artykułów w formacie JSON Lines
+
+    :param articles: Artykuły w postaci słowników z kluczami: id, read, title, link
+    :type articles: Iterable[dict]
+    :return: Generator linii tekstu, po jednej na artykuł
+    :rtype: Iterator[str]
+    """
+    for article in articles:
+        yield json.dumps({'id': int(article['id']),
+                          'read': article['read'] == 'true',
+                          'title': article['title'],
+                          'link': article['link']}, ensure_ascii=False) + '\n'
+
+
+def export_csv(articles: Iterable[Dict[str, str]]) -> Iterator[str]:
+    """ Eksport artykułów w formacie CSV
+
+    Pierwsza linia zawiera nagłówek z nazwami kolumn.
+
+    :param articles: Artykuły w postaci słowników z kluczami: id, read, title, link
+    :type articles: Iterable[dict]
+    :return: Generator linii tekstu w formacie CSV
+    :rtype: Iterator[str]
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    columns: List[str] = ['id', 'read', 'title', 'link']
+    writer.writerow(columns)
+    for article in articles:
+        writer.writerow([article[column] for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_rss(articles: Iterable[Dict[str, str]]) -> Iterator[str]:
+    """ Eksport nieprzeczytanych artykułów jako kanał RSS 2.0
+
+    :param articles: Artykuły w postaci słowników z kluczami: id, read, title, link
+    :type articles: Iterable[dict]
+    :return: Generator fragmentów dokumentu RSS
+    :rtype: Iterator[str]
+    """
+    yield '<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel>\n'
+    yield f'<title>{_FEED_TITLE}</title><link>https://www2.deloitte.com</link>' \
+          f'<description>{_FEED_TITLE}</description>\n'
+    for article in articles:
+        if article['read'] == 'true':
+            continue
+        yield f'<item><title>{escape(article["title"])}</title><link>{escape(article["link"])}</link>' \
+              f'<guid isPermaLink="false">article-{article["id"]}</guid></item>\n'
+    yield '</channel></rss>\n'
+
+
+def export_atom(articles: Iterable[Dict[str, str]]) -> Iterator[str]:
+    """ Eksport nieprzeczytanych artykułów jako kanał Atom
+
+    :param articles: Artykuły w postaci słowników z kluczami: id, read, title, link
+    :type articles: Iterable[dict]
+    :return: Generator fragmentów dokumentu Atom
+    :rtype: Iterator[str]
+    """
+    updated = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    yield '<?xml version="1.0" encoding="utf-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">\n'
+    yield f'<title>{_FEED_TITLE}</title><id>urn:article-reader:unread</id><updated>{updated}</updated>\n'
+    for article in articles:
+        if article['read'] == 'true':
+            continue
+        link = escape(article['link'], {'"': '&quot;'})
+        yield f'<entry><title>{escape(article["title"])}</title><link href="{link}"/>' \
+              f'<id>urn:article-reader:article:{article["id"]}</id><updated>{updated}</updated></entry>\n'
+    yield '</feed>\n'
+
+
+def export_articles(articles: Iterable[Dict[str, str]], export_format: str,
+                    cursor_path: str = None) -> Iterator[str]:
+    """ Eksport artykułów w podanym formacie
+
+    Funkcja przekazuje artykuły do funkcji eksportu. Jeżeli podano kursor, to eksportowane są tylko artykuły dodane po
+    poprzednim eksporcie, a po zakończeniu eksportu kursor jest przesuwany na ostatni wyeksportowany artykuł.
+
+    :param articles: Artykuły w postaci słowników z kluczami: id, read, title, link, np. z
+    store_helper.store_iter_articles
+    :type articles: Iterable[dict]
+    :param export_format: Format eksportu: jsonl, csv, rss, atom
+    :type export_format: str
+    :param cursor_path: Ścieżka do pliku z kursorem. None - eksport wszystkich artykułów bez zapisu kursora
+    :type cursor_path: str
+    :return: Generator fragmentów tekstu w podanym formacie
+    :rtype: Iterator[str]
+    """
+    exporters = {'jsonl': export_json_lines, 'csv': export_csv, 'rss': export_rss, 'atom': export_atom}
+    since_id = export_read_cursor(cursor_path) if cursor_path else 0
+    last_id = since_id
+
+    def select_articles():
+        nonlocal last_id
+        for article in articles:
+            article_id = int(article['id'])
+            if article_id > since_id:
+                last_id = max(last_id, article_id)
+                yield article
+
+    yield from exporters[export_format](select_articles())
+    if cursor_path:
+        export_write_cursor(cursor_path, last_id)
+
+
+def export_read_cursor(cursor_path: str) -> int:
+    """ Odczyt kursora eksportu przyrostowego
+
+    :param cursor_path: Ścieżka do pliku z kursorem
+    :type cursor_path: str
+    :return: Identyfikator ostatniego wyeksportowanego artykułu. 0 - jeżeli kursor nie istnieje
+    :rtype: int
+    """
+    if not os.path.exists(cursor_path):
+        return 0
+    with open(cursor_path, 'r') as cursor_file:
+        return int(cursor_file.read().strip() or 0)
+
+
+def export_write_cursor(cursor_path: str, last_id: int) -> None:
+    """ Zapis kursora eksportu przyrostowego
+
+    Zapis jest atomowy - dane trafiają do pliku tymczasowego, który następnie zastępuje kursor.
+
+    :param cursor_path: Ścieżka do pliku z kursorem
+    :type cursor_path: str
+    :param last_id: Identyfikator ostatniego wyeksportowanego artykułu
+    :type last_id: int
+    :return: ---
+    :rtype: ---
+    """
+    temp_path = cursor_path + '.tmp'
+    with open(temp_path, 'w') as cursor_file:
+        cursor_file.write(str(last_id))
+    os.replace(temp_path, cursor_path)
@@ -0,0 +1,241 @@
+"""
+Moduł zawiera warstwę pobierania stron www z możliwością nagrywania i odtwarzania odpowiedzi HTTP.
+
+Wszystkie pobrania stron w programie przechodzą przez funkcję fetch_get. Dostępne są trzy tryby pracy:
+- live - strony są pobierane z sieci (domyślnie)
+- record - strony są pobierane z sieci, a odpowiedzi (status, nagłówki i treść) są dopisywane do archiwum
+- replay - odpowiedzi są odczytywane z archiwum, bez dostępu do sieci, z opcjonalnym opóźnieniem symulującym sieć
+
+Zapytania we wszystkich trybach przechodzą przez harmonogram pobrań (scheduler_helper), który ogranicza ilość zapytań
+do każdego serwera i obsługuje odpowiedzi 429/503 z nagłówkiem Retry-After.
+
+Archiwum ma format WARC/1.0 (rekordy typu response), a każdy rekord jest osobnym członem gzip (jak pliki .warc.gz).
+Dzięki temu archiwum jest zwarte, można je dopisywać bez przepisywania całości, a narzędzia obsługujące WARC potrafią je
+odczytać. Przy odtwarzaniu używana jest ostatnia odpowiedź nagrana dla danego adresu.
+
+Klasy:
+- brak klas
+
+Funkcje:
+- fetch_configure - Ustawienie trybu pracy warstwy pobierania
+- fetch_current_config - Odczyt bieżącego trybu pracy warstwy pobierania
+- fetch_get - Pobranie strony www zgodnie z trybem pracy
+- fetch_archive_write - Dopisanie odpowiedzi HTTP do archiwum
+- fetch_archive_read - Odczyt wszystkich odpowiedzi HTTP z archiwum
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- MODES - Dostępne tryby pracy
+- MAX_RETRIES - Maksymalna ilość ponowień zapytania po odpowiedzi 429/503
+"""
+# Standard library imports
+import contextlib
+import gzip
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict
+
+# Third party imports
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Local application import
+# from . import scheduler_helper
+import scheduler_helper
+
+MODES = ('live', 'record', 'replay')
+MAX_RETRIES = 3
+_THROTTLED_STATUSES = (429, 503)
+# Treść odpowiedzi jest zapisywana po zdekodowaniu, dlatego nagłówki opisujące kodowanie transferu są pomijane
+_SKIPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+_config = {'mode': 'live', 'archive_path': None, 'latency': 0.0, 'records': None}
+_lock = threading.Lock()
+
+
+def fetch_configure(mode: str = 'live', archive_path: str = None, latency: float = 0.0) -> None:
+    """ Ustawienie trybu pracy warstwy pobierania
+
+    :param mode: Tryb pracy: live, record, replay
+    :type mode: str
+    :param archive_path: Ścieżka do archiwum odpowiedzi (wymagana w trybach record i replay)
+    :type archive_path: str
+    :param latency: Opóźnienie (w sekundach) dodawane do każdej odpowiedzi w trybie replay
+    :type latency: float
+    :return: ---
+    :rtype: ---
+    """
+    if mode not in MODES:
+        raise ValueError(f"Nieznany tryb pobierania: {mode}")
+    if mode != 'live' and not archive_path:
+        raise ValueError(f"Tryb pobierania {mode} wymaga podania archiwum")
+    with _lock:
+        _config.update({'mode': mode, 'archive_path': archive_path, 'latency': latency, 'records': None})
+
+
+def fetch_current_config() -> dict:
+    """ Odczyt bieżącego trybu pracy warstwy pobierania
+
+    Wynik można przekazać do fetch_configure w innym procesie, aby pobierał strony w tym samym trybie.
+
+    :return: Słownik z kluczami: mode, archive_path, latency
+    :rtype: dict
+    """
+    return {'mode': _config['mode'], 'archive_path': _config['archive_path'], 'latency': _config['latency']}
+
+
+def fetch_get(url: str, stream: bool = False) -> requests.Response:
+    """ Pobranie strony www zgodnie z trybem pracy
+
+    Funkcja zwraca obiekt requests.Response niezależnie od trybu pracy, dlatego może zastąpić wywołanie requests.get.
+    W trybie replay brak nagranej odpowiedzi dla adresu jest zgłaszany jak błąd połączenia. Każde zapytanie czeka na
+    zgodę harmonogramu (scheduler_helper), a odpowiedź 429/503 wstrzymuje zapytania do serwera na czas z nagłówka
+    Retry-After i jest ponawiana co najwyżej MAX_RETRIES razy. Przy odpowiedzi strumieniowej miejsce w harmonogramie
+    jest zwalniane dopiero przy zamknięciu odpowiedzi (response.close), czyli po przeczytaniu jej treści.
+
+    :param url: Pełny adres strony internetowej
+    :type url: str
+    :param stream: True - odpowiedź będzie czytana w kawałkach (response.iter_content)
+    :type stream: bool
+    :return: Odpowiedź HTTP
+    :rtype: requests.Response
+    :exception: requests.exceptions.RequestException - błąd pobrania strony
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        with contextlib.ExitStack() as slot:
+            slot.enter_context(scheduler_helper.scheduler_slot(url))
+            response = _fetch_once(url, stream)
+            final = response.status_code not in _THROTTLED_STATUSES or attempt == MAX_RETRIES
+            if final and stream:
+                # treść jest czytana po powrocie z funkcji - miejsce zwalnia dopiero zamknięcie odpowiedzi
+                _release_on_close(response, slot.pop_all())
+        if final:
+            return response
+        scheduler_helper.scheduler_retry_after(url, response.headers.get('Retry-After'), attempt)
+        response.close()
+
+
+def _release_on_close(response: requests.Response, slot: contextlib.ExitStack) -> None:
+    """ Zwolnienie miejsca w harmonogramie razem z zamknięciem odpowiedzi (również w bloku with) """
+    close = response.close
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            slot.close()
+
+    response.close = close_and_release
+
+
+def _fetch_once(url: str, stream: bool) -> requests.Response:
+    """ Jedno zapytanie HTTP w bieżącym trybie pracy """
+    mode = _config['mode']
+    if mode == 'live':
+        return requests.get(url, stream=stream)
+    if mode == 'record':
+        response = requests.get(url)
+        fetch_archive_write(_config['archive_path'], url, response.status_code, response.reason or '',
+                            response.headers, response.content)
+        return response
+
+    with _lock:
+        if _config['records'] is None:
+            _config['records'] = fetch_archive_read(_config['archive_path'])
+        record = _config['records'].get(url)
+    if _config['latency']:
+        time.sleep(_config['latency'])
+    if record is None:
+        raise requests.exceptions.ConnectionError(f"Brak nagranej odpowiedzi dla adresu: {url}")
+    return _to_response(url, record)
+
+
+def _to_response(url: str, record: dict) -> requests.Response:
+    """ Utworzenie obiektu requests.Response z nagranej odpowiedzi """
+    response = requests.Response()
+    response.url = url
+    response.status_code = record['status']
+    response.reason = record['reason']
+    response.headers = CaseInsensitiveDict(record['headers'])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response._content = record['body']
+    response._content_consumed = True
+    return response
+
+
+def fetch_archive_write(archive_path: str, url: str, status: int, reason: str, headers, body: bytes) -> None:
+    """ Dopisanie odpowiedzi HTTP do archiwum
+
+    :param archive_path: Ścieżka do archiwum odpowiedzi
+    :type archive_path: str
+    :param url: Adres strony internetowej
+    :type url: str
+    :param status: Kod odpowiedzi HTTP
+    :type status: int
+    :param reason: Opis kodu odpowiedzi HTTP
+    :type reason: str
+    :param headers: Nagłówki odpowiedzi HTTP
+    :type headers: Mapping[str, str]
+    :param body: Treść odpowiedzi (po zdekodowaniu kodowania transferu)
+    :type body: bytes
+    :return: ---
+    :rtype: ---
+    """
+    http_headers = ''.join(f"{name}: {value}\r\n" for name, value in headers.items()
+                           if name.lower() not in _SKIPPED_HEADERS)
+    block = f"HTTP/1.1 {status} {reason}\r\n{http_headers}Content-Length: {len(body)}\r\n\r\n" \
+        .encode('iso-8859-1', errors='replace') + body
+    record = f"WARC/1.0\r\n" \
+             f"WARC-Type: response\r\n" \
+             f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n" \
+             f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n" \
+             f"WARC-Target-URI: {url}\r\n" \
+             f"Content-Type: application/http; msgtype=response\r\n" \
+             f"Content-Length: {len(block)}\r\n\r\n".encode('utf-8') + block + b"\r\n\r\n"
+    with _lock:
+        with open(archive_path, 'ab') as archive_file:
+            archive_file.write(gzip.compress(record))
+
+
+def fetch_archive_read(archive_path: str) -> Dict[str, dict]:
+    """ Odczyt wszystkich odpowiedzi HTTP z archiwum
+
+    :param archive_path: Ścieżka do archiwum odpowiedzi
+    :type archive_path: str
+    :return: Słownik adres -> odpowiedź w postaci słownika z kluczami: status, reason, headers, body. Dla adresu
+    nagranego wiele razy zwracana jest ostatnia odpowiedź
+    :rtype: dict
+    """
+    with gzip.open(archive_path, 'rb') as archive_file:
+        data = archive_file.read()
+    records = {}
+    position = 0
+    while position < len(data):
+        header_end = data.index(b'\r\n\r\n', position)
+        warc_headers = _parse_headers(data[position:header_end].decode('utf-8').split('\r\n')[1:], lower=True)
+        block_start = header_end + 4
+        block = data[block_start:block_start + int(warc_headers['content-length'])]
+        position = block_start + len(block) + 4
+        if warc_headers.get('warc-type') != 'response':
+            continue
+        http_end = block.index(b'\r\n\r\n')
+        lines = block[:http_end].decode('iso-8859-1').split('\r\n')
+        status_line = lines[0].split(' ', 2)
+        records[warc_headers['warc-target-uri']] = {'status': int(status_line[1]),
+                                                    'reason': status_line[2] if len(status_line) > 2 else '',
+                                                    'headers': _parse_headers(lines[1:]),
+                                                    'body': block[http_end + 4:]}
+    return records
+
+
+def _parse_headers(lines, lower: bool = False) -> Dict[str, str]:
+    """ Zamiana linii nagłówków "Nazwa: wartość" na słownik """
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(':')
+        if value:
+            headers[name.strip().lower() if lower else name.strip()] = value.strip()
+    return headers
@@ -0,0 +1,230 @@
+"""
+Moduł zawiera funkcje do obsługi indeksu pozycji artykułów w lokalnym pliku xml.
+
+Indeks jest zapisywany w pliku obok pliku z artykułami (articles.xml -> articles.idx). Dla każdego artykułu zawiera
+identyfikator, pozycję (offset) oraz długość elementu <article> w bajtach. Rekordy mają stałą długość i są posortowane
+po identyfikatorze, dzięki czemu plik indeksu jest mapowany do pamięci (mmap) i przeszukiwany binarnie.
+
+Atrybut read jest zapisywany w pliku xml ze stałą szerokością: read="false" albo read="true" (ze spacją), dlatego zmiana
+flagi read nadpisuje tylko 12 bajtów w miejscu, bez zapisu całego pliku. W nagłówku indeksu zapisywana jest sygnatura
+pliku xml (czas modyfikacji i wielkość). Indeks z inną sygnaturą jest automatycznie budowany od nowa.
+
+Format pliku: MAGIC, nagłówek (mtime_ns, size, count), rekordy (id, offset, length).
+
+Klasy:
+- brak klas
+
+Funkcje:
+- index_path - Ścieżka do pliku indeksu dla podanego pliku xml
+- index_pad_read_flags - Zapis atrybutu read ze stałą szerokością
+- index_build - Budowa indeksu pliku xml
+- index_lookup - Wyszukanie pozycji artykułu w pliku xml
+- index_read_article - Odczyt jednego artykułu bez parsowania całego pliku xml
+- index_set_read - Zmiana flagi read artykułu w miejscu
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- MAGIC - Znacznik początku pliku indeksu
+"""
+# Standard library imports
+import mmap
+import os
+import re
+import struct
+import xml.etree.ElementTree as ElementTree
+from typing import Optional, Tuple
+
+MAGIC = b'ARIX1'
+_HEADER = struct.Struct('<qQQ')
+_RECORD = struct.Struct('<QQQ')
+_ARTICLE_START = re.compile(rb'<article\b[^>]*>')
+_ARTICLE_ID = re.compile(rb'\bid="(\d+)"')
+_ARTICLE_END = b'</article>'
+_READ_FLAG = re.compile(rb'\bread="(?:false"|true" )')
+_READ_TRUE_UNPADDED = re.compile(rb'(<article\b[^<>]*? read="true")(?=[\s/>])')
+_READ_VALUES = {True: b'read="true" ', False: b'read="false"'}
+
+
+def index_path(xml_file_path: str) -> str:
+    """ Ścieżka do pliku indeksu dla podanego pliku xml
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :return: Ścieżka do pliku indeksu
+    :rtype: str
+    """
+    return os.path.splitext(xml_file_path)[0] + '.idx'
+
+
+def index_pad_read_flags(data: bytes) -> bytes:
+    """ Zapis atrybutu read ze stałą szerokością
+
+    Funkcja dopisuje spację po read="true" w znacznikach <article>, tak aby wartości true i false zajmowały tyle samo
+    bajtów. Dodatkowa spacja w znaczniku nie zmienia zawartości xml-a.
+
+    :param data: Zawartość pliku xml
+    :type data: bytes
+    :return: Zawartość pliku xml z atrybutami read o stałej szerokości
+    :rtype: bytes
+    """
+    return _READ_TRUE_UNPADDED.sub(rb'\1 ', data)
+
+
+def _xml_signature(xml_file_path: str) -> Tuple[int, int]:
+    """ Sygnatura pliku xml: czas modyfikacji (ns) i wielkość """
+    stat = os.stat(xml_file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def index_build(xml_file_path: str) -> None:
+    """ Budowa indeksu pliku xml
+
+    Plik xml jest mapowany do pamięci i przeszukiwany wyrażeniem regularnym - bez parsowania xml-a.
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :return: ---
+    :rtype: ---
+    """
+    records = []
+    signature = _xml_signature(xml_file_path)
+    if signature[1]:
+        with open(xml_file_path, 'rb') as xml_file, \
+                mmap.mmap(xml_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while True:
+                match = _ARTICLE_START.search(data, position)
+                if match is None:
+                    break
+                end = data.find(_ARTICLE_END, match.end())
+                id_match = _ARTICLE_ID.search(match.group(0))
+                if end < 0 or id_match is None:
+                    break
+                end += len(_ARTICLE_END)
+                records.append((int(id_match.group(1)), match.start(), end - match.start()))
+                position = end
+    records.sort()
+    path = index_path(xml_file_path)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as index_file:
+        index_file.write(MAGIC)
+        index_file.write(_HEADER.pack(signature[0], signature[1], len(records)))
+        for record in records:
+            index_file.write(_RECORD.pack(*record))
+    os.replace(temp_path, path)
+
+
+def _index_is_current(xml_file_path: str) -> bool:
+    """ Sprawdzenie czy indeks istnieje i odpowiada aktualnej zawartości pliku xml """
+    path = index_path(xml_file_path)
+    if not os.path.exists(path):
+        return False
+    with open(path, 'rb') as index_file:
+        data = index_file.read(len(MAGIC) + _HEADER.size)
+    if len(data) != len(MAGIC) + _HEADER.size or not data.startswith(MAGIC):
+        return False
+    mtime_ns, size, _ = _HEADER.unpack_from(data, len(MAGIC))
+    return (mtime_ns, size) == _xml_signature(xml_file_path)
+
+
+def _update_signature(xml_file_path: str) -> None:
+    """ Zapis aktualnej sygnatury pliku xml w nagłówku indeksu """
+    mtime_ns, size = _xml_signature(xml_file_path)
+    with open(index_path(xml_file_path), 'r+b') as index_file:
+        index_file.seek(len(MAGIC))
+        _, _, count = _HEADER.unpack(index_file.read(_HEADER.size))
+        index_file.seek(len(MAGIC))
+        index_file.write(_HEADER.pack(mtime_ns, size, count))
+
+
+def index_lookup(xml_file_path: str, article_id: int) -> Optional[Tuple[int, int]]:
+    """ Wyszukanie pozycji artykułu w pliku xml
+
+    Nieaktualny lub brakujący indeks jest budowany od nowa. Plik indeksu jest mapowany do pamięci i przeszukiwany
+    binarnie.
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :param article_id: Identyfikator artykułu
+    :type article_id: int
+    :return: Pozycja i długość elementu <article> w bajtach. None - jeżeli artykułu nie ma w pliku albo identyfikator
+    występuje w pliku więcej niż raz
+    :rtype: (int, int)
+    """
+    if not os.path.exists(xml_file_path):
+        return None
+    if not _index_is_current(xml_file_path):
+        index_build(xml_file_path)
+    with open(index_path(xml_file_path), 'rb') as index_file, \
+            mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        base = len(MAGIC) + _HEADER.size
+        _, _, count = _HEADER.unpack_from(data, len(MAGIC))
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if _RECORD.unpack_from(data, base + middle * _RECORD.size)[0] < article_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low >= count:
+            return None
+        record_id, offset, length = _RECORD.unpack_from(data, base + low * _RECORD.size)
+        if record_id != article_id:
+            return None
+        if low + 1 < count and _RECORD.unpack_from(data, base + (low + 1) * _RECORD.size)[0] == article_id:
+            return None
+        return offset, length
+
+
+def index_read_article(xml_file_path: str, article_id: int) -> Optional[ElementTree.Element]:
+    """ Odczyt jednego artykułu bez parsowania całego pliku xml
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :param article_id: Identyfikator artykułu
+    :type article_id: int
+    :return: Element xml z danymi o artykule. None - jeżeli artykułu nie znaleziono
+    :rtype: xml.etree.ElementTree.Element
+    """
+    position = index_lookup(xml_file_path, article_id)
+    if position is None:
+        return None
+    with open(xml_file_path, 'rb') as xml_file:
+        xml_file.seek(position[0])
+        return ElementTree.fromstring(xml_file.read(position[1]))
+
+
+def index_set_read(xml_file_path: str, article_id: int, read: bool) -> Optional[bool]:
+    """ Zmiana flagi read artykułu w miejscu
+
+    Funkcja odnajduje artykuł w indeksie i nadpisuje w pliku xml tylko wartość atrybutu read (stała szerokość 12
+    bajtów). Wielkość pliku nie zmienia się, dlatego po zmianie aktualizowana jest tylko sygnatura w nagłówku indeksu.
+
+    :param xml_file_path: Ścieżka do pliku xml z artykułami
+    :type xml_file_path: str
+    :param article_id: Identyfikator artykułu
+    :type article_id: int
+    :param read: True - artykuł przeczytany. False - artykuł nieprzeczytany
+    :type read: bool
+    :return: True - flaga zmieniona. None - zmiana w miejscu nie jest możliwa (brak artykułu, powtórzony identyfikator
+    albo atrybut read bez stałej szerokości) i należy zapisać cały plik
+    :rtype: bool
+    """
+    position = index_lookup(xml_file_path, article_id)
+    if position is None:
+        return None
+    offset, length = position
+    with open(xml_file_path, 'r+b') as xml_file:
+        xml_file.seek(offset)
+        record = xml_file.read(length)
+        start_tag = _ARTICLE_START.match(record)
+        flag = _READ_FLAG.search(record, 0, start_tag.end()) if start_tag else None
+        if flag is None:
+            return None
+        if flag.group(0) != _READ_VALUES[read]:
+            xml_file.seek(offset + flag.start())
+            xml_file.write(_READ_VALUES[read])
+    _update_signature(xml_file_path)
+    return True
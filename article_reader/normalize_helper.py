@@ -0,0 +1,62 @@
+"""
+Moduł zawiera funkcje do normalizacji tytułów artykułów.
+
+Tytuły odczytane ze stron www różnią się często tylko zapisem: wielkością liter, postacią polskich znaków
+diakrytycznych (NFC - jeden znak, NFD - litera i znak łączący), rodzajem cudzysłowów i myślników albo ilością spacji.
+Do wyszukiwania duplikatów i do wyszukiwania artykułów używany jest klucz kanoniczny (normalize_key), w którym te
+różnice są usunięte. Tytuł zapisywany w lokalnym źródle danych jest tylko oczyszczany (normalize_text), dzięki czemu
+pozostaje czytelny.
+
+Wyniki normalizacji są zapamiętywane w ograniczonej pamięci podręcznej (LRU), ponieważ te same tytuły są
+normalizowane w każdym cyklu synchronizacji.
+
+Klasy:
+- brak klas
+
+Funkcje:
+- normalize_text - Oczyszczenie tytułu artykułu do zapisu
+- normalize_key - Klucz kanoniczny tytułu artykułu
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- CACHE_SIZE - Ilość wyników zapamiętywanych przez każdą z funkcji normalizujących
+"""
+# Standard library imports
+import functools
+import unicodedata
+
+CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """ Oczyszczenie tytułu artykułu do zapisu
+
+    Znaki są zapisywane w postaci NFC, a ciągi białych znaków (również u'\xa0' - No-Break Space) są zamieniane na
+    jedną spację. Białe znaki na początku i na końcu tytułu są usuwane.
+
+    :param text: Tytuł artykułu
+    :type text: str
+    :return: Oczyszczony tytuł artykułu
+    :rtype: str
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def normalize_key(text: str) -> str:
+    """ Klucz kanoniczny tytułu artykułu
+
+    Tytuł jest normalizowany do postaci NFKC, a wielkość liter jest ujednolicana (casefold). Znaki interpunkcyjne
+    (kategoria Unicode P - również cudzysłowy i myślniki typograficzne) są zamieniane na spacje, a ciągi białych znaków
+    na jedną spację. Tytuły różniące się tylko zapisem mają ten sam klucz.
+
+    :param text: Tytuł artykułu
+    :type text: str
+    :return: Klucz kanoniczny
+    :rtype: str
+    """
+    text = unicodedata.normalize('NFKC', unicodedata.normalize('NFKC', text or '').casefold())
+    return ' '.join(''.join(' ' if unicodedata.category(char)[0] == 'P' else char for char in text).split())
@@ -0,0 +1,267 @@
+"""
+Moduł zawiera wspólną kolejkę zadań synchronizacji dla trybu koordynator/procesy robocze.
+
+Kolejka jest lokalną bazą SQLite. Koordynator dodaje do niej źródła (strony www), a procesy robocze - uruchomione na
+tym samym komputerze albo na innych komputerach ze wspólnym dyskiem - pobierają kolejne źródła, pobierają i parsują
+strony, a pełną listę artykułów każdego źródła zapisują w tabeli wyników. Zapis wyników jest idempotentny - ponowne
+przetworzenie źródła (np. po przejęciu zadania, którego proces roboczy nie zakończył w wyznaczonym czasie
+LEASE_SECONDS) zastępuje poprzednie wyniki źródła. Kluczem artykułu w tabeli wyników jest adres źródła i klucz
+kanoniczny tytułu (normalize_helper.normalize_key). Koordynator przenosi wyniki kolejnych źródeł do lokalnego źródła
+danych (store_helper) i oznacza źródła jako przeniesione.
+
+Tabele:
+- jobs (url, status: pending/claimed/done/failed/merged, worker, claimed_at, attempts, content_hash, result_hash)
+- articles (source, key, position, title, link)
+
+Klasy:
+- brak klas
+
+Funkcje:
+- queue_open - Otwarcie (i w razie potrzeby utworzenie) kolejki
+- queue_enqueue - Dodanie źródeł do kolejki
+- queue_claim - Pobranie kolejnego źródła do przetworzenia
+- queue_complete - Zapis wyników przetworzenia źródła
+- queue_fail - Zapis informacji o błędzie przetwarzania źródła
+- queue_status - Ilość zadań w poszczególnych stanach
+- queue_pending_results - Odczyt wyników, które nie zostały jeszcze przeniesione do źródła danych
+- queue_mark_merged - Oznaczenie wyników źródła jako przeniesionych do źródła danych
+- queue_failed_sources - Adresy źródeł, których nie udało się przetworzyć
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- LEASE_SECONDS - Czas, po którym niezakończone zadanie może zostać przejęte przez inny proces roboczy
+"""
+# Standard library imports
+import contextlib
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Local application import
+# from . import normalize_helper
+import normalize_helper
+
+LEASE_SECONDS = 300.0
+_SCHEMA_VERSION = 2
+_SCHEMA = '''
+DROP TABLE IF EXISTS jobs;
+DROP TABLE IF EXISTS articles;
+CREATE TABLE jobs (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    worker TEXT,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    result_hash TEXT
+);
+CREATE TABLE articles (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT,
+    PRIMARY KEY (source, key)
+)
+'''
+
+
+@contextlib.contextmanager
+def _transaction(connection: sqlite3.Connection):
+    """ Transakcja zapisu. BEGIN IMMEDIATE od razu blokuje bazę do zapisu dla innych procesów """
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        yield connection
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+def queue_open(queue_path: str) -> sqlite3.Connection:
+    """ Otwarcie (i w razie potrzeby utworzenie) kolejki
+
+    Baza działa w trybie WAL, dzięki czemu odczyty nie blokują zapisów, a zapisy z wielu procesów czekają na siebie
+    zamiast kończyć się błędem. Kolejka w starszym formacie (PRAGMA user_version) jest tworzona od nowa - zawiera tylko
+    zadania bieżącego cyklu, które koordynator dodaje ponownie.
+
+    :param queue_path: Ścieżka do pliku bazy SQLite
+    :type queue_path: str
+    :return: Połączenie z bazą w trybie autocommit
+    :rtype: sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(queue_path)), exist_ok=True)
+    connection = sqlite3.connect(queue_path, timeout=60, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    with _transaction(connection):
+        if connection.execute('PRAGMA user_version').fetchone()[0] < _SCHEMA_VERSION:
+            for statement in _SCHEMA.split(';'):
+                connection.execute(statement)
+            connection.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+    return connection
+
+
+def queue_enqueue(connection: sqlite3.Connection, urls: Iterable[str],
+                  content_hashes: Dict[str, Optional[str]] = None) -> int:
+    """ Dodanie źródeł do kolejki
+
+    Nowe źródła są dodawane jako oczekujące. Źródła zakończone w poprzednim cyklu (done, failed, merged) są ponownie
+    oznaczane jako oczekujące, a źródła przetwarzane właśnie przez proces roboczy pozostają bez zmian. Źródła, których
+    nie ma już na liście, są usuwane z kolejki razem z wynikami.
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :param urls: Adresy źródeł
+    :type urls: Iterable[str]
+    :param content_hashes: Skróty zawartości stron z ostatniej synchronizacji (state_helper). Proces roboczy nie parsuje
+    strony o tym samym skrócie. None - brak skrótów
+    :type content_hashes: dict
+    :return: Ilość źródeł oczekujących na przetworzenie
+    :rtype: int
+    """
+    urls, content_hashes = list(urls), content_hashes or {}
+    with _transaction(connection):
+        connection.execute('CREATE TEMP TABLE IF NOT EXISTS listed (url TEXT PRIMARY KEY)')
+        connection.execute('DELETE FROM listed')
+        connection.executemany('INSERT OR IGNORE INTO listed (url) VALUES (?)', ((url,) for url in urls))
+        connection.execute('DELETE FROM jobs WHERE url NOT IN (SELECT url FROM listed)')
+        connection.execute('DELETE FROM articles WHERE source NOT IN (SELECT url FROM listed)')
+        connection.executemany("INSERT INTO jobs (url, status, content_hash) VALUES (?, 'pending', ?) "
+                               "ON CONFLICT (url) DO UPDATE SET status = 'pending', worker = NULL, claimed_at = NULL, "
+                               "content_hash = excluded.content_hash, result_hash = NULL "
+                               "WHERE status IN ('done', 'failed', 'merged')",
+                               ((url, content_hashes.get(url)) for url in urls))
+    return queue_status(connection).get('pending', 0)
+
+
+def queue_claim(connection: sqlite3.Connection, worker: str,
+                lease: float = LEASE_SECONDS) -> Optional[Tuple[str, Optional[str]]]:
+    """ Pobranie kolejnego źródła do przetworzenia
+
+    Pobierane jest najstarsze oczekujące źródło albo źródło, którego inny proces roboczy nie zakończył w czasie lease.
+    Wybór i oznaczenie źródła odbywają się w jednej transakcji zapisu (BEGIN IMMEDIATE), dlatego dwa procesy robocze
+    nigdy nie dostaną jednocześnie tego samego źródła.
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :param worker: Identyfikator procesu roboczego
+    :type worker: str
+    :param lease: Czas (w sekundach), po którym niezakończone zadanie może zostać przejęte
+    :type lease: float
+    :return: Adres źródła i skrót zawartości strony z ostatniej synchronizacji. None - brak źródeł do przetworzenia
+    :rtype: (str, str)
+    """
+    now = time.time()
+    with _transaction(connection):
+        row = connection.execute("SELECT url, content_hash FROM jobs WHERE status = 'pending' "
+                                 "OR (status = 'claimed' AND claimed_at < ?) ORDER BY rowid LIMIT 1",
+                                 (now - lease,)).fetchone()
+        if row is not None:
+            connection.execute("UPDATE jobs SET status = 'claimed', worker = ?, claimed_at = ?, "
+                               "attempts = attempts + 1 WHERE url = ?", (worker, now, row[0]))
+    return None if row is None else (row[0], row[1])
+
+
+def queue_complete(connection: sqlite3.Connection, url: str, content_hash: Optional[str],
+                   articles: Sequence[Sequence[str]]) -> int:
+    """ Zapis wyników przetworzenia źródła
+
+    Pełna lista artykułów źródła jest zapisywana razem z oznaczeniem źródła jako zakończonego, w jednej transakcji, i
+    zastępuje poprzednie wyniki źródła. Z artykułów o tym samym kluczu kanonicznym tytułu zapisywany jest pierwszy.
+    Wyniki źródła, które zostało już przeniesione do źródła danych albo usunięte z kolejki, są pomijane.
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :param url: Adres źródła
+    :type url: str
+    :param content_hash: Skrót zawartości strony. None - strona bez zmian od ostatniej synchronizacji
+    :type content_hash: str
+    :param articles: Artykuły w postaci [tytuł, link]
+    :type articles: Sequence[list[str]]
+    :return: Ilość artykułów zapisanych w tabeli wyników
+    :rtype: int
+    """
+    with _transaction(connection):
+        row = connection.execute('SELECT status FROM jobs WHERE url = ?', (url,)).fetchone()
+        if row is None or row[0] not in ('claimed', 'done'):
+            return 0
+        connection.execute('DELETE FROM articles WHERE source = ?', (url,))
+        before = connection.total_changes
+        connection.executemany("INSERT INTO articles (source, key, position, title, link) VALUES (?, ?, ?, ?, ?) "
+                               "ON CONFLICT (source, key) DO NOTHING",
+                               ((url, normalize_helper.normalize_key(article[0]), position, article[0], article[1])
+                                for position, article in enumerate(articles)))
+        added = connection.total_changes - before
+        connection.execute("UPDATE jobs SET status = 'done', result_hash = ? WHERE url = ?", (content_hash, url))
+    return added
+
+
+def queue_fail(connection: sqlite3.Connection, url: str) -> None:
+    """ Zapis informacji o błędzie przetwarzania źródła
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :param url: Adres źródła
+    :type url: str
+    :return: ---
+    :rtype: ---
+    """
+    with _transaction(connection):
+        connection.execute("UPDATE jobs SET status = 'failed' WHERE url = ?", (url,))
+
+
+def queue_status(connection: sqlite3.Connection) -> Dict[str, int]:
+    """ Ilość zadań w poszczególnych stanach
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :return: Słownik stan -> ilość zadań (stany: pending, claimed, done, failed, merged)
+    :rtype: dict
+    """
+    return dict(connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+def queue_pending_results(connection: sqlite3.Connection) -> Dict[str, Tuple[Optional[str], List[Tuple[str, str]]]]:
+    """ Odczyt wyników, które nie zostały jeszcze przeniesione do źródła danych
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :return: Słownik adres źródła -> (skrót zawartości strony lub None - strona bez zmian, lista artykułów w postaci
+    (tytuł, link) w kolejności ze strony www). Źródła są w kolejności dodania do kolejki
+    :rtype: dict
+    """
+    results = {url: (result_hash, []) for url, result_hash in
+               connection.execute("SELECT url, result_hash FROM jobs WHERE status = 'done' ORDER BY rowid")}
+    for source, title, link in connection.execute("SELECT source, title, link FROM articles ORDER BY source, position"):
+        if source in results:
+            results[source][1].append((title, link))
+    return results
+
+
+def queue_mark_merged(connection: sqlite3.Connection, url: str) -> None:
+    """ Oznaczenie wyników źródła jako przeniesionych do źródła danych. Wyniki są usuwane z tabeli wyników
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :param url: Adres źródła
+    :type url: str
+    :return: ---
+    :rtype: ---
+    """
+    with _transaction(connection):
+        connection.execute("UPDATE jobs SET status = 'merged' WHERE url = ?", (url,))
+        connection.execute('DELETE FROM articles WHERE source = ?', (url,))
+
+
+def queue_failed_sources(connection: sqlite3.Connection) -> List[str]:
+    """ Adresy źródeł, których nie udało się przetworzyć
+
+    :param connection: Połączenie z kolejką
+    :type connection: sqlite3.Connection
+    :return: Adresy źródeł w kolejności dodania do kolejki
+    :rtype: list[str]
+    """
+    return [url for url, in connection.execute("SELECT url FROM jobs WHERE status = 'failed' ORDER BY rowid")]
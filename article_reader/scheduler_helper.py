@@ -0,0 +1,238 @@
+"""
+Moduł zawiera harmonogram pobrań stron www, który sprawiedliwie rozdziela zapytania pomiędzy serwery (hosty).
+
+Każdy serwer ma własny kubełek z żetonami (token bucket): żetony przybywają ze stałą szybkością (rate na sekundę), a
+kubełek mieści co najwyżej burst żetonów. Każde zapytanie zużywa jeden żeton, dlatego do jednego serwera nie trafia
+więcej zapytań niż pozwala limit, a zapytania do różnych serwerów nie czekają na siebie nawzajem. Łączna ilość
+jednocześnie wykonywanych zapytań jest ograniczona (max_concurrency). Gdy kilka serwerów może wykonać zapytanie, a
+wolne miejsce jest tylko jedno, to dostaje je serwer, który najdawniej był obsłużony (karuzela), dzięki czemu źródła z
+jednego serwera nie blokują pozostałych.
+
+Odpowiedź 429 (lub 503) z nagłówkiem Retry-After wstrzymuje wszystkie zapytania do danego serwera na podany czas.
+
+Klasy:
+- HostScheduler - Harmonogram pobrań z limitem zapytań dla każdego serwera
+
+Funkcje:
+- scheduler_configure - Ustawienie limitów domyślnego harmonogramu
+- scheduler_current_config - Odczyt limitów domyślnego harmonogramu
+- scheduler_slot - Oczekiwanie na możliwość wykonania zapytania do serwera
+- scheduler_retry_after - Wstrzymanie zapytań do serwera po odpowiedzi 429/503
+- scheduler_stats - Statystyki domyślnego harmonogramu dla poszczególnych serwerów
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- DEFAULT_RATE - Domyślna ilość zapytań na sekundę do jednego serwera
+- DEFAULT_BURST - Domyślna pojemność kubełka z żetonami
+- DEFAULT_MAX_CONCURRENCY - Domyślna łączna ilość jednocześnie wykonywanych zapytań
+- MAX_RETRY_AFTER - Maksymalny czas wstrzymania zapytań do serwera (w sekundach)
+"""
+# Standard library imports
+import collections
+import contextlib
+import itertools
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+# Local application import
+# from . import logger_helper
+import logger_helper
+
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+DEFAULT_MAX_CONCURRENCY = 16
+MAX_RETRY_AFTER = 120.0
+
+
+class HostScheduler:
+    """ Harmonogram pobrań z limitem zapytań dla każdego serwera
+
+    Wątki wywołują acquire przed wysłaniem zapytania i release po otrzymaniu odpowiedzi. Stan wszystkich serwerów jest
+    chroniony jednym obiektem threading.Condition.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        self._hosts = {}  # type: Dict[str, dict]
+        self._tickets = itertools.count()
+        self._in_flight = 0
+
+    def _host(self, host: str) -> dict:
+        state = self._hosts.get(host)
+        if state is None:
+            state = {'tokens': float(self.burst), 'updated': time.monotonic(), 'blocked_until': 0.0,
+                     'queue': collections.deque(), 'last_served': -1, 'requests': 0, 'throttled': 0,
+                     'wait_time': 0.0, 'max_wait': 0.0, 'max_queue': 0}
+            self._hosts[host] = state
+        return state
+
+    def _refill(self, state: dict, now: float) -> None:
+        state['tokens'] = min(float(self.burst), state['tokens'] + (now - state['updated']) * self.rate)
+        state['updated'] = now
+
+    def _ready_in(self, state: dict, now: float) -> float:
+        """ Czas (w sekundach), po którym serwer będzie mógł wykonać kolejne zapytanie """
+        self._refill(state, now)
+        token_wait = 0.0 if state['tokens'] >= 1.0 else (1.0 - state['tokens']) / self.rate
+        return max(token_wait, state['blocked_until'] - now, 0.0)
+
+    def acquire(self, host: str) -> float:
+        """ Oczekiwanie na możliwość wykonania zapytania do serwera. Zwraca czas oczekiwania w sekundach """
+        start = time.monotonic()
+        with self._condition:
+            state = self._host(host)
+            ticket = next(self._tickets)
+            state['queue'].append(ticket)
+            state['max_queue'] = max(state['max_queue'], len(state['queue']))
+            while True:
+                now = time.monotonic()
+                timeout = self._ready_in(state, now)
+                if state['queue'][0] == ticket and timeout == 0.0 and self._in_flight < self.max_concurrency and \
+                        self._is_next(host, now):
+                    break
+                if timeout == 0.0:
+                    timeout = None
+                self._condition.wait(timeout)
+            state['queue'].popleft()
+            state['tokens'] -= 1.0
+            state['last_served'] = next(self._tickets)
+            state['requests'] += 1
+            self._in_flight += 1
+            waited = time.monotonic() - start
+            state['wait_time'] += waited
+            state['max_wait'] = max(state['max_wait'], waited)
+            self._condition.notify_all()
+        return waited
+
+    def _is_next(self, host: str, now: float) -> bool:
+        """ Sprawdzenie czy serwer jest najdawniej obsłużonym spośród serwerów gotowych do wykonania zapytania """
+        ready = [name for name, state in self._hosts.items() if state['queue'] and self._ready_in(state, now) == 0.0]
+        return min(ready, key=lambda name: self._hosts[name]['last_served']) == host
+
+    def release(self, host: str) -> None:
+        """ Zwolnienie miejsca po otrzymaniu odpowiedzi z serwera """
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def block(self, host: str, delay: float) -> None:
+        """ Wstrzymanie zapytań do serwera na podany czas (w sekundach) """
+        with self._condition:
+            state = self._host(host)
+            state['blocked_until'] = max(state['blocked_until'], time.monotonic() + min(delay, MAX_RETRY_AFTER))
+            state['throttled'] += 1
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, dict]:
+        """ Statystyki dla poszczególnych serwerów: queue (aktualna ilość oczekujących zapytań), max_queue, requests,
+        throttled (ilość odpowiedzi 429/503), wait_time (łączny czas oczekiwania), avg_wait, max_wait """
+        with self._condition:
+            return {host: {'queue': len(state['queue']), 'max_queue': state['max_queue'],
+                           'requests': state['requests'], 'throttled': state['throttled'],
+                           'wait_time': state['wait_time'], 'max_wait': state['max_wait'],
+                           'avg_wait': state['wait_time'] / state['requests'] if state['requests'] else 0.0}
+                    for host, state in self._hosts.items()}
+
+
+_scheduler = HostScheduler()
+
+
+def scheduler_configure(rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                        max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+    """ Ustawienie limitów domyślnego harmonogramu
+
+    Statystyki zebrane do tej pory są usuwane.
+
+    :param rate: Ilość zapytań na sekundę do jednego serwera
+    :type rate: float
+    :param burst: Pojemność kubełka z żetonami - ilość zapytań, które można wysłać do serwera bez oczekiwania
+    :type burst: int
+    :param max_concurrency: Łączna ilość jednocześnie wykonywanych zapytań
+    :type max_concurrency: int
+    :return: ---
+    :rtype: ---
+    """
+    global _scheduler
+    _scheduler = HostScheduler(rate, burst, max_concurrency)
+
+
+def scheduler_current_config() -> dict:
+    """ Odczyt limitów domyślnego harmonogramu
+
+    Wynik można przekazać do scheduler_configure w innym procesie, aby pobierał strony z tymi samymi limitami.
+
+    :return: Słownik z kluczami: rate, burst, max_concurrency
+    :rtype: dict
+    """
+    return {'rate': _scheduler.rate, 'burst': _scheduler.burst, 'max_concurrency': _scheduler.max_concurrency}
+
+
+@contextlib.contextmanager
+def scheduler_slot(url: str) -> Iterator[float]:
+    """ Oczekiwanie na możliwość wykonania zapytania do serwera
+
+    Menedżer kontekstu czeka, aż zapytanie do serwera z podanego adresu będzie dozwolone, a po zakończeniu bloku
+    zwalnia zajęte miejsce.
+
+    :param url: Adres strony internetowej
+    :type url: str
+    :return: Czas oczekiwania w sekundach
+    :rtype: float
+    """
+    scheduler, host = _scheduler, urlsplit(url).netloc.lower()
+    waited = scheduler.acquire(host)
+    try:
+        yield waited
+    finally:
+        scheduler.release(host)
+
+
+def scheduler_retry_after(url: str, retry_after: Optional[str], attempt: int = 0) -> float:
+    """ Wstrzymanie zapytań do serwera po odpowiedzi 429/503
+
+    Nagłówek Retry-After może zawierać ilość sekund albo datę HTTP. Jeżeli nagłówka nie ma lub jest błędny, to czas
+    wstrzymania rośnie wykładniczo z każdą kolejną próbą (1, 2, 4, ... sekund).
+
+    :param url: Adres strony internetowej
+    :type url: str
+    :param retry_after: Wartość nagłówka Retry-After
+    :type retry_after: str
+    :param attempt: Numer kolejnej próby pobrania strony (od 0)
+    :type attempt: int
+    :return: Czas wstrzymania zapytań w sekundach
+    :rtype: float
+    """
+    delay = float(2 ** attempt)
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                pass
+    delay = min(max(delay, 0.0), MAX_RETRY_AFTER)
+    host = urlsplit(url).netloc.lower()
+    logger_helper.log_warning(f"Serwer {host} ogranicza zapytania - wstrzymanie na {delay:.1f} s")
+    _scheduler.block(host, delay)
+    return delay
+
+
+def scheduler_stats() -> Dict[str, dict]:
+    """ Statystyki domyślnego harmonogramu dla poszczególnych serwerów
+
+    :return: Słownik serwer -> statystyki z kluczami: queue, max_queue, requests, throttled, wait_time, avg_wait,
+    max_wait (zob. HostScheduler.stats)
+    :rtype: dict
+    """
+    return _scheduler.stats()
@@ -0,0 +1,254 @@
+"""
+Moduł zawiera lokalny serwer HTTP udostępniający artykuły z lokalnego źródła danych.
+
+Serwer przechowuje artykuły w pamięci i wczytuje je ponownie tylko wtedy, gdy zmienił się manifest źródła danych.
+Odpowiedzi są w formacie JSON i zawierają nagłówek ETag, dzięki czemu klienci mogą tanio sprawdzać, czy dane się
+zmieniły (nagłówek If-None-Match i odpowiedź 304).
+
+Dostępne zasoby:
+- GET /articles?read=false&limit=50&offset=0 - Stronicowana lista artykułów
+- GET /stats - Ilość wszystkich, przeczytanych i nieprzeczytanych artykułów
+- POST /articles/{id}/read - Ustawienie artykułu jako przeczytanego (?read=false - jako nieprzeczytanego)
+
+Klasy:
+- ArticleStore - Artykuły załadowane do pamięci
+- ArticleRequestHandler - Obsługa zapytań HTTP
+
+Funkcje:
+- create_server - Utworzenie serwera HTTP
+- serve - Uruchomienie serwera HTTP
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- DEFAULT_LIMIT - Domyślna ilość artykułów na stronie
+- MAX_LIMIT - Maksymalna ilość artykułów na stronie
+"""
+# Standard library imports
+import hashlib
+import json
+import os
+import re
+import threading
+import xml.etree.ElementTree as ElementTree
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Local application import
+# from . import logger_helper
+# from . import store_helper
+import logger_helper
+import store_helper
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class ArticleStore:
+    """ Artykuły załadowane do pamięci
+
+    Obiekt trzyma artykuły ze wszystkich partycji źródła danych (store_helper) w słowniku id -> węzeł artykułu. Dane są
+    ładowane ponownie, gdy zmieni się manifest źródła danych. Wersja danych jest zwiększana przy każdej zmianie i służy
+    do wyliczenia nagłówka ETag.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self.version = 0
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, ElementTree.Element] = {}
+        self._signature = None
+        self._loaded = False
+        self.reload()
+
+    def reload(self) -> None:
+        """ Ponowne załadowanie artykułów, jeżeli manifest źródła danych zmienił się na dysku """
+        with self._lock:
+            signature = self._manifest_signature()
+            if signature == self._signature and self._loaded:
+                return
+            nodes = {}
+            manifest = store_helper.store_load_manifest(self.store_dir)
+            for partition in sorted(manifest['partitions'].values(), key=lambda item: item['min_id']):
+                tree = store_helper.store_load_partition(self.store_dir, partition)
+                for node in tree.getroot().findall('article'):
+                    nodes[node.get('id')] = node
+            self._nodes = dict(sorted(nodes.items(), key=lambda item: int(item[0])))
+            self._signature = signature
+            self._loaded = True
+            self.version += 1
+
+    def etag(self, query: str) -> str:
+        """ Wyliczenie nagłówka ETag dla podanego zapytania """
+        digest = hashlib.sha1(f"{self.version}:{self._signature}:{query}".encode('utf-8')).hexdigest()[:16]
+        return f'"{digest}"'
+
+    def articles(self, read: Optional[bool], limit: int, offset: int) -> dict:
+        """ Stronicowana lista artykułów """
+        with self._lock:
+            nodes = list(self._nodes.values())
+        if read is not None:
+            nodes = [node for node in nodes if (node.get('read') == 'true') == read]
+        page = nodes[offset:offset + limit]
+        next_offset = offset + limit if offset + limit < len(nodes) else None
+        return {'items': [self._to_dict(node) for node in page], 'total': len(nodes), 'limit': limit,
+                'offset': offset, 'next_offset': next_offset}
+
+    def stats(self) -> dict:
+        """ Ilość wszystkich, przeczytanych i nieprzeczytanych artykułów """
+        with self._lock:
+            amount = len(self._nodes)
+            read = sum(1 for node in self._nodes.values() if node.get('read') == 'true')
+        return {'all': amount, 'read': read, 'unread': amount - read}
+
+    def set_read(self, article_id: str, read: bool) -> Optional[dict]:
+        """ Ustawienie flagi read artykułu i zapis zmiany w źródle danych (store_helper.store_set_read). Zwraca None,
+        jeżeli artykułu nie znaleziono w pamięci lub w źródle danych - artykuł w pamięci pozostaje wtedy bez zmian """
+        with self._lock:
+            node = self._nodes.get(article_id)
+            if node is None:
+                return None
+            if node.get('read') != str(read).lower():
+                if store_helper.store_set_read(self.store_dir, int(article_id), read) is None:
+                    return None
+                node.set('read', str(read).lower())
+                self._signature = self._manifest_signature()
+                self.version += 1
+            return self._to_dict(node)
+
+    def _manifest_signature(self) -> Optional[tuple]:
+        manifest_path = os.path.join(self.store_dir, store_helper.MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            return None
+        stat = os.stat(manifest_path)
+        # manifest jest zastępowany nowym plikiem (os.replace) - numer i-węzła zmienia się nawet przy tym samym czasie
+        # modyfikacji i wielkości pliku
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _to_dict(node) -> dict:
+        return {'id': int(node.get('id')), 'read': node.get('read') == 'true',
+                'title': (node.findtext('title') or '').strip(), 'link': (node.findtext('link') or '').strip()}
+
+
+class ArticleRequestHandler(BaseHTTPRequestHandler):
+    """ Obsługa zapytań HTTP
+
+    Obiekt ArticleStore jest dostępny przez atrybut store serwera (self.server.store).
+    """
+    _read_path = re.compile(r'^/articles/(\d+)/read$')
+
+    def do_GET(self):
+        """ Obsługa zapytań GET: /articles, /stats """
+        store = self.server.store
+        store.reload()
+        url = urlsplit(self.path)
+        if url.path not in ('/articles', '/stats'):
+            self._send_json(404, {'error': 'not found'})
+            return
+        etag = store.etag(self.path)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        if url.path == '/stats':
+            self._send_json(200, store.stats(), etag)
+            return
+        query = parse_qs(url.query)
+        try:
+            read = _parse_bool(query.get('read', [None])[0])
+            limit = min(max(int(query.get('limit', [DEFAULT_LIMIT])[0]), 1), MAX_LIMIT)
+            offset = max(int(query.get('offset', [0])[0]), 0)
+        except ValueError:
+            self._send_json(400, {'error': 'invalid query parameter'})
+            return
+        self._send_json(200, store.articles(read, limit, offset), etag)
+
+    def do_POST(self):
+        """ Obsługa zapytań POST: /articles/{id}/read """
+        store = self.server.store
+        store.reload()
+        url = urlsplit(self.path)
+        match = self._read_path.match(url.path)
+        if match is None:
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            read = _parse_bool(parse_qs(url.query).get('read', ['true'])[0])
+        except ValueError:
+            self._send_json(400, {'error': 'invalid query parameter'})
+            return
+        article = store.set_read(match.group(1), read)
+        if article is None:
+            self._send_json(404, {'error': f'article {match.group(1)} not found'})
+        else:
+            self._send_json(200, article)
+
+    def log_message(self, format, *args):
+        """ Zapis informacji o zapytaniu do pliku logu zamiast na standardowe wyjście błędów """
+        logger_helper.log_warning(f"HTTP {self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, data: dict, etag: str = None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _parse_bool(value: Optional[str]) -> Optional[bool]:
+    """ Zamiana wartości parametru zapytania na bool. None oznacza brak filtra """
+    if value is None:
+        return None
+    if value.lower() in ('true', '1', 'yes'):
+        return True
+    if value.lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError(value)
+
+
+def create_server(store_dir: str, host: str = '127.0.0.1', port: int = 8080) -> ThreadingHTTPServer:
+    """ Utworzenie serwera HTTP
+
+    :param store_dir: Katalog źródła danych z artykułami
+    :type store_dir: str
+    :param host: Adres, na którym nasłuchuje serwer
+    :type host: str
+    :param port: Port, na którym nasłuchuje serwer. 0 - dowolny wolny port
+    :type port: int
+    :return: Serwer HTTP gotowy do uruchomienia
+    :rtype: ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, port), ArticleRequestHandler)
+    server.store = ArticleStore(store_dir)
+    return server
+
+
+def serve(store_dir: str, host: str = '127.0.0.1', port: int = 8080) -> None:
+    """ Uruchomienie serwera HTTP
+
+    Funkcja działa do momentu przerwania programu (Ctrl+C).
+
+    :param store_dir: Katalog źródła danych z artykułami
+    :type store_dir: str
+    :param host: Adres, na którym nasłuchuje serwer
+    :type host: str
+    :param port: Port, na którym nasłuchuje serwer
+    :type port: int
+    :return: ---
+    :rtype: ---
+    """
+    server = create_server(store_dir, host, port)
+    print(f"Serving articles on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
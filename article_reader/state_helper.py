@@ -0,0 +1,215 @@
+"""
+Moduł zawiera funkcje do obsługi stanu synchronizacji poszczególnych źródeł (stron www) z artykułami.
+
+Stan jest zapisywany w pliku json obok pliku z artykułami. Dla każdego źródła przechowywane są: czas ostatniego
+pobrania, klucz kanoniczny (normalize_helper.normalize_key) tytułu ostatnio widzianego artykułu, ilość kolejnych błędów
+oraz skrót (hash) zawartości strony. Dodatkowo zapisywana jest informacja o bieżącym przebiegu synchronizacji - lista
+źródeł, które nie zostały jeszcze zatwierdzone. Jeżeli program zakończy się w trakcie synchronizacji, to kolejne
+uruchomienie przetwarza tylko te źródła.
+
+Struktura pliku:
+{"run": {"id": "...", "pending": ["url", ...]} lub null,
+ "sources": {"url": {"last_fetch": "...", "last_seen": "...", "failures": 0, "content_hash": "..."}}}
+
+Klasy:
+- brak klas
+
+Funkcje:
+- state_load - Odczyt stanu synchronizacji z pliku
+- state_save - Zapis stanu synchronizacji do pliku
+- state_begin_run - Rozpoczęcie lub wznowienie przebiegu synchronizacji
+- state_end_run - Zakończenie przebiegu synchronizacji
+- state_content_hash - Wyliczenie skrótu zawartości strony
+- state_content_hashes - Skróty zawartości stron z ostatniej synchronizacji
+- state_page_changed - Sprawdzenie czy zawartość strony zmieniła się od ostatniej synchronizacji
+- state_source_committed - Zatwierdzenie poprawnie przetworzonego źródła
+- state_source_failed - Zapisanie informacji o błędzie przetwarzania źródła
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Local application import
+# from . import logger_helper
+# from . import normalize_helper
+import logger_helper
+import normalize_helper
+
+
+def state_load(state_file_path: str) -> dict:
+    """ Odczyt stanu synchronizacji z pliku
+
+    Jeżeli plik nie istnieje lub jest uszkodzony, to zwracany jest pusty stan.
+
+    :param state_file_path: Ścieżka do pliku ze stanem synchronizacji
+    :type state_file_path: str
+    :return: Stan synchronizacji
+    :rtype: dict
+    """
+    state = {'run': None, 'sources': {}}
+    if os.path.exists(state_file_path):
+        try:
+            with open(state_file_path, 'r', encoding='utf-8') as state_file:
+                state.update(json.load(state_file))
+        except ValueError:
+            logger_helper.log_error(f"Uszkodzony plik stanu synchronizacji: {state_file_path}")
+    state['path'] = state_file_path
+    return state
+
+
+def state_save(state: dict) -> None:
+    """ Zapis stanu synchronizacji do pliku
+
+    Zapis jest atomowy - dane trafiają do pliku tymczasowego, który następnie zastępuje plik stanu.
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :return: ---
+    :rtype: ---
+    """
+    state_file_path = state['path']
+    temp_path = state_file_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as state_file:
+        json.dump({'run': state['run'], 'sources': state['sources']}, state_file, ensure_ascii=False, indent=1)
+    os.replace(temp_path, state_file_path)
+
+
+def state_begin_run(state: dict, urls: List[str]) -> List[str]:
+    """ Rozpoczęcie lub wznowienie przebiegu synchronizacji
+
+    Jeżeli poprzedni przebieg nie został zakończony, to funkcja zwraca tylko te źródła, które nie zostały w nim
+    zatwierdzone. W przeciwnym wypadku rozpoczynany jest nowy przebieg dla wszystkich podanych źródeł.
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :param urls: Lista adresów wszystkich źródeł
+    :type urls: list[str]
+    :return: Lista adresów źródeł do przetworzenia
+    :rtype: list[str]
+    """
+    run = state.get('run')
+    if run and run.get('pending'):
+        pending = [url for url in urls if url in run['pending']]
+        logger_helper.log_warning(f"Wznowienie przebiegu synchronizacji {run['id']}: {len(pending)} źródeł")
+    else:
+        pending = list(urls)
+        state['run'] = {'id': uuid.uuid4().hex, 'pending': pending}
+    state['run']['pending'] = list(pending)
+    state_save(state)
+    return pending
+
+
+def state_end_run(state: dict) -> None:
+    """ Zakończenie przebiegu synchronizacji
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :return: ---
+    :rtype: ---
+    """
+    state['run'] = None
+    state_save(state)
+
+
+def state_content_hash(content: bytes) -> str:
+    """ Wyliczenie skrótu zawartości strony
+
+    :param content: Surowa zawartość strony www
+    :type content: bytes
+    :return: Skrót sha256 w postaci tekstowej
+    :rtype: str
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def state_content_hashes(state: dict, urls: List[str]) -> Dict[str, Optional[str]]:
+    """ Skróty zawartości stron z ostatniej synchronizacji
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :param urls: Lista adresów źródeł
+    :type urls: list[str]
+    :return: Słownik adres źródła -> skrót zawartości strony (None - źródło nie było jeszcze synchronizowane)
+    :rtype: dict
+    """
+    return {url: state['sources'].get(url, {}).get('content_hash') for url in urls}
+
+
+def state_page_changed(state: dict, url: str, content_hash: str) -> bool:
+    """ Sprawdzenie czy zawartość strony zmieniła się od ostatniej synchronizacji
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :param url: Adres źródła
+    :type url: str
+    :param content_hash: Skrót aktualnej zawartości strony
+    :type content_hash: str
+    :return: True - zawartość zmieniła się lub źródło nie było jeszcze synchronizowane
+    :rtype: bool
+    """
+    return state['sources'].get(url, {}).get('content_hash') != content_hash
+
+
+def state_source_committed(state: dict, url: str, content_hash: str = None, last_seen: str = None) -> None:
+    """ Zatwierdzenie poprawnie przetworzonego źródła
+
+    Funkcja aktualizuje stan źródła, usuwa je z listy źródeł oczekujących w bieżącym przebiegu i zapisuje stan.
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :param url: Adres źródła
+    :type url: str
+    :param content_hash: Skrót zawartości strony
+    :type content_hash: str
+    :param last_seen: Tytuł najnowszego artykułu na stronie, zapisywany jako klucz kanoniczny - tak samo jak przy
+    wyszukiwaniu duplikatów (normalize_helper.normalize_key). None - bez zmian
+    :type last_seen: str
+    :return: ---
+    :rtype: ---
+    """
+    source = state['sources'].setdefault(url, {})
+    source['last_fetch'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    source['failures'] = 0
+    if content_hash is not None:
+        source['content_hash'] = content_hash
+    if last_seen is not None:
+        source['last_seen'] = normalize_helper.normalize_key(last_seen)
+    _remove_pending(state, url)
+    state_save(state)
+
+
+def state_source_failed(state: dict, url: str) -> None:
+    """ Zapisanie informacji o błędzie przetwarzania źródła
+
+    Funkcja zwiększa licznik kolejnych błędów źródła. Źródło jest usuwane z listy oczekujących, ponieważ błąd został
+    obsłużony i nie oznacza przerwania przebiegu synchronizacji.
+
+    :param state: Stan synchronizacji
+    :type state: dict
+    :param url: Adres źródła
+    :type url: str
+    :return: ---
+    :rtype: ---
+    """
+    source = state['sources'].setdefault(url, {})
+    source['last_fetch'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    source['failures'] = source.get('failures', 0) + 1
+    _remove_pending(state, url)
+    state_save(state)
+
+
+def _remove_pending(state: dict, url: str) -> None:
+    """ Usunięcie źródła z listy źródeł oczekujących w bieżącym przebiegu """
+    run = state.get('run')
+    if run and url in run['pending']:
+        run['pending'].remove(url)
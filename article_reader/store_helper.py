@@ -0,0 +1,835 @@
+"""
+Moduł zawiera funkcje do obsługi lokalnego źródła danych podzielonego na partycje.
+
+Artykuły są przechowywane w wielu plikach xml (partycjach) - jeden plik dla każdego źródła (strony www) i miesiąca, w
+którym artykuły zostały dodane. Każda partycja ma format taki jak dotychczasowy plik articles.xml, dlatego do jej
+obsługi wykorzystywane są funkcje z modułów xml_helper, bloom_helper i index_helper. Mały plik manifest.json
+przechowuje listę partycji z ilością wszystkich i nieprzeczytanych artykułów oraz zakresem identyfikatorów, a także
+kolejny wolny identyfikator artykułu (identyfikatory są unikalne w całym źródle danych) i numer generacji danych.
+Manifest jest zapisywany po każdej zmianie partycji (również zmianie tytułu, linku lub treści artykułu), a każdy zapis
+zwiększa numer generacji - odbiorcy (server_helper) wykrywają zmiany danych po samym manifeście.
+
+Struktura katalogu:
+- manifest.json
+- keys.bloom - filtr Blooma z kluczami artykułów wszystkich partycji
+- partitions/<źródło>/<rok-miesiąc>.xml (oraz pliki .bloom i .idx obok)
+
+Dotychczasowy, jednoplikowy articles.xml jest automatycznie przenoszony do partycji przy pierwszym otwarciu źródła
+danych (store_open) i zachowywany jako articles.xml.migrated.
+
+Przeczytane artykuły starsze niż podana ilość dni są przenoszone (store_compact) z partycji aktywnych do skompresowanych
+partycji archiwalnych: cold/<źródło>/<rok-miesiąc>.xml.gz (lub .xml.xz). Partycje archiwalne są zapisane w manifeście
+z atrybutem tier="cold" i są czytane strumieniowo (dekompresja w locie) przy wyszukiwaniu, eksporcie i sprawdzaniu
+duplikatów. Wiekiem artykułu jest okres jego partycji, czyli miesiąc dodania.
+
+Synchronizacja źródła (store_sync_source) porównuje listę artykułów ze strony www z migawką źródła zapisaną w
+snapshots/<źródło>.json (diff_helper) i zapisuje tylko zmiany: nowe artykuły, zmienione tytuły i linki oraz usunięcia.
+Zmiany są dopisywane do dziennika zmian changes.jsonl.
+
+Klasy:
+- brak klas
+
+Funkcje:
+- store_open - Otwarcie (i w razie potrzeby utworzenie lub migracja) źródła danych
+- store_load_manifest - Odczyt manifestu źródła danych
+- store_save_manifest - Zapis manifestu źródła danych
+- store_source_slug - Nazwa katalogu partycji dla źródła
+- store_current_period - Okres (rok-miesiąc) bieżącej partycji
+- store_partition_path - Ścieżka do pliku partycji
+- store_migrate - Migracja jednoplikowego źródła danych do partycji
+- store_info - Ilość wszystkich i przeczytanych artykułów
+- store_iter_partition - Strumieniowy odczyt artykułów z jednej partycji
+- store_load_partition - Załadowanie całej partycji
+- store_iter_articles - Strumieniowy odczyt artykułów z partycji
+- store_search_articles - Wyszukiwanie artykułów po tytule we wszystkich partycjach
+- store_show_articles - Wyświetlenie listy artykułów
+- store_save_articles - Zapis nowych artykułów ze źródła do bieżącej partycji
+- store_load_snapshot - Odczyt migawki źródła
+- store_sync_source - Synchronizacja artykułów źródła na podstawie zmian względem migawki
+- store_set_read - Ustawienie flagi read artykułu
+- store_set_bodies - Zapis skrótów pobranych treści artykułów
+- store_compact - Przeniesienie starych, przeczytanych artykułów do skompresowanych partycji archiwalnych
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- MANIFEST_NAME - Nazwa pliku manifestu
+- LEGACY_NAME - Nazwa jednoplikowego źródła danych
+- CHANGE_LOG_NAME - Nazwa pliku dziennika zmian
+- KEYS_BLOOM_NAME - Nazwa pliku filtra Blooma z kluczami artykułów wszystkich partycji
+- FLUSH_SIZE - Ilość nowych artykułów zapisywanych jedną partią przez store_save_articles
+- COLD_FORMATS - Obsługiwane formaty kompresji partycji archiwalnych
+- RETENTION_DAYS - Domyślny wiek (w dniach), po którym przeczytane artykuły trafiają do archiwum
+"""
+# Standard library imports
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Local application import
+# from . import xml_helper
+# from . import bloom_helper
+# from . import index_helper
+# from . import logger_helper
+# from . import normalize_helper
+# from . import common_helper
+# from . import diff_helper
+import xml_helper
+import bloom_helper
+import index_helper
+import logger_helper
+import normalize_helper
+import common_helper
+import diff_helper
+
+MANIFEST_NAME = 'manifest.json'
+LEGACY_NAME = 'articles.xml'
+CHANGE_LOG_NAME = 'changes.jsonl'
+KEYS_BLOOM_NAME = 'keys.bloom'
+FLUSH_SIZE = 50
+COLD_FORMATS = {'gz': gzip.open, 'xz': lzma.open}
+RETENTION_DAYS = 30
+
+
+def store_load_manifest(store_dir: str) -> dict:
+    """ Odczyt manifestu źródła danych
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :return: Manifest z kluczami: next_id, generation, partitions. Jeżeli manifest nie istnieje, to zwracany jest pusty
+    manifest
+    :rtype: dict
+    """
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {'next_id': 1, 'generation': 0, 'partitions': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def store_save_manifest(store_dir: str, manifest: dict) -> None:
+    """ Zapis manifestu źródła danych
+
+    Zapis jest atomowy - dane trafiają do pliku tymczasowego, który następnie zastępuje manifest. Każdy zapis zwiększa
+    numer generacji danych (klucz generation).
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param manifest: Manifest
+    :type manifest: dict
+    :return: ---
+    :rtype: ---
+    """
+    manifest['generation'] = manifest.get('generation', 0) + 1
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+
+def store_source_slug(source: str) -> str:
+    """ Nazwa katalogu partycji dla źródła
+
+    :param source: Adres źródła (strony www)
+    :type source: str
+    :return: Nazwa katalogu złożona z czytelnej części adresu i krótkiego skrótu całego adresu
+    :rtype: str
+    """
+    readable = re.sub(r'[^A-Za-z0-9.-]+', '_', re.sub(r'^[a-z]+://', '', source)).strip('_')[:60]
+    return f"{readable}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}"
+
+
+def store_current_period() -> str:
+    """ Okres (rok-miesiąc) bieżącej partycji
+
+    :return: Okres w postaci RRRR-MM
+    :rtype: str
+    """
+    return time.strftime('%Y-%m')
+
+
+def store_partition_path(store_dir: str, partition: dict) -> str:
+    """ Ścieżka do pliku partycji
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param partition: Opis partycji z manifestu
+    :type partition: dict
+    :return: Pełna ścieżka do pliku xml partycji
+    :rtype: str
+    """
+    return os.path.join(store_dir, partition['path'])
+
+
+def _new_partition(source: str, period: str) -> Tuple[str, dict]:
+    """ Utworzenie opisu nowej partycji. Zwraca klucz partycji w manifeście i jej opis """
+    slug = store_source_slug(source)
+    return f"{slug}/{period}", {'source': source, 'period': period, 'path': f"partitions/{slug}/{period}.xml",
+                                'count': 0, 'unread': 0, 'min_id': 0, 'max_id': 0}
+
+
+def _partition_add_ids(partition: dict, article_id: int, read: bool) -> None:
+    """ Aktualizacja liczników i zakresu identyfikatorów partycji po dodaniu artykułu """
+    partition['count'] += 1
+    if not read:
+        partition['unread'] += 1
+    partition['min_id'] = article_id if not partition['min_id'] else min(partition['min_id'], article_id)
+    partition['max_id'] = max(partition['max_id'], article_id)
+
+
+def _is_cold(partition: dict) -> bool:
+    """ Sprawdzenie czy partycja jest skompresowaną partycją archiwalną """
+    return partition.get('tier') == 'cold'
+
+
+def store_iter_partition(store_dir: str, partition: dict) -> Iterator[Dict[str, str]]:
+    """ Strumieniowy odczyt artykułów z jednej partycji
+
+    Partycje archiwalne są dekompresowane w locie, bez zapisu rozpakowanego pliku na dysk.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param partition: Opis partycji z manifestu
+    :type partition: dict
+    :return: Generator artykułów w postaci słowników z kluczami: id, read, title, link
+    :rtype: Iterator[dict]
+    """
+    path = store_partition_path(store_dir, partition)
+    if not _is_cold(partition):
+        yield from xml_helper.xml_iter_articles(path)
+    elif os.path.exists(path):
+        with COLD_FORMATS[path.rsplit('.', 1)[-1]](path, 'rb') as cold_file:
+            yield from xml_helper.xml_iter_articles(cold_file)
+
+
+def store_load_partition(store_dir: str, partition: dict) -> ElementTree.ElementTree:
+    """ Załadowanie całej partycji
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param partition: Opis partycji z manifestu
+    :type partition: dict
+    :return: Obiekt xml z zawartością partycji
+    :rtype: xml.etree.ElementTree.ElementTree
+    """
+    path = store_partition_path(store_dir, partition)
+    if not _is_cold(partition):
+        return xml_helper.xml_load_tree(path)
+    with COLD_FORMATS[path.rsplit('.', 1)[-1]](path, 'rb') as cold_file:
+        return ElementTree.parse(cold_file)
+
+
+def _write_tree(path: str, tree: ElementTree.ElementTree) -> None:
+    """ Zapis pliku partycji. Pliki z rozszerzeniem z COLD_FORMATS są kompresowane """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    opener = COLD_FORMATS.get(path.rsplit('.', 1)[-1])
+    if opener is None:
+        xml_helper.xml_save_to_file(tree, path)
+        return
+    temp_path = path + '.tmp'
+    with opener(temp_path, 'wb') as cold_file:
+        tree.write(cold_file, xml_declaration=True, encoding='utf-8', method='xml', short_empty_elements=False)
+    os.replace(temp_path, path)
+
+
+def _partition_bloom(store_dir: str, partition: dict) -> dict:
+    """ Odczyt filtra Blooma partycji. Brakujący lub nieaktualny filtr jest budowany od nowa """
+    path = store_partition_path(store_dir, partition)
+    bloom = bloom_helper.bloom_load(path)
+    if bloom is None:
+        keys = [bloom_helper.bloom_article_key(article['title'])
+                for article in store_iter_partition(store_dir, partition)]
+        bloom = bloom_helper.bloom_create(2 * len(keys))
+        for key in keys:
+            bloom_helper.bloom_add(bloom, key)
+        bloom_helper.bloom_save(bloom, path)
+    return bloom
+
+
+def _write_partition(path: str, tree: ElementTree.ElementTree, bloom: Optional[dict], new_titles: list) -> dict:
+    """ Zapis pliku partycji oraz aktualizacja jej filtra Blooma. Zwraca zaktualizowany filtr """
+    _write_tree(path, tree)
+    nodes = tree.getroot().findall('article')
+    if bloom is None:
+        bloom = bloom_helper.bloom_create(2 * len(nodes))
+        new_titles = [node.findtext('title') for node in nodes]
+    for title in new_titles:
+        bloom_helper.bloom_add(bloom, bloom_helper.bloom_article_key(title))
+    return bloom_helper.bloom_save(bloom, path,
+                                   (bloom_helper.bloom_article_key(node.findtext('title')) for node in nodes))
+
+
+def store_migrate(store_dir: str, legacy_path: str, source: str) -> dict:
+    """ Migracja jednoplikowego źródła danych do partycji
+
+    Wszystkie artykuły trafiają do partycji podanego źródła, w okresie odpowiadającym dacie modyfikacji pliku. Zachowane
+    są identyfikatory i flagi read. Dotychczasowy plik jest zachowywany pod nazwą z rozszerzeniem .migrated.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param legacy_path: Ścieżka do jednoplikowego źródła danych
+    :type legacy_path: str
+    :param source: Adres źródła, z którego pochodzą artykuły
+    :type source: str
+    :return: Manifest po migracji
+    :rtype: dict
+    """
+    period = time.strftime('%Y-%m', time.localtime(os.path.getmtime(legacy_path)))
+    key, partition = _new_partition(source, period)
+    root = ElementTree.Element('articles')
+    for article in xml_helper.xml_iter_articles(legacy_path):
+        node = ElementTree.SubElement(root, 'article', {'id': article['id'], 'read': article['read']})
+        ElementTree.SubElement(node, 'title').text = article['title']
+        ElementTree.SubElement(node, 'link').text = article['link']
+        _partition_add_ids(partition, int(article['id']), article['read'] == 'true')
+
+    manifest = {'next_id': partition['max_id'] + 1, 'partitions': {}}
+    if partition['count']:
+        _write_partition(store_partition_path(store_dir, partition), ElementTree.ElementTree(root), None, [])
+        manifest['partitions'][key] = partition
+    store_save_manifest(store_dir, manifest)
+    os.replace(legacy_path, legacy_path + '.migrated')
+    for sidecar in (bloom_helper.bloom_path(legacy_path), index_helper.index_path(legacy_path)):
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+    logger_helper.log_warning(f"Przeniesiono {partition['count']} artykułów z {legacy_path} do partycji {key}")
+    return manifest
+
+
+def store_open(store_dir: str, default_source: str) -> dict:
+    """ Otwarcie (i w razie potrzeby utworzenie lub migracja) źródła danych
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param default_source: Adres źródła przypisywany artykułom z jednoplikowego źródła danych przy migracji
+    :type default_source: str
+    :return: Manifest źródła danych
+    :rtype: dict
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    legacy_path = os.path.join(store_dir, LEGACY_NAME)
+    if not os.path.exists(os.path.join(store_dir, MANIFEST_NAME)) and os.path.exists(legacy_path):
+        return store_migrate(store_dir, legacy_path, default_source)
+    return store_load_manifest(store_dir)
+
+
+def store_info(store_dir: str) -> Tuple[int, int]:
+    """ Ilość wszystkich i przeczytanych artykułów
+
+    Ilości są wyliczane tylko na podstawie manifestu, bez otwierania partycji.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :return: Ilość artykułów: wszystkich, przeczytanych
+    :rtype: int, int
+    """
+    partitions = store_load_manifest(store_dir)['partitions'].values()
+    amount = sum(partition['count'] for partition in partitions)
+    unread = sum(partition['unread'] for partition in partitions)
+    return amount, amount - unread
+
+
+def store_iter_articles(store_dir: str, article_type: str = 'all', since_id: int = 0) -> Iterator[Dict[str, str]]:
+    """ Strumieniowy odczyt artykułów z partycji
+
+    Otwierane są tylko partycje, w których mogą być artykuły podanego typu (np. dla 'unread' tylko partycje z
+    nieprzeczytanymi artykułami) o identyfikatorze większym niż since_id (według zakresu identyfikatorów partycji w
+    manifeście). Partycje są czytane w kolejności najmniejszego identyfikatora.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param article_type: all - wszystkie; read - przeczytane; unread - nieprzeczytane
+    :type article_type: str
+    :param since_id: Zwracane są tylko artykuły o identyfikatorze większym niż podany (np. kursor eksportu)
+    :type since_id: int
+    :return: Generator artykułów w postaci słowników z kluczami: id, read, title, link, source
+    :rtype: Iterator[dict]
+    """
+    partitions = sorted(store_load_manifest(store_dir)['partitions'].values(), key=lambda item: item['min_id'])
+    for partition in partitions:
+        if article_type == 'unread' and not partition['unread']:
+            continue
+        if article_type == 'read' and partition['unread'] == partition['count']:
+            continue
+        if partition['max_id'] <= since_id:
+            continue
+        for article in store_iter_partition(store_dir, partition):
+            if int(article['id']) <= since_id:
+                continue
+            if article_type == 'all' or (article['read'] == 'true') == (article_type == 'read'):
+                article['source'] = partition['source']
+                yield article
+
+
+def store_search_articles(store_dir: str, phrase: str) -> Iterator[Dict[str, str]]:
+    """ Wyszukiwanie artykułów po tytule we wszystkich partycjach
+
+    Przeszukiwane są strumieniowo wszystkie partycje - aktywne i archiwalne. Fraza i tytuły są porównywane według
+    klucza kanonicznego (normalize_helper.normalize_key), dlatego wielkość liter, postać znaków diakrytycznych,
+    interpunkcja i ilość spacji nie mają znaczenia.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param phrase: Szukany fragment tytułu
+    :type phrase: str
+    :return: Generator znalezionych artykułów w postaci słowników z kluczami: id, read, title, link, source
+    :rtype: Iterator[dict]
+    """
+    phrase = normalize_helper.normalize_key(phrase)
+    partitions = sorted(store_load_manifest(store_dir)['partitions'].values(), key=lambda item: item['min_id'])
+    for partition in partitions:
+        for article in store_iter_partition(store_dir, partition):
+            if phrase in normalize_helper.normalize_key(article['title']):
+                article['source'] = partition['source']
+                yield article
+
+
+def store_show_articles(store_dir: str, article_type: str) -> None:
+    """ Wyświetlenie listy artykułów
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param article_type: all - wszystkie; read - przeczytane; unread - nieprzeczytane
+    :type article_type: str
+    :return: ---
+    :rtype: ---
+    """
+    if article_type not in ('all', 'read', 'unread'):
+        logger_helper.log_warning(f'Podano błędny typ artykułów: {article_type}')
+        return
+    for article in store_iter_articles(store_dir, article_type):
+        print(f"Artykuł o id: {article['id']}")
+        print(article['title'])
+        print(article['link'])
+
+
+def _keys_signature(manifest: dict) -> Tuple[int, int]:
+    """ Sygnatura filtra kluczy wszystkich partycji: wersja kluczy z manifestu i łączna ilość artykułów """
+    return manifest.get('keys_version', 0), sum(partition['count'] for partition in manifest['partitions'].values())
+
+
+def _store_bloom(store_dir: str, manifest: dict) -> dict:
+    """ Odczyt filtra Blooma z kluczami artykułów wszystkich partycji. Brakujący, nieaktualny lub przepełniony filtr
+    jest budowany od nowa z artykułów wszystkich partycji """
+    path, signature = os.path.join(store_dir, KEYS_BLOOM_NAME), _keys_signature(manifest)
+    bloom = bloom_helper.bloom_read(path, signature)
+    if bloom is None or signature[1] > bloom['capacity']:
+        bloom = bloom_helper.bloom_create(2 * signature[1])
+        for partition in manifest['partitions'].values():
+            for article in store_iter_partition(store_dir, partition):
+                bloom_helper.bloom_add(bloom, bloom_helper.bloom_article_key(article['title']))
+        os.makedirs(store_dir, exist_ok=True)
+        bloom_helper.bloom_write(bloom, path, signature)
+    return bloom
+
+
+def _store_bloom_add(store_dir: str, manifest: dict, bloom: dict, titles: Iterable[str]) -> None:
+    """ Dodanie tytułów do filtra kluczy wszystkich partycji i zwiększenie wersji kluczy w manifeście
+
+    Filtr jest zapisywany przed zapisem partycji i manifestu. Jeżeli zapis zostanie przerwany, to sygnatura filtra nie
+    zgadza się z manifestem i filtr zostanie zbudowany od nowa - filtr nigdy nie pomija zapisanego artykułu.
+    """
+    for title in titles:
+        bloom_helper.bloom_add(bloom, bloom_helper.bloom_article_key(title))
+    manifest['keys_version'] = manifest.get('keys_version', 0) + 1
+    bloom_helper.bloom_write(bloom, os.path.join(store_dir, KEYS_BLOOM_NAME), _keys_signature(manifest))
+
+
+def _stored_candidates(store_dir: str, partitions: Dict[str, dict], candidates: Dict[str, tuple],
+                       blooms: Dict[str, dict]) -> set:
+    """ Klucze artykułów wskazanych przez filtr kluczy wszystkich partycji, które są już zapisane. Filtry Blooma
+    partycji są czytane tylko wtedy, gdy są kandydaci, i zapamiętywane w blooms. Dokładnie (strumieniowo) sprawdzane są
+    tylko partycje wskazane przez te filtry """
+    found = set()
+    if not candidates:
+        return found
+    hits = {}
+    for hit_key, partition in partitions.items():
+        if hit_key not in blooms:
+            blooms[hit_key] = _partition_bloom(store_dir, partition)
+        bloom = blooms[hit_key]
+        hits[hit_key] = {article_key for article_key in candidates if bloom_helper.bloom_contains(bloom, article_key)}
+    for hit_key in sorted(hit_key for hit_key, keys in hits.items() if keys):
+        keys = hits[hit_key] - found
+        for item in store_iter_partition(store_dir, partitions[hit_key]):
+            if not keys:
+                break
+            item_key = bloom_helper.bloom_article_key(item['title'])
+            if item_key in keys:
+                keys.discard(item_key)
+                found.add(item_key)
+    return found
+
+
+def store_save_articles(store_dir: str, source: str, articles: Iterable[Sequence[str]]) -> int:
+    """ Zapis nowych artykułów ze źródła do bieżącej partycji
+
+    Artykuły są zapisywane partiami po FLUSH_SIZE - w trakcie odczytu artykułów, a nie dopiero po odczytaniu całej
+    listy. Każda partia jest sprawdzana w jednym filtrze Blooma z kluczami wszystkich partycji (KEYS_BLOOM_NAME).
+    Artykuły, które być może są już zapisane, są sprawdzane w filtrach poszczególnych partycji, a następnie dokładnie -
+    strumieniowo i tylko w partycjach wskazanych przez filtry. Filtry są czytane dopiero wtedy, gdy są potrzebne.
+    Zapisywana jest tylko bieżąca partycja źródła (wraz z filtrami i manifestem) i tylko wtedy, gdy partia zawiera nowe
+    artykuły. Duplikaty są wykrywane według klucza kanonicznego tytułu (normalize_helper.normalize_key).
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param source: Adres źródła, z którego pochodzą artykuły
+    :type source: str
+    :param articles: Artykuły w postaci [tytuł, link]
+    :type articles: Iterable[list[str]]
+    :return: Ilość nowo dodanych artykułów
+    :rtype: int
+    """
+    manifest = store_load_manifest(store_dir)
+    partitions = manifest['partitions']
+    key, partition = _new_partition(source, store_current_period())
+    partition = partitions.get(key, partition)
+    path = store_partition_path(store_dir, partition)
+    tree, store_bloom, blooms, seen, batch, added = None, None, {}, set(), [], 0
+
+    def flush():
+        nonlocal tree, store_bloom, added
+        store_bloom = store_bloom or _store_bloom(store_dir, manifest)
+        candidates = {article_key: (title, link) for article_key, title, link in batch
+                      if bloom_helper.bloom_contains(store_bloom, article_key)}
+        found = _stored_candidates(store_dir, partitions, candidates, blooms)
+        new_articles = [(title, link) for article_key, title, link in batch if article_key not in found]
+        batch.clear()
+        if not new_articles:
+            return
+        if tree is None:
+            tree = xml_helper.xml_load_tree(path) if os.path.exists(path) else \
+                ElementTree.ElementTree(ElementTree.Element('articles'))
+        for title, link in new_articles:
+            tree.getroot().append(xml_helper.xml_create_article(title, link, tree.getroot(), manifest['next_id']))
+            _partition_add_ids(partition, manifest['next_id'], False)
+            manifest['next_id'] += 1
+        if key in partitions and key not in blooms:
+            blooms[key] = _partition_bloom(store_dir, partitions[key])
+        partitions[key] = partition
+        new_titles = [title for title, _ in new_articles]
+        _store_bloom_add(store_dir, manifest, store_bloom, new_titles)
+        blooms[key] = _write_partition(path, tree, blooms.get(key), new_titles)
+        store_save_manifest(store_dir, manifest)
+        added += len(new_titles)
+
+    for article in articles:
+        title, link = article[0], article[1]
+        article_key = bloom_helper.bloom_article_key(title)
+        if article_key in seen:
+            continue
+        seen.add(article_key)
+        batch.append((article_key, title, link))
+        if len(batch) >= FLUSH_SIZE:
+            flush()
+    if batch:
+        flush()
+    return added
+
+
+def _snapshot_path(store_dir: str, source: str) -> str:
+    """ Ścieżka do pliku migawki źródła """
+    return os.path.join(store_dir, 'snapshots', f"{store_source_slug(source)}.json")
+
+
+def store_load_snapshot(store_dir: str, source: str) -> Optional[Dict[str, List[str]]]:
+    """ Odczyt migawki źródła
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param source: Adres źródła
+    :type source: str
+    :return: Migawka źródła: klucz -> [skrót, link] (zob. diff_helper). None - źródło nie ma jeszcze migawki
+    :rtype: dict
+    """
+    path = _snapshot_path(store_dir, source)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as snapshot_file:
+        return json.load(snapshot_file)
+
+
+def _save_snapshot(store_dir: str, source: str, snapshot: Dict[str, List[str]]) -> None:
+    """ Atomowy zapis migawki źródła """
+    path = _snapshot_path(store_dir, source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as snapshot_file:
+        json.dump(snapshot, snapshot_file, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+
+
+def _source_partitions(manifest: dict, source: str) -> List[dict]:
+    """ Partycje (aktywne i archiwalne) źródła w kolejności identyfikatorów artykułów """
+    return sorted((partition for partition in manifest['partitions'].values() if partition['source'] == source),
+                  key=lambda partition: partition['min_id'])
+
+
+def _update_articles(store_dir: str, manifest: dict, source: str, updated: List[Tuple[str, str, str]]) -> int:
+    """ Zmiana tytułów i linków artykułów źródła. Artykuły są wyszukiwane według klucza z migawki """
+    pending = {old_key: (title, link) for old_key, title, link in updated}
+    amount = 0
+    for partition in _source_partitions(manifest, source):
+        if not pending:
+            break
+        tree = store_load_partition(store_dir, partition)
+        changed = 0
+        for node in tree.getroot().findall('article'):
+            change = pending.pop(normalize_helper.normalize_key(node.findtext('title') or ''), None)
+            if change is not None:
+                node.find('title').text, node.find('link').text = change
+                changed += 1
+        if changed:
+            _write_partition(store_partition_path(store_dir, partition), tree, None, [])
+            amount += changed
+    return amount
+
+
+def store_sync_source(store_dir: str, source: str, articles: Iterable[Sequence[str]]) -> Dict[str, int]:
+    """ Synchronizacja artykułów źródła na podstawie zmian względem migawki
+
+    Lista artykułów odczytywana ze strony www jest porównywana przyrostowo z migawką źródła
+    (diff_helper.diff_iter_compare). Nowe artykuły trafiają do store_save_articles od razu po odczytaniu i są zapisywane
+    partiami (FLUSH_SIZE), również w trakcie pobierania strony www - buforowana jest tylko nowa migawka, potrzebna do
+    wykrycia zmian i usunięć. Po
+    odczytaniu całej listy zmienionym artykułom zmieniane są tytuł i link - identyfikator i flaga read pozostają bez
+    zmian. Artykuły usunięte ze strony www pozostają w archiwum i są tylko usuwane z migawki. Zmiany
+    są dopisywane do dziennika zmian (CHANGE_LOG_NAME), a migawka jest zapisywana na końcu, dlatego po przerwaniu
+    synchronizacji zmiany zostaną wykryte ponownie (w dzienniku mogą wtedy wystąpić dwukrotnie).
+
+    Jeżeli źródło nie ma jeszcze migawki, to jest ona tworzona z artykułów źródła zapisanych w archiwum, a usunięcia nie
+    są zgłaszane - archiwum zawiera również artykuły dawno usunięte ze strony www. Pusta lista artykułów nie zmienia
+    migawki.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param source: Adres źródła, z którego pochodzą artykuły
+    :type source: str
+    :param articles: Artykuły w postaci [tytuł, link]
+    :type articles: Iterable[list[str]]
+    :return: Słownik z ilością artykułów: added (zapisanych nowych), updated (zmienionych), removed (usuniętych ze
+    strony www)
+    :rtype: dict
+    """
+    report = {'added': 0, 'updated': 0, 'removed': 0}
+    snapshot = store_load_snapshot(store_dir, source)
+    baseline = snapshot is None
+    if baseline:
+        stored = (article for partition in _source_partitions(store_load_manifest(store_dir), source)
+                  for article in store_iter_partition(store_dir, partition))
+        snapshot = diff_helper.diff_compare({}, ((article['title'], article['link']) for article in stored))[1]
+
+    # porównanie odbywa się na pełnych linkach, a nowe artykuły są zapisywane z linkiem odczytanym ze strony www
+    changes, new_snapshot = {'added': [], 'updated': [], 'removed': []}, {}
+    listing = ((article[0], common_helper.complete_link(article[1]), article[1]) for article in articles)
+    added = diff_helper.diff_iter_compare(snapshot, listing, changes, new_snapshot)
+    report['added'] = store_save_articles(store_dir, source, ((title, link) for title, _, link in added))
+    if not new_snapshot:
+        return report
+    if baseline:
+        changes['removed'] = []
+
+    if changes['updated']:
+        manifest = store_load_manifest(store_dir)
+        _store_bloom_add(store_dir, manifest, _store_bloom(store_dir, manifest),
+                         (title for _, title, _ in changes['updated']))
+        report['updated'] = _update_articles(store_dir, manifest, source, changes['updated'])
+        store_save_manifest(store_dir, manifest)
+    report['removed'] = len(changes['removed'])
+    diff_helper.diff_log_append(os.path.join(store_dir, CHANGE_LOG_NAME), source, changes)
+    _save_snapshot(store_dir, source, new_snapshot)
+    return report
+
+
+def store_set_read(store_dir: str, article_id: int, read: bool) -> Optional[bool]:
+    """ Ustawienie flagi read artykułu
+
+    Partycja z artykułem jest wybierana na podstawie zakresów identyfikatorów z manifestu, a flaga jest zmieniana w
+    miejscu z użyciem indeksu partycji (index_helper). Partycja archiwalna jest zapisywana ponownie w całości. Licznik
+    nieprzeczytanych artykułów w manifeście jest aktualizowany.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param article_id: Identyfikator artykułu
+    :type article_id: int
+    :param read: True - artykuł przeczytany. False - artykuł nieprzeczytany
+    :type read: bool
+    :return: True - flaga została ustawiona. None - artykułu nie znaleziono
+    :rtype: bool
+    """
+    manifest = store_load_manifest(store_dir)
+    for partition in manifest['partitions'].values():
+        if not partition['min_id'] <= article_id <= partition['max_id']:
+            continue
+        path = store_partition_path(store_dir, partition)
+        tree = None
+        if _is_cold(partition):
+            tree = store_load_partition(store_dir, partition)
+            node = tree.getroot().find(f"article[@id='{article_id}']")
+        else:
+            node = index_helper.index_read_article(path, article_id)
+        if node is None:
+            continue
+        was_read = node.get('read') == 'true'
+        signature = bloom_helper.bloom_xml_signature(path)
+        if tree is not None or not index_helper.index_set_read(path, article_id, read):
+            if tree is None:
+                tree = xml_helper.xml_load_tree(path)
+            for article_node in tree.getroot().findall(f"article[@id='{article_id}']"):
+                article_node.set('read', str(read).lower())
+            _write_tree(path, tree)
+        bloom_helper.bloom_after_rewrite(path, signature)
+        if was_read != read:
+            partition['unread'] += -1 if read else 1
+            store_save_manifest(store_dir, manifest)
+        return True
+    return None
+
+
+def store_set_bodies(store_dir: str, bodies: Dict[int, str]) -> int:
+    """ Zapis skrótów pobranych treści artykułów
+
+    Skrót treści (body_helper) jest zapisywany w atrybucie body artykułu. Sama treść jest przechowywana w magazynie
+    treści artykułów, dzięki czemu partycje pozostają małe. Zapisywane są tylko partycje aktywne, w których zmieniono
+    co najmniej jeden artykuł, a po zmianie zapisywany jest manifest (nowa generacja danych).
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param bodies: Słownik identyfikator artykułu -> skrót treści
+    :type bodies: dict
+    :return: Ilość zmienionych artykułów
+    :rtype: int
+    """
+    amount = 0
+    manifest = store_load_manifest(store_dir)
+    for partition in manifest['partitions'].values():
+        ids = [article_id for article_id in bodies if partition['min_id'] <= article_id <= partition['max_id']]
+        if _is_cold(partition) or not ids:
+            continue
+        path = store_partition_path(store_dir, partition)
+        tree = store_load_partition(store_dir, partition)
+        changed = 0
+        for node in tree.getroot().findall('article'):
+            content_hash = bodies.get(int(node.get('id')))
+            if content_hash and node.get('body') != content_hash:
+                node.set('body', content_hash)
+                changed += 1
+        if changed:
+            signature = bloom_helper.bloom_xml_signature(path)
+            _write_tree(path, tree)
+            bloom_helper.bloom_after_rewrite(path, signature)
+            amount += changed
+    if amount:
+        store_save_manifest(store_dir, manifest)
+    return amount
+
+
+def _period_end(period: str) -> datetime:
+    """ Początek miesiąca następującego po okresie partycji (RRRR-MM) """
+    year, month = (int(part) for part in period.split('-'))
+    return datetime(year + month // 12, month % 12 + 1, 1)
+
+
+def _store_bytes(store_dir: str, *folders: str) -> int:
+    """ Łączna wielkość plików partycji w podanych podkatalogach źródła danych. Pliki filtrów Blooma i indeksów nie są
+    liczone - ich wielkość nie zależy od kompresji, a filtr Blooma ma wielkość minimalną nawet dla małej partycji """
+    suffixes = ('.xml',) + tuple(f'.xml.{extension}' for extension in COLD_FORMATS)
+    amount = 0
+    for folder in folders:
+        for parent, _, files in os.walk(os.path.join(store_dir, folder)):
+            amount += sum(os.path.getsize(os.path.join(parent, name)) for name in files if name.endswith(suffixes))
+    return amount
+
+
+def _hot_load_time(store_dir: str, partitions: Dict[str, dict]) -> float:
+    """ Czas (w sekundach) załadowania wszystkich partycji aktywnych """
+    start = time.perf_counter()
+    for partition in partitions.values():
+        if not _is_cold(partition):
+            store_load_partition(store_dir, partition)
+    return time.perf_counter() - start
+
+
+def _remove_partition_files(path: str) -> None:
+    """ Usunięcie pliku partycji razem z plikami filtra Blooma i indeksu """
+    for file_path in (path, bloom_helper.bloom_path(path), index_helper.index_path(path)):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def store_compact(store_dir: str, retention_days: int = RETENTION_DAYS, cold_format: str = 'gz') -> dict:
+    """ Przeniesienie starych, przeczytanych artykułów do skompresowanych partycji archiwalnych
+
+    Z każdej partycji aktywnej, której okres zakończył się co najmniej retention_days dni temu, przeczytane artykuły
+    są przenoszone do partycji archiwalnej tego samego źródła i okresu (istniejąca partycja archiwalna jest
+    uzupełniana). Nieprzeczytane artykuły zostają w partycji aktywnej. Pusta partycja aktywna jest usuwana.
+
+    :param store_dir: Katalog źródła danych
+    :type store_dir: str
+    :param retention_days: Wiek (w dniach), po którym przeczytane artykuły trafiają do archiwum
+    :type retention_days: int
+    :param cold_format: Format kompresji nowych partycji archiwalnych: gz, xz
+    :type cold_format: str
+    :return: Raport z kluczami: moved (ilość przeniesionych artykułów), bytes_before, bytes_after (wielkość plików
+    wszystkich partycji, bez plików filtrów Blooma i indeksów), hot_bytes_before, hot_bytes_after (wielkość plików
+    partycji aktywnych), load_time_before, load_time_after (czas załadowania partycji aktywnych w sekundach)
+    :rtype: dict
+    """
+    manifest = store_load_manifest(store_dir)
+    partitions = manifest['partitions']
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    report = {'moved': 0, 'bytes_before': _store_bytes(store_dir, 'partitions', 'cold'),
+              'hot_bytes_before': _store_bytes(store_dir, 'partitions'),
+              'load_time_before': _hot_load_time(store_dir, partitions)}
+
+    for key, partition in list(partitions.items()):
+        if _is_cold(partition) or partition['unread'] == partition['count'] or \
+                _period_end(partition['period']) > cutoff:
+            continue
+        tree = store_load_partition(store_dir, partition)
+        read_nodes = [node for node in tree.getroot().findall('article') if node.get('read') == 'true']
+
+        cold = partitions.get(f"{key}/cold")
+        if cold is None:
+            cold = {'source': partition['source'], 'period': partition['period'], 'tier': 'cold',
+                    'path': f"cold/{store_source_slug(partition['source'])}/{partition['period']}.xml.{cold_format}",
+                    'count': 0, 'unread': 0, 'min_id': 0, 'max_id': 0}
+            cold_tree = ElementTree.ElementTree(ElementTree.Element('articles'))
+        else:
+            cold_tree = store_load_partition(store_dir, cold)
+        cold_root = cold_tree.getroot()
+        for node in read_nodes:
+            tree.getroot().remove(node)
+            cold_root.append(node)
+            _partition_add_ids(cold, int(node.get('id')), True)
+        cold_root[:] = sorted(cold_root, key=lambda item: int(item.get('id')))
+        _write_partition(store_partition_path(store_dir, cold), cold_tree, None, [])
+        partitions[f"{key}/cold"] = cold
+
+        path = store_partition_path(store_dir, partition)
+        remaining = tree.getroot().findall('article')
+        if remaining:
+            partition.update({'count': 0, 'unread': 0, 'min_id': 0, 'max_id': 0})
+            for node in remaining:
+                _partition_add_ids(partition, int(node.get('id')), node.get('read') == 'true')
+            _write_partition(path, tree, None, [])
+        else:
+            _remove_partition_files(path)
+            del partitions[key]
+        report['moved'] += len(read_nodes)
+
+    if report['moved']:
+        store_save_manifest(store_dir, manifest)
+        logger_helper.log_warning(f"Przeniesiono do archiwum {report['moved']} przeczytanych artykułów")
+    report['bytes_after'] = _store_bytes(store_dir, 'partitions', 'cold')
+    report['hot_bytes_after'] = _store_bytes(store_dir, 'partitions')
+    report['load_time_after'] = _hot_load_time(store_dir, partitions)
+    return report
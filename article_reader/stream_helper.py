@@ -0,0 +1,123 @@
+"""
+Moduł zawiera funkcje do strumieniowego (przyrostowego) odczytu artykułów ze strony www.
+
+Zawartość strony jest przekazywana do parsera lxml w kawałkach, w miarę jej pobierania. Artykuł jest zwracany zaraz po
+zamknięciu znacznika <a>, w którym się znajduje, dzięki czemu nie trzeba trzymać w pamięci całej strony ani całego
+drzewa dokumentu.
+
+Klasy:
+- ArticleTarget - Obiekt docelowy parsera lxml, który wyszukuje artykuły w strumieniu zdarzeń parsera
+
+Funkcje:
+- stream_articles - Przyrostowe parsowanie kawałków strony www i zwracanie artykułów
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- PROMO_CLASS - Wartość atrybutu class elementu z artykułem promowanym
+"""
+# Standard library imports
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Third party imports
+from lxml import etree
+
+# Local application import
+# from . import normalize_helper
+import normalize_helper
+
+PROMO_CLASS = 'standard-promo perspective-color'
+
+
+class ArticleTarget:
+    """ Obiekt docelowy parsera lxml, który wyszukuje artykuły w strumieniu zdarzeń parsera
+
+    Obiekt rozpoznaje te same artykuły co funkcja get_articles: nagłówek <h2> wewnątrz linku <a> oraz nagłówek <h3>
+    wewnątrz elementu z klasą PROMO_CLASS, który znajduje się w linku <a>. Gotowe artykuły są odkładane na liście
+    ready i odbierane przez funkcję stream_articles.
+    """
+
+    def __init__(self):
+        self.ready: List[Tuple[str, str]] = []
+        self._links: List[list] = []
+        self._text: Optional[List[str]] = None
+        self._text_tag: Optional[str] = None
+        self._text_depth = 0
+        self._promo_depth = 0
+        self._depth = 0
+
+    def start(self, tag, attrib):
+        """ Obsługa otwarcia znacznika """
+        self._depth += 1
+        if tag == 'a':
+            self._links.append([attrib.get('href'), []])
+        elif self._text is not None:
+            return
+        elif tag == 'h2' and self._links:
+            self._begin_text(tag)
+        elif tag == 'h3' and self._promo_depth and self._links:
+            self._begin_text(tag)
+            self._promo_depth = 0
+        elif attrib.get('class') == PROMO_CLASS and self._links and not self._promo_depth:
+            self._promo_depth = self._depth
+
+    def end(self, tag):
+        """ Obsługa zamknięcia znacznika. Zamknięcie linku <a> udostępnia znalezione w nim artykuły """
+        if self._text is not None and tag == self._text_tag and self._depth == self._text_depth:
+            self._links[-1][1].append(normalize_helper.normalize_text(''.join(self._text)))
+            self._text = None
+        if self._promo_depth == self._depth:
+            self._promo_depth = 0
+        if tag == 'a' and self._links:
+            link, titles = self._links.pop()
+            self.ready.extend((title, link) for title in titles)
+        self._depth -= 1
+
+    def data(self, data):
+        """ Obsługa tekstu znajdującego się w znaczniku """
+        if self._text is not None:
+            self._text.append(data)
+
+    def close(self):
+        """ Zakończenie parsowania """
+        return None
+
+    def _begin_text(self, tag):
+        """ Rozpoczęcie zbierania tekstu nagłówka z tytułem artykułu """
+        self._text = []
+        self._text_tag = tag
+        self._text_depth = self._depth
+
+
+def stream_articles(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str]]:
+    """ Przyrostowe parsowanie kawałków strony www i zwracanie artykułów
+
+    Funkcja przekazuje kolejne kawałki strony do parsera lxml (HTMLParser.feed) i po każdym kawałku zwraca artykuły,
+    których linki zostały już zamknięte. Pamięć zajmowana przez funkcję nie zależy od wielkości strony.
+
+    :param chunks: Kolejne kawałki zawartości strony www, np. z response.iter_content()
+    :type chunks: Iterable[bytes]
+    :return: Generator artykułów w postaci krotek (tytuł, link)
+    :rtype: Iterator[(str, str)]
+    :exception: W przypadku, gdy w stronie nie było artykułów to generowany jest wyjątek typu Exception
+    """
+    target = ArticleTarget()
+    parser = etree.HTMLParser(target=target)
+    found, fed = False, False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        fed = True
+        if target.ready:
+            found = True
+            yield from target.ready
+            target.ready.clear()
+    if fed:
+        parser.close()
+    if target.ready:
+        found = True
+        yield from target.ready
+    if not found:
+        raise Exception("ERROR: I did not find the articles")
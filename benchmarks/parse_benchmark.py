@@ -0,0 +1,67 @@
+"""
+Skrypt mierzy czas parsowania stron www z artykułami przy różnej ilości procesów parsujących.
+
+Jako dane wejściowe wykorzystywana jest strona wzorcowa z testów jednostkowych, powielona podaną ilość razy. Wynik
+pokazuje czas parsowania oraz przyspieszenie względem parsowania w jednym procesie.
+
+Uruchomienie skryptu odbywa się poprzez wywołanie:
+`python benchmarks/parse_benchmark.py` - pomiar dla 32 stron
+`python benchmarks/parse_benchmark.py 64` - pomiar dla 64 stron
+
+Funkcje:
+- load_pages - Załadowanie stron wzorcowych
+- run_benchmark - Pomiar czasu parsowania
+"""
+# Standard library imports
+import os
+import pathlib
+import sys
+import time
+from typing import List
+
+# Local application import
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / 'article_reader'))
+import article_reader  # noqa: E402
+
+
+def load_pages(amount: int) -> List[bytes]:
+    """ Załadowanie stron wzorcowych
+
+    :param amount: Ilość stron do przygotowania
+    :type amount: int
+    :return: Lista surowych zawartości stron www
+    :rtype: list[bytes]
+    """
+    data_path = pathlib.Path(__file__).parent.parent / 'tests' / 'data' / 'test_data_get_articles.txt'
+    content = data_path.read_bytes()
+    return [content] * amount
+
+
+def run_benchmark(amount: int):
+    """ Pomiar czasu parsowania
+
+    Funkcja parsuje strony kolejno dla 1, 2, 4, ... procesów (do ilości rdzeni procesora) i wyświetla wyniki.
+
+    :param amount: Ilość stron do sparsowania
+    :type amount: int
+    :return: ---
+    :rtype: ---
+    """
+    pages = load_pages(amount)
+    workers_list = [1]
+    while workers_list[-1] * 2 <= (os.cpu_count() or 1):
+        workers_list.append(workers_list[-1] * 2)
+
+    base_time = None
+    for workers in workers_list:
+        start = time.perf_counter()
+        articles = article_reader.get_articles_from_pages(pages, workers=workers)
+        elapsed = time.perf_counter() - start
+        if base_time is None:
+            base_time = elapsed
+        print(f"workers: {workers:3d}  pages: {amount}  articles: {len(articles)}  time: {elapsed:.3f} s  "
+              f"speedup: {base_time / elapsed:.2f}x")
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 32)
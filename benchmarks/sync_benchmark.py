@@ -0,0 +1,68 @@
+"""
+Skrypt mierzy czas pełnej synchronizacji wielu źródeł na podstawie odpowiedzi nagranych w archiwum (bez dostępu do
+sieci).
+
+Archiwum należy wcześniej nagrać poleceniem `python article_reader/article_reader.py --record pages.warc.gz`. Każdy
+pomiar wykonywany jest na nowym, pustym katalogu z artykułami i z nowym harmonogramem pobrań, dlatego wyniki są
+powtarzalne. Pomiar wykonywany jest dla parsowania w jednym procesie, parsowania w wielu procesach, parsowania
+strumieniowego oraz synchronizacji w wielu procesach roboczych ze wspólną kolejką źródeł.
+
+Uruchomienie skryptu odbywa się poprzez wywołanie:
+`python benchmarks/sync_benchmark.py pages.warc.gz` - pomiar bez opóźnienia sieci
+`python benchmarks/sync_benchmark.py pages.warc.gz 0.2` - pomiar z opóźnieniem 0.2 s dla każdej odpowiedzi
+
+Funkcje:
+- run_benchmark - Pomiar czasu synchronizacji
+"""
+# Standard library imports
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+# Local application import
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / 'article_reader'))
+import article_reader  # noqa: E402
+import fetch_helper  # noqa: E402
+import scheduler_helper  # noqa: E402
+
+
+def run_benchmark(archive_path: str, latency: float):
+    """ Pomiar czasu synchronizacji
+
+    Synchronizowane są wszystkie adresy nagrane w archiwum.
+
+    :param archive_path: Ścieżka do archiwum odpowiedzi HTTP
+    :type archive_path: str
+    :param latency: Opóźnienie (w sekundach) dodawane do każdej odpowiedzi
+    :type latency: float
+    :return: ---
+    :rtype: ---
+    """
+    urls = list(fetch_helper.fetch_archive_read(archive_path))
+    fetch_helper.fetch_configure('replay', archive_path, latency)
+    variants = [('workers=1', {'workers': 1}),
+                (f'workers={os.cpu_count() or 1}', {'workers': os.cpu_count() or 1}),
+                ('stream', {'stream': True})]
+    for name, options in variants:
+        with tempfile.TemporaryDirectory() as store_dir:
+            scheduler_helper.scheduler_configure()
+            start = time.perf_counter()
+            added, failed = article_reader.sync_sources(urls, store_dir, os.path.join(store_dir, 'sync_state.json'),
+                                                        **options)
+            elapsed = time.perf_counter() - start
+        print(f"{name:12s}  sources: {len(urls)}  added: {added}  failed: {failed}  time: {elapsed:.3f} s")
+    for workers in (1, os.cpu_count() or 1):
+        with tempfile.TemporaryDirectory() as store_dir:
+            scheduler_helper.scheduler_configure()
+            start = time.perf_counter()
+            added, failed = article_reader.run_coordinator(urls, store_dir, os.path.join(store_dir, 'sync_state.json'),
+                                                           os.path.join(store_dir, 'queue.sqlite'), workers)
+            elapsed = time.perf_counter() - start
+        print(f"{f'sync-workers={workers}':12s}  sources: {len(urls)}  added: {added}  failed: {failed}  "
+              f"time: {elapsed:.3f} s")
+
+
+if __name__ == '__main__':
+    run_benchmark(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 0.0)
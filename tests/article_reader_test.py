@@ -8,6 +8,10 @@ Funkcje:
 - test_get_page_content - Sprawdzenie czy funkcja zwraca jakąś zawartość
 - test_get_articles_amount - Sprawdzenie czy funkcja zwraca prawidłową liczbę artykułów.
 - test_get_articles_empty_html - Sprawdzenie czy pojawia się wyjątek przy podaniu pustego HTML-a do funkcji
+- test_get_articles_from_pages_workers - Sprawdzenie czy parsowanie w wielu procesach daje ten sam wynik co w jednym
+- test_sync_sources_skips_unchanged - Sprawdzenie czy niezmieniona strona nie jest ponownie przetwarzana
+- test_sync_sources_changes - Sprawdzenie zapisu zmienionych artykułów i odczytu dziennika zmian z kursorem
+- test_select_commands - Sprawdzenie wyboru poleceń podanych w linii komend
 
 Wyjątki (exceptions):
 - brak
@@ -16,6 +20,7 @@ Inne obiekty:
 - brak
 """
 # Standard library imports
+import json
 from unittest.mock import patch
 
 # Third party imports
@@ -25,7 +30,7 @@ import pytest
 import article_reader.article_reader as ar
 
 
-@patch('article_reader.article_reader.requests')
+@patch('article_reader.article_reader.fetch_helper.requests')
 def test_get_page_content(mock_get):
     """ Sprawdzenie czy funkcja zwraca jakąś wartość, w przypadku gdy połączy się z podanym adresem.
     Test używa mocka
@@ -41,7 +46,7 @@ def test_get_page_content(mock_get):
     assert return_value == template_value
 
 
-@patch('article_reader.article_reader.requests')
+@patch('article_reader.article_reader.fetch_helper.requests')
 def test_get_page_content_no_content(mock_get):
     """ Sprawdzenie czy funkcja zwraca pustą wartość, w przypadku nie uda się pobrać danych spod podanego adresu.
     Test używa mocka
@@ -74,3 +79,78 @@ def test_get_articles_empty_html():
     html = ''
     with pytest.raises(Exception):
         ar.get_articles(html)
+
+
+def test_get_articles_from_pages_workers():
+    """ Sprawdzenie czy parsowanie w wielu procesach daje ten sam wynik co parsowanie w jednym procesie """
+    with open('./data/test_data_get_articles.txt', 'rb') as data_file:
+        content = data_file.read()
+    pages = [content, content, content]
+
+    sequential = ar.get_articles_from_pages(pages, workers=1)
+    parallel = ar.get_articles_from_pages(pages, workers=2)
+
+    assert parallel == sequential
+    assert len(parallel) == 3 * len(ar.get_articles(content))
+    assert all(type(article) is tuple for article in parallel)
+
+
+@patch('article_reader.article_reader.get_page_content')
+def test_sync_sources_skips_unchanged(mock_get_page_content, tmp_path):
+    """ Sprawdzenie czy strona, której zawartość nie zmieniła się od ostatniej synchronizacji, nie jest ponownie
+    parsowana ani zapisywana.
+
+    Test używa mocka zamiast pobierania strony z sieci.
+    """
+    with open('./data/test_data_get_articles.txt', 'rb') as data_file:
+        mock_get_page_content.return_value = data_file.read()
+    store_dir = str(tmp_path)
+    state_file_path = str(tmp_path / 'state.json')
+
+    added, failed = ar.sync_sources(['url1'], store_dir, state_file_path)
+    assert added > 0
+    assert failed == 0
+
+    with patch('article_reader.article_reader.parse_pages') as mock_parse_pages:
+        mock_parse_pages.return_value = []
+        added, failed = ar.sync_sources(['url1'], store_dir, state_file_path)
+        mock_parse_pages.assert_called_once_with([], workers=1)
+    assert added == 0
+
+
+@patch('article_reader.article_reader.get_page_content')
+def test_sync_sources_changes(mock_get_page_content, tmp_path, capsys):
+    """ Sprawdzenie zapisu zmienionych artykułów i odczytu dziennika zmian z kursorem.
+
+    Test używa mocka zamiast pobierania strony z sieci.
+    """
+    store_dir = str(tmp_path)
+    state_file_path = str(tmp_path / 'state.json')
+    cursor_path = str(tmp_path / 'changes_test.cursor')
+    mock_get_page_content.return_value = b'<a href="/1"><h2>Tytul 1</h2></a><a href="/2"><h2>Tytul 2</h2></a>'
+    assert ar.sync_sources(['url1'], store_dir, state_file_path) == (2, 0)
+    assert ar.show_changes(store_dir, cursor_path) == 2
+
+    mock_get_page_content.return_value = b'<a href="/1b"><h2>Tytul 1</h2></a>'
+    assert ar.sync_sources(['url1'], store_dir, state_file_path) == (0, 0)
+    capsys.readouterr()
+
+    assert ar.show_changes(store_dir, cursor_path) == 2
+    changes = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(change['op'], change['key']) for change in changes] == [('upd', 'tytul 1'), ('del', 'tytul 2')]
+    assert changes[0]['link'] == 'https://www2.deloitte.com/1b'
+    assert ar.show_changes(store_dir, cursor_path) == 0
+
+
+def test_select_commands(tmp_path, capsys):
+    """ Sprawdzenie wyboru poleceń podanych w linii komend. Bez poleceń wybierany jest odczyt artykułów ze stron www """
+    store_dir = str(tmp_path)
+    with patch('sys.argv', ['article_reader.py']):
+        assert ar.select_commands(ar.get_command_arguments(), store_dir, 'queue', 'app.log', ['url1']) == []
+
+    with patch('sys.argv', ['article_reader.py', '-v', '--changes']):
+        commands = ar.select_commands(ar.get_command_arguments(), store_dir, 'queue', 'app.log', ['url1'])
+    assert [(uses_store, header) for uses_store, header, _ in commands] == [(False, 'ABOUT SCRIPT:'), (True, None)]
+    for _, _, command in commands:
+        command()
+    assert 'URL to articles: url1' in capsys.readouterr().out
@@ -0,0 +1,69 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module bloom_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_bloom_contains - Sprawdzenie czy dodane klucze są odnajdywane w filtrze
+- test_bloom_false_positive_rate - Sprawdzenie czy odsetek fałszywie pozytywnych odpowiedzi jest niski
+- test_bloom_load_stale - Sprawdzenie czy filtr jest odrzucany po zmianie pliku xml
+- test_bloom_after_rewrite - Sprawdzenie aktualizacji sygnatury filtra po zapisie pliku xml
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Local application import
+import article_reader.bloom_helper as helper
+
+
+def test_bloom_contains():
+    """ Sprawdzenie czy dodane klucze są odnajdywane w filtrze """
+    bloom = helper.bloom_create(100)
+    for i in range(100):
+        helper.bloom_add(bloom, f"Tytuł {i}")
+
+    assert all(helper.bloom_contains(bloom, f"Tytuł {i}") for i in range(100))
+    assert bloom['count'] == 100
+
+
+def test_bloom_false_positive_rate():
+    """ Sprawdzenie czy odsetek fałszywie pozytywnych odpowiedzi jest bliski założonemu """
+    bloom = helper.bloom_create(5000)
+    for i in range(5000):
+        helper.bloom_add(bloom, f"Tytuł {i}")
+
+    false_positives = sum(helper.bloom_contains(bloom, f"Inny tytuł {i}") for i in range(10000))
+    assert false_positives < 10000 * helper.ERROR_RATE * 5
+
+
+def test_bloom_load_stale(tmp_path):
+    """ Sprawdzenie czy zapisany filtr jest odczytywany i odrzucany po zmianie pliku xml """
+    xml_file_path = tmp_path / 'articles.xml'
+    xml_file_path.write_text('<articles></articles>')
+    bloom = helper.bloom_create(10)
+    helper.bloom_add(bloom, 'Tytuł')
+    helper.bloom_save(bloom, str(xml_file_path))
+
+    loaded = helper.bloom_load(str(xml_file_path))
+    assert loaded is not None
+    assert helper.bloom_contains(loaded, 'Tytuł')
+
+    xml_file_path.write_text('<articles><article/></articles>')
+    assert helper.bloom_load(str(xml_file_path)) is None
+
+
+def test_bloom_after_rewrite(tmp_path):
+    """ Sprawdzenie czy po zapisie pliku xml bez zmiany kluczy filtr pozostaje aktualny """
+    xml_file_path = tmp_path / 'articles.xml'
+    xml_file_path.write_text('<articles read="false"></articles>')
+    helper.bloom_save(helper.bloom_create(10), str(xml_file_path))
+
+    signature = helper.bloom_xml_signature(str(xml_file_path))
+    xml_file_path.write_text('<articles read="true" ></articles>')
+    helper.bloom_after_rewrite(str(xml_file_path), signature)
+
+    assert helper.bloom_load(str(xml_file_path)) is not None
@@ -0,0 +1,82 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module body_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_body_canonical_link - Sprawdzenie kanonicznej postaci linku
+- test_body_extract_text - Sprawdzenie wyodrębnienia głównego tekstu artykułu
+- test_body_cache_store - Sprawdzenie zapisu i odczytu treści z magazynu
+- test_body_fetch_all - Sprawdzenie, że każdy link jest pobierany co najwyżej raz i z ograniczoną współbieżnością
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import threading
+import time
+
+# Local application import
+import article_reader.body_helper as helper
+
+
+def test_body_canonical_link():
+    """ Sprawdzenie kanonicznej postaci linku """
+    assert helper.body_canonical_link('/blog/a?utm_source=x&b=2&a=1#top', 'HTTPS://Example.COM:443/pl/') == \
+           'https://example.com/blog/a?a=1&b=2'
+    assert helper.body_canonical_link('http://example.com:8080') == 'http://example.com:8080/'
+
+
+def test_body_extract_text():
+    """ Sprawdzenie wyodrębnienia głównego tekstu artykułu """
+    html = '<html><body><nav><p>Menu</p></nav><article><h1>Tytuł</h1><p>Pierwszy  akapit.</p>' \
+           '<script>var x;</script><p>Drugi akapit.</p></article><footer><p>Stopka</p></footer></body></html>'
+
+    assert helper.body_extract_text(html) == 'Tytuł\n\nPierwszy akapit.\n\nDrugi akapit.'
+
+
+def test_body_cache_store(tmp_path):
+    """ Sprawdzenie zapisu i odczytu treści z magazynu """
+    cache_dir = str(tmp_path)
+    assert helper.body_cache_lookup(cache_dir, 'https://example.com/a') is None
+
+    first = helper.body_cache_store(cache_dir, 'https://example.com/a', 'Treść artykułu')
+    second = helper.body_cache_store(cache_dir, 'https://example.com/b', 'Treść artykułu')
+
+    assert first == second
+    assert helper.body_cache_lookup(cache_dir, 'https://example.com/a') == first
+    assert helper.body_cache_read(cache_dir, first) == 'Treść artykułu'
+    assert len(list((tmp_path / 'objects').rglob('*.gz'))) == 1
+
+
+def test_body_fetch_all(tmp_path):
+    """ Sprawdzenie, że każdy link jest pobierany co najwyżej raz i z ograniczoną współbieżnością """
+    cache_dir = str(tmp_path)
+    fetched, running, max_running = [], [0], [0]
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            fetched.append(url)
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return None if url.endswith('/bad') else f'<p>{url}</p>'.encode('utf-8')
+
+    links = [f'https://example.com/{i}' for i in range(10)] + ['https://example.com/0', 'https://example.com/bad']
+    result = helper.body_fetch_all(links, cache_dir, fetch, workers=3)
+
+    assert sorted(fetched) == sorted(set(links))
+    assert max_running[0] <= 3
+    assert result['https://example.com/bad'] is None
+    assert helper.body_cache_read(cache_dir, result['https://example.com/5']) == 'https://example.com/5'
+
+    fetched.clear()
+    helper.body_fetch_all(links, cache_dir, fetch, workers=3)
+    assert fetched == ['https://example.com/bad']
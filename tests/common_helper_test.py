@@ -5,7 +5,6 @@ Klasy:
 - brak
 
 Funkcje:
-- test_remove_characters - Sprawdzenie usunięcia znaków specjalnych
 - test_complete_link - Sprawdzenie skompletowania linku do strony WEB
 
 Wyjątki (exceptions):
@@ -28,16 +27,3 @@ def test_complete_link():
     result_link = ch.complete_link(part_link)
 
     assert result_link == prefix + part_link
-
-
-def test_remove_characters():
-    """ Sprawdzenie usunięcia znaków specjalnych
-
-    Test sprawdza, czy z podanego ciągu znaków zostały usunięte znaki specjalne oraz białe spacje.
-    """
-    src_string = "Something \xa0 is in our garden "
-
-    result_string = ch.remove_characters(src_string)
-
-    assert result_string.find("\xa0") == -1
-    assert len(result_string) == len(result_string.strip())
@@ -0,0 +1,69 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module diff_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_diff_compare - Sprawdzenie klasyfikacji artykułów jako dodane, zmienione i usunięte
+- test_diff_compare_duplicates - Sprawdzenie pomijania powtórzonych artykułów
+- test_diff_log - Sprawdzenie zapisu i przyrostowego odczytu dziennika zmian
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Local application import
+import article_reader.diff_helper as helper
+
+SNAPSHOT_ARTICLES = [['Bez zmian', '/1'], ['Nowy link', '/2'], ['Stary tytuł', '/3'], ['Usunięty', '/4'],
+                     ['wielkość liter', '/5']]
+
+
+def test_diff_compare():
+    """ Sprawdzenie klasyfikacji artykułów jako dodane, zmienione i usunięte """
+    _, snapshot = helper.diff_compare({}, SNAPSHOT_ARTICLES)
+    articles = [['Nowy', '/6'], ['Bez zmian', '/1'], ['Nowy link', '/2b'], ['Nowy tytuł', '/3'],
+                ['Wielkość Liter', '/5']]
+
+    changes, new_snapshot = helper.diff_compare(snapshot, articles)
+
+    assert changes['added'] == [('Nowy', '/6')]
+    assert changes['updated'] == [('nowy link', 'Nowy link', '/2b'), ('stary tytuł', 'Nowy tytuł', '/3'),
+                                  ('wielkość liter', 'Wielkość Liter', '/5')]
+    assert changes['removed'] == [('usunięty', '/4')]
+    assert sorted(new_snapshot) == ['bez zmian', 'nowy', 'nowy link', 'nowy tytuł', 'wielkość liter']
+    assert new_snapshot['bez zmian'] == snapshot['bez zmian']
+    assert helper.diff_compare(new_snapshot, articles)[0] == {'added': [], 'updated': [], 'removed': []}
+
+
+def test_diff_compare_duplicates():
+    """ Sprawdzenie pomijania powtórzonych artykułów """
+    _, snapshot = helper.diff_compare({}, [['Tytuł', '/1']])
+
+    changes, new_snapshot = helper.diff_compare(snapshot, [['Tytuł', '/1'], ['TYTUŁ', '/2'], ['Inny', '/1']])
+
+    assert changes == {'added': [('Inny', '/1')], 'updated': [], 'removed': []}
+    assert list(new_snapshot) == ['tytuł', 'inny']
+
+
+def test_diff_log(tmp_path):
+    """ Sprawdzenie zapisu i przyrostowego odczytu dziennika zmian """
+    log_path = str(tmp_path / 'changes.jsonl')
+    changes = {'added': [('Nowy', '/6')], 'updated': [('stary', 'Nowy tytuł', '/3')], 'removed': [('usunięty', '/4')]}
+
+    assert helper.diff_log_append(log_path, 'https://a', changes) == 3
+    assert helper.diff_log_append(log_path, 'https://a', {'added': [], 'updated': [], 'removed': []}) == 0
+    entries = list(helper.diff_log_read(log_path))
+
+    assert [(entry['op'], entry['key'], entry['src']) for _, entry in entries] == \
+           [('add', 'nowy', 'https://a'), ('upd', 'stary', 'https://a'), ('del', 'usunięty', 'https://a')]
+    assert 'title' not in entries[2][1]
+
+    offset = entries[-1][0]
+    with open(log_path, 'a', encoding='utf-8') as log_file:
+        log_file.write('{"op":"add"')
+    assert list(helper.diff_log_read(log_path, offset)) == []
+    assert list(helper.diff_log_read(str(tmp_path / 'missing.jsonl'))) == []
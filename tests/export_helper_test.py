@@ -0,0 +1,115 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module export_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- create_xml_file - Utworzenie pliku xml z artykułami na potrzeby testów
+- run_export - Eksport artykułów z pliku xml w podanym formacie
+- test_export_json_lines - Sprawdzenie czy eksport JSON Lines zwraca jedną linię na artykuł
+- test_export_csv - Sprawdzenie czy eksport CSV zawiera nagłówek i wszystkie artykuły
+- test_export_rss_unread - Sprawdzenie czy kanał RSS zawiera tylko nieprzeczytane artykuły
+- test_export_atom_unread - Sprawdzenie czy kanał Atom jest poprawnym xml-em z nieprzeczytanymi artykułami
+- test_export_articles_cursor - Sprawdzenie czy eksport przyrostowy zwraca tylko nowe artykuły
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import csv
+import io
+import json
+import xml.etree.ElementTree as ElementTree
+
+# Local application import
+import article_reader.export_helper as helper
+import article_reader.xml_helper as xml_helper
+
+
+def create_xml_file(path, amount: int = 4) -> str:
+    """ Utworzenie pliku xml z artykułami na potrzeby testów
+
+    Co drugi artykuł jest oznaczony jako przeczytany.
+
+    :param path: Katalog, w którym tworzony jest plik
+    :type path: pathlib.Path
+    :param amount: Ilość artykułów w pliku
+    :type amount: int
+    :return: Ścieżka do pliku xml
+    :rtype: str
+    """
+    articles = ''.join(f'<article id="{i}" read="{str(i % 2 == 0).lower()}"><title>Tytuł &amp; {i}</title>'
+                       f'<link>https://localhost/{i}</link></article>' for i in range(1, amount + 1))
+    file_path = path / 'articles.xml'
+    file_path.write_text(f"<?xml version='1.0' encoding='utf-8'?><articles>{articles}</articles>", encoding='utf-8')
+    return str(file_path)
+
+
+def run_export(xml_file_path: str, export_format: str, cursor_path: str = None) -> list:
+    """ Eksport artykułów z pliku xml w podanym formacie
+
+    :return: Lista fragmentów tekstu zwróconych przez eksport
+    :rtype: list[str]
+    """
+    return list(helper.export_articles(xml_helper.xml_iter_articles(xml_file_path), export_format, cursor_path))
+
+
+def test_export_json_lines(tmp_path):
+    """ Sprawdzenie czy eksport JSON Lines zwraca jedną linię na artykuł """
+    xml_file_path = create_xml_file(tmp_path)
+
+    lines = run_export(xml_file_path, 'jsonl')
+
+    assert len(lines) == 4
+    first = json.loads(lines[0])
+    assert first == {'id': 1, 'read': False, 'title': 'Tytuł & 1', 'link': 'https://localhost/1'}
+
+
+def test_export_csv(tmp_path):
+    """ Sprawdzenie czy eksport CSV zawiera nagłówek i wszystkie artykuły """
+    xml_file_path = create_xml_file(tmp_path)
+
+    rows = list(csv.reader(io.StringIO(''.join(run_export(xml_file_path, 'csv')))))
+
+    assert rows[0] == ['id', 'read', 'title', 'link']
+    assert len(rows) == 5
+    assert rows[2] == ['2', 'true', 'Tytuł & 2', 'https://localhost/2']
+
+
+def test_export_rss_unread(tmp_path):
+    """ Sprawdzenie czy kanał RSS zawiera tylko nieprzeczytane artykuły """
+    xml_file_path = create_xml_file(tmp_path)
+
+    root = ElementTree.fromstring(''.join(run_export(xml_file_path, 'rss')).encode('utf-8'))
+
+    titles = [node.text for node in root.iter('title')][1:]
+    assert titles == ['Tytuł & 1', 'Tytuł & 3']
+
+
+def test_export_atom_unread(tmp_path):
+    """ Sprawdzenie czy kanał Atom jest poprawnym xml-em z nieprzeczytanymi artykułami """
+    xml_file_path = create_xml_file(tmp_path)
+
+    root = ElementTree.fromstring(''.join(run_export(xml_file_path, 'atom')).encode('utf-8'))
+
+    entries = root.findall('{http://www.w3.org/2005/Atom}entry')
+    assert len(entries) == 2
+
+
+def test_export_articles_cursor(tmp_path):
+    """ Sprawdzenie czy eksport przyrostowy zwraca tylko artykuły dodane od poprzedniego eksportu """
+    cursor_path = str(tmp_path / 'export_test.cursor')
+    xml_file_path = create_xml_file(tmp_path, 2)
+
+    assert len(run_export(xml_file_path, 'jsonl', cursor_path)) == 2
+    assert helper.export_read_cursor(cursor_path) == 2
+    assert run_export(xml_file_path, 'jsonl', cursor_path) == []
+
+    create_xml_file(tmp_path, 5)
+    lines = run_export(xml_file_path, 'jsonl', cursor_path)
+    assert [json.loads(line)['id'] for line in lines] == [3, 4, 5]
+    assert helper.export_read_cursor(cursor_path) == 5
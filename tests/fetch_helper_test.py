@@ -0,0 +1,141 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module fetch_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- live_mode - Przywrócenie trybu live po każdym teście
+- test_fetch_archive_roundtrip - Sprawdzenie zapisu i odczytu odpowiedzi z archiwum
+- test_fetch_replay - Sprawdzenie odtwarzania odpowiedzi przez get_page_content i get_page_stream
+- test_fetch_replay_latency - Sprawdzenie symulowanego opóźnienia w trybie replay
+- test_fetch_stream_holds_slot - Sprawdzenie zajęcia miejsca w harmonogramie do końca czytania odpowiedzi strumieniowej
+- test_fetch_record - Sprawdzenie nagrywania odpowiedzi pobranych z sieci
+- test_sync_sources_replay - Sprawdzenie synchronizacji wielu źródeł bez dostępu do sieci
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import threading
+import time
+from unittest.mock import patch
+
+# Third party imports
+import pytest
+
+# Local application import
+import article_reader.article_reader as ar
+import article_reader.store_helper as store_helper
+# moduły są importowane w article_reader bez nazwy pakietu - testy muszą konfigurować ten sam obiekt modułu
+fetch_helper = ar.fetch_helper
+
+URL = 'https://example.com/blog'
+
+
+@pytest.fixture(autouse=True)
+def live_mode():
+    """ Przywrócenie trybu live po każdym teście. Każdy test zaczyna z nowym harmonogramem pobrań """
+    ar.scheduler_helper.scheduler_configure()
+    yield
+    fetch_helper.fetch_configure('live')
+
+
+def test_fetch_archive_roundtrip(tmp_path):
+    """ Sprawdzenie zapisu i odczytu odpowiedzi z archiwum """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    fetch_helper.fetch_archive_write(archive_path, URL, 200, 'OK',
+                                     {'Content-Type': 'text/html; charset=utf-8', 'Content-Encoding': 'gzip'},
+                                     b'<p>1</p>')
+    fetch_helper.fetch_archive_write(archive_path, URL, 200, 'OK', {}, b'<p>2</p>\r\n\r\n')
+    fetch_helper.fetch_archive_write(archive_path, URL + '/x', 404, 'Not Found', {}, b'')
+
+    records = fetch_helper.fetch_archive_read(archive_path)
+
+    assert list(records) == [URL, URL + '/x']
+    assert records[URL]['body'] == b'<p>2</p>\r\n\r\n'
+    assert records[URL + '/x']['status'] == 404
+    assert records[URL + '/x']['reason'] == 'Not Found'
+    assert records[URL]['headers'] == {'Content-Length': '12'}
+
+
+def test_fetch_replay(tmp_path):
+    """ Sprawdzenie odtwarzania odpowiedzi przez get_page_content i get_page_stream """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    fetch_helper.fetch_archive_write(archive_path, URL, 200, 'OK', {'Content-Type': 'text/html; charset=utf-8'},
+                                     'Zażółć'.encode('utf-8'))
+    fetch_helper.fetch_archive_write(archive_path, URL + '/x', 404, 'Not Found', {}, b'')
+    fetch_helper.fetch_configure('replay', archive_path)
+
+    assert ar.get_page_content(URL) == 'Zażółć'
+    assert b''.join(ar.get_page_stream(URL, chunk_size=2)) == 'Zażółć'.encode('utf-8')
+    assert ar.get_page_content(URL + '/x') is None
+    assert ar.get_page_content(URL + '/missing') is None
+
+
+def test_fetch_replay_latency(tmp_path):
+    """ Sprawdzenie symulowanego opóźnienia w trybie replay """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    fetch_helper.fetch_archive_write(archive_path, URL, 200, 'OK', {}, b'<p>1</p>')
+    fetch_helper.fetch_configure('replay', archive_path, latency=0.05)
+
+    start = time.perf_counter()
+    ar.get_page_content(URL, raw=True)
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_fetch_stream_holds_slot(tmp_path):
+    """ Sprawdzenie zajęcia miejsca w harmonogramie do końca czytania odpowiedzi strumieniowej """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    fetch_helper.fetch_archive_write(archive_path, URL, 200, 'OK', {}, b'<p>1</p>')
+    fetch_helper.fetch_archive_write(archive_path, URL + '/x', 200, 'OK', {}, b'<p>2</p>')
+    fetch_helper.fetch_configure('replay', archive_path)
+    ar.scheduler_helper.scheduler_configure(rate=1000.0, burst=10, max_concurrency=1)
+    stream = ar.get_page_stream(URL, chunk_size=2)
+    assert next(stream) == b'<p'
+
+    # treść pierwszej odpowiedzi nie została jeszcze przeczytana - drugie zapytanie czeka na wolne miejsce
+    thread = threading.Thread(target=ar.get_page_content, args=(URL + '/x',))
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    assert b''.join(stream) == b'>1</p>'
+    thread.join(1.0)
+    assert not thread.is_alive()
+
+
+@patch('article_reader.article_reader.fetch_helper.requests.get')
+def test_fetch_record(mock_get, tmp_path):
+    """ Sprawdzenie nagrywania odpowiedzi pobranych z sieci. Test używa mocka zamiast pobierania strony z sieci. """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.reason = 'OK'
+    mock_get.return_value.headers = {'Content-Type': 'text/html'}
+    mock_get.return_value.content = b'<p>1</p>'
+    fetch_helper.fetch_configure('record', archive_path)
+
+    assert ar.get_page_content(URL, raw=True) == b'<p>1</p>'
+
+    fetch_helper.fetch_configure('replay', archive_path)
+    assert ar.get_page_content(URL, raw=True) == b'<p>1</p>'
+
+
+def test_sync_sources_replay(tmp_path):
+    """ Sprawdzenie synchronizacji wielu źródeł bez dostępu do sieci """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    with open('./data/test_data_get_articles.txt', 'rb') as data_file:
+        content = data_file.read()
+    urls = [f'{URL}/{i}' for i in range(3)]
+    for url in urls:
+        fetch_helper.fetch_archive_write(archive_path, url, 200, 'OK', {'Content-Type': 'text/html'}, content)
+    fetch_helper.fetch_configure('replay', archive_path)
+    store_dir = str(tmp_path / 'store')
+
+    added, failed = ar.sync_sources(urls + [f'{URL}/missing'], store_dir, str(tmp_path / 'state.json'))
+
+    assert (added, failed) == (58, 1)
+    assert store_helper.store_info(store_dir) == (58, 0)
@@ -0,0 +1,106 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module index_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- create_xml_file - Utworzenie pliku xml z artykułami na potrzeby testów
+- test_index_pad_read_flags - Sprawdzenie zapisu atrybutu read ze stałą szerokością
+- test_index_read_article - Sprawdzenie odczytu jednego artykułu na podstawie indeksu
+- test_index_set_read_in_place - Sprawdzenie zmiany flagi read bez zmiany wielkości pliku
+- test_index_rebuild_stale - Sprawdzenie czy nieaktualny indeks jest budowany od nowa
+- test_index_set_read_unpadded - Sprawdzenie czy atrybut bez stałej szerokości nie jest zmieniany w miejscu
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import xml.etree.ElementTree as ElementTree
+
+# Local application import
+import article_reader.index_helper as helper
+import article_reader.xml_helper as xml_helper
+
+
+def create_xml_file(path, amount: int = 5) -> str:
+    """ Utworzenie pliku xml z artykułami na potrzeby testów
+
+    Plik jest zapisywany funkcją xml_save_to_file, tak jak w programie.
+
+    :param path: Katalog, w którym tworzony jest plik
+    :type path: pathlib.Path
+    :param amount: Ilość artykułów w pliku
+    :type amount: int
+    :return: Ścieżka do pliku xml
+    :rtype: str
+    """
+    root = ElementTree.Element('articles')
+    for i in range(1, amount + 1):
+        node = ElementTree.SubElement(root, 'article', {'id': str(i), 'read': str(i % 2 == 0).lower()})
+        ElementTree.SubElement(node, 'title').text = f"Tytuł {i}"
+        ElementTree.SubElement(node, 'link').text = f"https://localhost/{i}"
+    file_path = str(path / 'articles.xml')
+    xml_helper.xml_save_to_file(ElementTree.ElementTree(root), file_path)
+    return file_path
+
+
+def test_index_pad_read_flags():
+    """ Sprawdzenie zapisu atrybutu read ze stałą szerokością """
+    data = b'<articles><article id="1" read="true"><title>read="true" x</title></article>' \
+           b'<article id="2" read="false"></article></articles>'
+
+    padded = helper.index_pad_read_flags(data)
+
+    assert b'<article id="1" read="true" >' in padded
+    assert b'<title>read="true" x</title>' in padded
+    assert b'<article id="2" read="false">' in padded
+
+
+def test_index_read_article(tmp_path):
+    """ Sprawdzenie odczytu jednego artykułu na podstawie indeksu """
+    xml_file_path = create_xml_file(tmp_path)
+
+    node = helper.index_read_article(xml_file_path, 4)
+
+    assert node.get('id') == '4'
+    assert node.get('read') == 'true'
+    assert node.findtext('title') == 'Tytuł 4'
+    assert helper.index_read_article(xml_file_path, 99) is None
+
+
+def test_index_set_read_in_place(tmp_path):
+    """ Sprawdzenie zmiany flagi read bez zmiany wielkości pliku i z zachowaniem poprawności xml-a """
+    xml_file_path = create_xml_file(tmp_path)
+    size = (tmp_path / 'articles.xml').stat().st_size
+
+    assert helper.index_set_read(xml_file_path, 1, True)
+    assert helper.index_set_read(xml_file_path, 2, False)
+
+    assert (tmp_path / 'articles.xml').stat().st_size == size
+    assert xml_helper.xml_find_all_articles(xml_file_path) == (5, 2)
+    assert helper.index_read_article(xml_file_path, 1).get('read') == 'true'
+    assert helper.index_read_article(xml_file_path, 2).get('read') == 'false'
+
+
+def test_index_rebuild_stale(tmp_path):
+    """ Sprawdzenie czy po zapisie całego pliku indeks jest budowany od nowa """
+    xml_file_path = create_xml_file(tmp_path, 3)
+    assert helper.index_lookup(xml_file_path, 3) is not None
+    assert helper.index_lookup(xml_file_path, 7) is None
+
+    create_xml_file(tmp_path, 8)
+
+    assert helper.index_read_article(xml_file_path, 7).findtext('title') == 'Tytuł 7'
+
+
+def test_index_set_read_unpadded(tmp_path):
+    """ Sprawdzenie czy atrybut read bez stałej szerokości nie jest zmieniany w miejscu """
+    file_path = tmp_path / 'articles.xml'
+    file_path.write_bytes(b'<articles><article id="1" read="true"><title>t</title></article></articles>')
+
+    assert helper.index_set_read(str(file_path), 1, False) is None
+    assert helper.index_set_read(str(file_path), 2, False) is None
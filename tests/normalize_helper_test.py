@@ -0,0 +1,55 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module normalize_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_normalize_text - Sprawdzenie oczyszczenia tytułu do zapisu
+- test_normalize_key - Sprawdzenie czy tytuły różniące się tylko zapisem mają ten sam klucz
+- test_normalize_key_cache - Sprawdzenie pamięci podręcznej klucza kanonicznego
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import unicodedata
+
+# Local application import
+import article_reader.normalize_helper as helper
+
+TITLE = 'Zwinność w „dużej” organizacji – case study'
+
+
+def test_normalize_text():
+    """ Sprawdzenie oczyszczenia tytułu do zapisu """
+    decomposed = unicodedata.normalize('NFD', TITLE)
+
+    assert helper.normalize_text(f' \n{decomposed}\xa0 ') == TITLE
+    assert helper.normalize_text('Agile \xa0  w\tpraktyce') == 'Agile w praktyce'
+
+
+def test_normalize_key():
+    """ Sprawdzenie czy tytuły różniące się tylko zapisem mają ten sam klucz """
+    key = helper.normalize_key(TITLE)
+
+    assert key == 'zwinność w dużej organizacji case study'
+    assert helper.normalize_key(unicodedata.normalize('NFD', TITLE)) == key
+    assert helper.normalize_key('ZWINNOŚĆ w "dużej" organizacji - case\xa0 study.') == key
+    assert helper.normalize_key('Ｚｗｉｎｎｏść w dużej organizacji: case study') == key
+    assert helper.normalize_key('Zwinność w małej organizacji') != key
+    assert helper.normalize_key('C++ i C#') != helper.normalize_key('C i C')
+
+
+def test_normalize_key_cache():
+    """ Sprawdzenie pamięci podręcznej klucza kanonicznego """
+    helper.normalize_key.cache_clear()
+
+    keys = [helper.normalize_key(title) for title in (TITLE, TITLE.upper(), 'Inny tytuł', TITLE)]
+
+    assert keys == [helper.normalize_key(TITLE)] * 2 + ['inny tytuł', helper.normalize_key(TITLE)]
+    assert helper.normalize_key.cache_info().hits >= 1
+    assert helper.normalize_key.cache_info().maxsize == helper.CACHE_SIZE
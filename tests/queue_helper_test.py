@@ -0,0 +1,253 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module queue_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- live_mode - Przywrócenie trybu live po każdym teście
+- test_queue_claim_is_exclusive - Sprawdzenie czy każde źródło trafia tylko do jednego procesu roboczego
+- test_queue_complete_is_idempotent - Sprawdzenie czy ponowny zapis wyników zastępuje poprzednie wyniki źródła
+- test_queue_lease_expired - Sprawdzenie przejęcia zadania, którego proces roboczy nie zakończył w czasie
+- test_queue_enqueue_next_cycle - Sprawdzenie ponownego dodania źródeł w kolejnym cyklu synchronizacji
+- test_run_coordinator - Sprawdzenie synchronizacji w wielu procesach roboczych i przeniesienia wyników
+- test_run_coordinator_merges_once - Sprawdzenie czy każde źródło jest pobrane i przeniesione dokładnie raz
+- test_run_coordinator_failed_sources - Sprawdzenie zgłoszenia i ponowienia źródeł, których nie udało się przetworzyć
+- test_run_coordinator_matches_sync_sources - Sprawdzenie czy wynik synchronizacji jest taki sam jak w jednym procesie
+- test_run_coordinator_scheduler_config - Sprawdzenie podziału limitu zapytań do serwera pomiędzy procesy robocze
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import json
+import threading
+import time
+from unittest.mock import patch
+
+# Third party imports
+import pytest
+
+# Local application import
+import article_reader.article_reader as ar
+import article_reader.queue_helper as helper
+import article_reader.state_helper as state_helper
+import article_reader.store_helper as store_helper
+# moduły są importowane w article_reader bez nazwy pakietu - testy muszą konfigurować ten sam obiekt modułu
+fetch_helper = ar.fetch_helper
+
+URL = 'https://example.com/blog'
+
+
+@pytest.fixture(autouse=True)
+def live_mode():
+    """ Przywrócenie trybu live po każdym teście. Każdy test zaczyna z nowym harmonogramem pobrań """
+    ar.scheduler_helper.scheduler_configure()
+    yield
+    fetch_helper.fetch_configure('live')
+
+
+def _record_pages(archive_path: str, pages: dict) -> None:
+    """ Zapis odpowiedzi do archiwum. Strona zawiera podane artykuły w postaci (tytuł, link) """
+    for url, articles in pages.items():
+        content = ''.join(f'<a href="{link}"><h2>{title}</h2></a>' for title, link in articles)
+        fetch_helper.fetch_archive_write(archive_path, url, 200, 'OK', {'Content-Type': 'text/html'},
+                                         content.encode('utf-8'))
+
+
+def _record_sources(tmp_path, count: int) -> list:
+    """ Zapis odpowiedzi dla podanej ilości źródeł do archiwum. Każde źródło zawiera inne artykuły """
+    archive_path = str(tmp_path / 'pages.warc.gz')
+    urls = [f'{URL}/{i}' for i in range(count)]
+    _record_pages(archive_path, {url: [(f'Artykuł {i}-1', f'/{i}/1'), (f'Artykuł {i}-2', f'/{i}/2')]
+                                 for i, url in enumerate(urls)})
+    return archive_path, urls
+
+
+def _attempts(queue_path: str) -> dict:
+    """ Ilość pobrań każdego źródła z kolejki przez procesy robocze """
+    connection = helper.queue_open(queue_path)
+    try:
+        return dict(connection.execute('SELECT url, attempts FROM jobs').fetchall())
+    finally:
+        connection.close()
+
+
+def test_queue_claim_is_exclusive(tmp_path):
+    """ Sprawdzenie czy każde źródło trafia tylko do jednego procesu roboczego """
+    queue_path = str(tmp_path / 'queue.sqlite')
+    connection = helper.queue_open(queue_path)
+    urls = [f'{URL}/{i}' for i in range(40)]
+    assert helper.queue_enqueue(connection, urls) == 40
+    claimed = []
+
+    def worker(name):
+        worker_connection = helper.queue_open(queue_path)
+        while (job := helper.queue_claim(worker_connection, name)) is not None:
+            claimed.append(job[0])
+        worker_connection.close()
+
+    threads = [threading.Thread(target=worker, args=(f'w{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(urls)
+    assert helper.queue_status(connection) == {'claimed': 40}
+
+
+def test_queue_complete_is_idempotent(tmp_path):
+    """ Sprawdzenie czy ponowny zapis wyników zastępuje poprzednie wyniki źródła i nie tworzy duplikatów """
+    connection = helper.queue_open(str(tmp_path / 'queue.sqlite'))
+    helper.queue_enqueue(connection, [URL])
+    helper.queue_claim(connection, 'w1')
+    articles = [['Tytuł 1', '/1'], ['Tytuł 2', '/2'], ['TYTUŁ 1', '/1']]
+
+    assert helper.queue_complete(connection, URL, 'hash', articles) == 2
+    assert helper.queue_complete(connection, URL, 'hash', articles) == 2
+    assert helper.queue_pending_results(connection) == {URL: ('hash', [('Tytuł 1', '/1'), ('Tytuł 2', '/2')])}
+
+    helper.queue_mark_merged(connection, URL)
+    assert helper.queue_pending_results(connection) == {}
+    assert helper.queue_status(connection) == {'merged': 1}
+    # spóźniony proces roboczy nie przywraca wyników źródła już przeniesionego
+    assert helper.queue_complete(connection, URL, 'hash', articles) == 0
+    assert helper.queue_pending_results(connection) == {}
+
+
+def test_queue_lease_expired(tmp_path):
+    """ Sprawdzenie przejęcia zadania, którego proces roboczy nie zakończył w czasie """
+    connection = helper.queue_open(str(tmp_path / 'queue.sqlite'))
+    helper.queue_enqueue(connection, [URL])
+
+    assert helper.queue_claim(connection, 'w1') == (URL, None)
+    assert helper.queue_claim(connection, 'w2') is None
+    time.sleep(0.05)
+    assert helper.queue_claim(connection, 'w2', lease=0.01) == (URL, None)
+    assert connection.execute('SELECT worker, attempts FROM jobs').fetchone() == ('w2', 2)
+
+
+def test_queue_enqueue_next_cycle(tmp_path):
+    """ Sprawdzenie ponownego dodania źródeł w kolejnym cyklu synchronizacji """
+    connection = helper.queue_open(str(tmp_path / 'queue.sqlite'))
+    helper.queue_enqueue(connection, [URL, URL + '/x', URL + '/y'])
+    helper.queue_claim(connection, 'w1')
+    helper.queue_claim(connection, 'w1')
+    helper.queue_complete(connection, URL, 'hash', [])
+
+    # źródło /y nie jest już na liście - jest usuwane z kolejki; źródło /x jest nadal przetwarzane
+    assert helper.queue_enqueue(connection, [URL, URL + '/x'], {URL: 'hash'}) == 1
+    assert helper.queue_status(connection) == {'pending': 1, 'claimed': 1}
+    assert helper.queue_claim(connection, 'w1', lease=0) == (URL, 'hash')
+
+
+def test_run_coordinator(tmp_path):
+    """ Sprawdzenie synchronizacji w wielu procesach roboczych i przeniesienia wyników """
+    archive_path, urls = _record_sources(tmp_path, 6)
+    fetch_helper.fetch_configure('replay', archive_path)
+    store_dir, queue_path = str(tmp_path / 'store'), str(tmp_path / 'queue.sqlite')
+    state_file_path = str(tmp_path / 'sync_state.json')
+
+    assert ar.run_coordinator(urls + [f'{URL}/missing'], store_dir, state_file_path, queue_path, 3) == (12, 1)
+    assert store_helper.store_info(store_dir) == (12, 0)
+
+    # strony bez zmian - kolejny cykl nie parsuje stron i nie dodaje artykułów
+    with patch.object(ar, '_parse_page_or_none') as mock_parse:
+        assert ar.run_coordinator(urls, store_dir, state_file_path, queue_path, 1) == (0, 0)
+        mock_parse.assert_not_called()
+    assert store_helper.store_info(store_dir) == (12, 0)
+
+
+def test_run_coordinator_merges_once(tmp_path):
+    """ Sprawdzenie czy każde źródło jest pobrane z kolejki i przeniesione do źródła danych dokładnie raz """
+    archive_path, urls = _record_sources(tmp_path, 8)
+    fetch_helper.fetch_configure('replay', archive_path)
+    store_dir, queue_path = str(tmp_path / 'store'), str(tmp_path / 'queue.sqlite')
+
+    with patch.object(ar.store_helper, 'store_sync_source', wraps=ar.store_helper.store_sync_source) as mock_sync:
+        assert ar.run_coordinator(urls, store_dir, str(tmp_path / 'sync_state.json'), queue_path, 4) == (16, 0)
+
+    assert sorted(call.args[1] for call in mock_sync.call_args_list) == sorted(urls)
+    assert _attempts(queue_path) == {url: 1 for url in urls}
+
+
+def test_run_coordinator_failed_sources(tmp_path):
+    """ Sprawdzenie zgłoszenia źródeł, których nie udało się pobrać albo zapisać, i ich ponowienia w kolejnym cyklu """
+    archive_path, urls = _record_sources(tmp_path, 3)
+    fetch_helper.fetch_configure('replay', archive_path)
+    store_dir, queue_path = str(tmp_path / 'store'), str(tmp_path / 'queue.sqlite')
+    state_file_path = str(tmp_path / 'sync_state.json')
+    missing = f'{URL}/missing'
+    store_sync_source = ar.store_helper.store_sync_source
+
+    def sync_source(source_dir, source, articles):
+        if source == urls[1]:
+            raise OSError('disk full')
+        return store_sync_source(source_dir, source, articles)
+
+    with patch.object(ar.store_helper, 'store_sync_source', side_effect=sync_source):
+        assert ar.run_coordinator(urls + [missing], store_dir, state_file_path, queue_path, 2) == (4, 2)
+    state = state_helper.state_load(state_file_path)
+    assert {url: source['failures'] for url, source in state['sources'].items()} == \
+           {urls[0]: 0, urls[1]: 1, urls[2]: 0, missing: 1}
+    assert 'content_hash' not in state['sources'][urls[1]]
+
+    # kolejny cykl ponawia oba źródła - strona urls[1] jest parsowana ponownie, bo jej skrót nie został zatwierdzony
+    assert ar.run_coordinator(urls + [missing], store_dir, state_file_path, queue_path, 2) == (2, 1)
+    assert store_helper.store_info(store_dir) == (6, 0)
+    assert state_helper.state_load(state_file_path)['sources'][missing]['failures'] == 2
+
+
+def test_run_coordinator_matches_sync_sources(tmp_path):
+    """ Sprawdzenie czy synchronizacja w wielu procesach roboczych daje takie same artykuły, dziennik zmian i stan
+    źródeł jak synchronizacja w jednym procesie - również dla zmienionych i usuniętych artykułów """
+    archive_path, urls = _record_sources(tmp_path, 3)
+    changed_path = str(tmp_path / 'changed.warc.gz')
+    _record_pages(changed_path, {urls[0]: [('Artykuł 0-1', '/0/1b'), ('Artykuł 0-2', '/0/2')],
+                                 urls[1]: [('Artykuł 1-1', '/1/1')],
+                                 urls[2]: [('Artykuł 2-3', '/2/3'), ('Artykuł 2-1', '/2/1'), ('Artykuł 2-2', '/2/2')]})
+    single_dir, queue_dir = str(tmp_path / 'single'), str(tmp_path / 'queue')
+    for store_dir in (single_dir, queue_dir):
+        store_helper.store_open(store_dir, URL)
+
+    for path, expected in ((archive_path, (6, 0)), (changed_path, (1, 0))):
+        fetch_helper.fetch_configure('replay', path)
+        assert ar.sync_sources(urls, single_dir, f'{single_dir}/sync_state.json') == expected
+        assert ar.run_coordinator(urls, queue_dir, f'{queue_dir}/sync_state.json', f'{queue_dir}/queue.sqlite', 2) \
+            == expected
+
+    assert list(store_helper.store_iter_articles(queue_dir)) == list(store_helper.store_iter_articles(single_dir))
+    changes = []
+    for store_dir in (single_dir, queue_dir):
+        with open(f'{store_dir}/{store_helper.CHANGE_LOG_NAME}', encoding='utf-8') as changes_file:
+            changes.append([{name: value for name, value in json.loads(line).items() if name != 'ts'}
+                            for line in changes_file])
+    assert changes[0] == changes[1]
+    assert [entry['op'] for entry in changes[0]] == ['add'] * 6 + ['upd', 'del', 'add']
+    sources = [state_helper.state_load(f'{store_dir}/sync_state.json')['sources']
+               for store_dir in (single_dir, queue_dir)]
+    for state_sources in sources:
+        for source in state_sources.values():
+            source.pop('last_fetch')
+    assert sources[0] == sources[1]
+
+
+def test_run_coordinator_scheduler_config(tmp_path):
+    """ Sprawdzenie czy procesy robocze dostają limity harmonogramu pobrań podzielone przez ilość procesów """
+    archive_path, urls = _record_sources(tmp_path, 2)
+    fetch_helper.fetch_configure('replay', archive_path)
+    ar.scheduler_helper.scheduler_configure(rate=3.0, burst=4)
+    store_dir, queue_path = str(tmp_path / 'store'), str(tmp_path / 'queue.sqlite')
+
+    # procesy robocze nie są uruchamiane - źródła przetwarza koordynator
+    with patch.object(ar.multiprocessing, 'Process') as mock_process:
+        assert ar.run_coordinator(urls, store_dir, str(tmp_path / 'sync_state.json'), queue_path, 3) == (4, 0)
+
+    assert mock_process.call_count == 3
+    _, fetch_config, scheduler_config = mock_process.call_args.kwargs['args']
+    assert fetch_config['mode'] == 'replay'
+    assert scheduler_config == {'rate': 1.0, 'burst': 1, 'max_concurrency': ar.scheduler_helper.DEFAULT_MAX_CONCURRENCY}
@@ -0,0 +1,107 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module scheduler_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_token_bucket_rate - Sprawdzenie limitu zapytań do jednego serwera
+- test_hosts_are_independent - Sprawdzenie czy limit jednego serwera nie opóźnia innych serwerów
+- test_hosts_are_interleaved - Sprawdzenie sprawiedliwego przeplatania zapytań do różnych serwerów
+- test_retry_after - Sprawdzenie wstrzymania zapytań po odpowiedzi 429 i statystyk serwera
+- test_fetch_get_retries_throttled - Sprawdzenie ponowienia zapytania po odpowiedzi 429
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Local application import
+import article_reader.article_reader as ar
+import article_reader.scheduler_helper as helper
+
+
+def test_token_bucket_rate():
+    """ Sprawdzenie limitu zapytań do jednego serwera """
+    scheduler = helper.HostScheduler(rate=20.0, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire('a')
+        scheduler.release('a')
+
+    assert time.monotonic() - start >= (6 - 2) / 20.0 * 0.9
+    assert scheduler.stats()['a']['requests'] == 6
+
+
+def test_hosts_are_independent():
+    """ Sprawdzenie czy limit jednego serwera nie opóźnia innych serwerów """
+    scheduler = helper.HostScheduler(rate=1.0, burst=1)
+    scheduler.acquire('a')
+    scheduler.release('a')
+
+    assert scheduler.acquire('b') < 0.1
+
+
+def test_hosts_are_interleaved():
+    """ Sprawdzenie sprawiedliwego przeplatania zapytań do różnych serwerów """
+    scheduler = helper.HostScheduler(rate=1000.0, burst=10, max_concurrency=1)
+    order = []
+    scheduler.acquire('blocker')
+
+    def request(host):
+        scheduler.acquire(host)
+        order.append(host)
+        time.sleep(0.005)
+        scheduler.release(host)
+
+    threads = [threading.Thread(target=request, args=('a',)) for _ in range(6)]
+    threads += [threading.Thread(target=request, args=('b',)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    assert scheduler.stats()['a']['queue'] == 6
+    scheduler.release('blocker')
+    for thread in threads:
+        thread.join()
+
+    assert order.count('b') == 2
+    assert order.index('b') <= 1 and order[:4].count('b') == 2
+
+
+def test_retry_after():
+    """ Sprawdzenie wstrzymania zapytań po odpowiedzi 429 i statystyk serwera """
+    helper.scheduler_configure(rate=100.0, burst=10)
+    assert helper.scheduler_retry_after('https://other.com/a', None, attempt=2) == 4.0
+    assert helper.scheduler_retry_after('https://example.com/a', 'Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert helper.scheduler_retry_after('https://example.com/a', '0.1') == 0.1
+
+    with helper.scheduler_slot('https://third.com/b') as waited:
+        assert waited < 0.05
+    with helper.scheduler_slot('https://EXAMPLE.com/c') as waited:
+        assert waited >= 0.05
+
+    stats = helper.scheduler_stats()['example.com']
+    assert stats['throttled'] == 2
+    assert stats['requests'] == 1
+    assert stats['queue'] == 0
+    helper.scheduler_configure()
+
+
+@patch('article_reader.article_reader.fetch_helper.requests.get')
+def test_fetch_get_retries_throttled(mock_get):
+    """ Sprawdzenie ponowienia zapytania po odpowiedzi 429. Test używa mocka zamiast pobierania strony z sieci. """
+    throttled = MagicMock(status_code=429, headers={'Retry-After': '0'})
+    done = MagicMock(status_code=200, ok=True, content=b'<p>1</p>')
+    mock_get.side_effect = [throttled, throttled, done]
+    ar.scheduler_helper.scheduler_configure(rate=100.0, burst=10)
+
+    assert ar.get_page_content('https://example.com/a', raw=True) == b'<p>1</p>'
+    assert mock_get.call_count == 3
+    assert ar.scheduler_helper.scheduler_stats()['example.com']['throttled'] == 2
+    ar.scheduler_helper.scheduler_configure()
@@ -0,0 +1,146 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module server_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- server - Fixture uruchamiająca serwer HTTP na potrzeby testów
+- request - Wysłanie zapytania do serwera HTTP
+- test_get_articles_paginated - Sprawdzenie stronicowania listy artykułów
+- test_get_articles_filter_read - Sprawdzenie filtrowania artykułów po fladze read
+- test_get_stats - Sprawdzenie statystyk artykułów
+- test_etag_not_modified - Sprawdzenie czy serwer zwraca 304 dla aktualnego ETag
+- test_etag_after_sync_update - Sprawdzenie nowego ETag po zmianie linku artykułu przez synchronizację źródła
+- test_post_read - Sprawdzenie ustawienia artykułu jako przeczytanego
+- test_post_read_not_found - Sprawdzenie odpowiedzi dla nieistniejącego artykułu
+- test_post_read_missing_in_store - Sprawdzenie odpowiedzi dla artykułu usuniętego ze źródła danych
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import json
+import threading
+import urllib.error
+import urllib.request
+
+# Third party imports
+import pytest
+
+# Local application import
+import article_reader.server_helper as helper
+import article_reader.store_helper as store_helper
+
+
+@pytest.fixture
+def server(tmp_path):
+    """ Fixture uruchamiająca serwer HTTP z pięcioma artykułami (artykuł 2 jest przeczytany) """
+    store_dir = str(tmp_path)
+    store_helper.store_save_articles(store_dir, 'https://localhost',
+                                     [[f'Tytuł {i}', f'/{i}'] for i in range(1, 6)])
+    store_helper.store_set_read(store_dir, 2, True)
+    http_server = helper.create_server(store_dir, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def request(http_server, path: str, method: str = 'GET', headers: dict = None):
+    """ Wysłanie zapytania do serwera HTTP
+
+    :return: Kod odpowiedzi, nagłówki, treść odpowiedzi (json)
+    :rtype: int, dict, dict
+    """
+    url = f"http://127.0.0.1:{http_server.server_address[1]}{path}"
+    req = urllib.request.Request(url, method=method, headers=headers or {}, data=b'' if method == 'POST' else None)
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, response.headers, json.loads(response.read() or b'null')
+    except urllib.error.HTTPError as error:
+        body = error.read()
+        return error.code, error.headers, json.loads(body) if body else None
+
+
+def test_get_articles_paginated(server):
+    """ Sprawdzenie stronicowania listy artykułów """
+    status, _, data = request(server, '/articles?limit=2&offset=2')
+    assert status == 200
+    assert [item['id'] for item in data['items']] == [3, 4]
+    assert data['total'] == 5
+    assert data['next_offset'] == 4
+
+
+def test_get_articles_filter_read(server):
+    """ Sprawdzenie filtrowania artykułów po fladze read """
+    _, _, data = request(server, '/articles?read=false')
+    assert [item['id'] for item in data['items']] == [1, 3, 4, 5]
+    assert data['next_offset'] is None
+
+
+def test_get_stats(server):
+    """ Sprawdzenie statystyk artykułów """
+    _, _, data = request(server, '/stats')
+    assert data == {'all': 5, 'read': 1, 'unread': 4}
+
+
+def test_etag_not_modified(server):
+    """ Sprawdzenie czy serwer zwraca 304 dla aktualnego ETag i nowy ETag po zmianie danych """
+    _, headers, _ = request(server, '/stats')
+    etag = headers['ETag']
+
+    status, _, _ = request(server, '/stats', headers={'If-None-Match': etag})
+    assert status == 304
+
+    request(server, '/articles/1/read', method='POST')
+    status, headers, data = request(server, '/stats', headers={'If-None-Match': etag})
+    assert status == 200
+    assert headers['ETag'] != etag
+    assert data['read'] == 2
+
+
+def test_etag_after_sync_update(server):
+    """ Sprawdzenie nowego ETag po zmianie linku artykułu przez synchronizację źródła """
+    store_dir = server.store.store_dir
+    _, headers, _ = request(server, '/articles?limit=1')
+    etag = headers['ETag']
+
+    report = store_helper.store_sync_source(store_dir, 'https://localhost', [['Tytuł 1', '/1-nowy']])
+    assert report['updated'] == 1
+    status, headers, data = request(server, '/articles?limit=1', headers={'If-None-Match': etag})
+    assert status == 200
+    assert headers['ETag'] != etag
+    assert data['items'][0]['link'].endswith('/1-nowy')
+
+
+def test_post_read(server):
+    """ Sprawdzenie ustawienia artykułu jako przeczytanego i zapisu zmiany w pliku """
+    status, _, data = request(server, '/articles/3/read', method='POST')
+    assert status == 200
+    assert data['read'] is True
+
+    status, _, data = request(server, '/articles/3/read?read=false', method='POST')
+    assert data['read'] is False
+
+    request(server, '/articles/4/read', method='POST')
+    assert helper.ArticleStore(server.store.store_dir).stats()['read'] == 2
+    assert store_helper.store_info(server.store.store_dir) == (5, 2)
+
+
+def test_post_read_not_found(server):
+    """ Sprawdzenie odpowiedzi dla nieistniejącego artykułu """
+    status, _, _ = request(server, '/articles/99/read', method='POST')
+    assert status == 404
+
+
+def test_post_read_missing_in_store(server, monkeypatch):
+    """ Sprawdzenie odpowiedzi dla artykułu, którego nie ma już w źródle danych (artykuł w pamięci bez zmian) """
+    monkeypatch.setattr(helper.store_helper, 'store_set_read', lambda store_dir, article_id, read: None)
+    status, _, _ = request(server, '/articles/3/read', method='POST')
+    assert status == 404
+    assert server.store.stats()['read'] == 1
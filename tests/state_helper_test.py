@@ -0,0 +1,72 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module state_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_state_load_missing_file - Sprawdzenie czy dla nieistniejącego pliku zwracany jest pusty stan
+- test_state_page_changed - Sprawdzenie wykrywania zmiany zawartości strony
+- test_state_source_failed - Sprawdzenie zliczania kolejnych błędów źródła
+- test_state_resume_pending - Sprawdzenie czy przerwany przebieg wznawia tylko niezatwierdzone źródła
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Local application import
+import article_reader.state_helper as helper
+
+
+def test_state_load_missing_file(tmp_path):
+    """ Sprawdzenie czy dla nieistniejącego pliku zwracany jest pusty stan """
+    state = helper.state_load(str(tmp_path / 'state.json'))
+    assert state['run'] is None
+    assert state['sources'] == {}
+
+
+def test_state_page_changed(tmp_path):
+    """ Sprawdzenie wykrywania zmiany zawartości strony na podstawie skrótu """
+    state = helper.state_load(str(tmp_path / 'state.json'))
+    helper.state_begin_run(state, ['url1'])
+    content_hash = helper.state_content_hash(b'<html></html>')
+
+    assert helper.state_page_changed(state, 'url1', content_hash)
+    helper.state_source_committed(state, 'url1', content_hash, 'TYTUŁ – Pierwszy')
+
+    state = helper.state_load(str(tmp_path / 'state.json'))
+    assert not helper.state_page_changed(state, 'url1', content_hash)
+    assert helper.state_page_changed(state, 'url1', helper.state_content_hash(b'<html>x</html>'))
+    assert state['sources']['url1']['last_seen'] == helper.normalize_helper.normalize_key('tytuł — pierwszy')
+
+
+def test_state_source_failed(tmp_path):
+    """ Sprawdzenie zliczania kolejnych błędów źródła i zerowania licznika po poprawnym przetworzeniu """
+    state = helper.state_load(str(tmp_path / 'state.json'))
+    helper.state_begin_run(state, ['url1'])
+    helper.state_source_failed(state, 'url1')
+    helper.state_source_failed(state, 'url1')
+    assert state['sources']['url1']['failures'] == 2
+
+    helper.state_source_committed(state, 'url1')
+    assert state['sources']['url1']['failures'] == 0
+
+
+def test_state_resume_pending(tmp_path):
+    """ Sprawdzenie czy przerwany przebieg wznawia tylko niezatwierdzone źródła """
+    state_path = str(tmp_path / 'state.json')
+    state = helper.state_load(state_path)
+    assert helper.state_begin_run(state, ['url1', 'url2', 'url3']) == ['url1', 'url2', 'url3']
+    helper.state_source_committed(state, 'url1')
+    # przerwanie programu - brak wywołania state_end_run
+
+    state = helper.state_load(state_path)
+    assert helper.state_begin_run(state, ['url1', 'url2', 'url3']) == ['url2', 'url3']
+    helper.state_source_committed(state, 'url2')
+    helper.state_source_committed(state, 'url3')
+    helper.state_end_run(state)
+
+    state = helper.state_load(state_path)
+    assert helper.state_begin_run(state, ['url1', 'url2', 'url3']) == ['url1', 'url2', 'url3']
@@ -0,0 +1,292 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module store_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- test_store_open_migrate - Sprawdzenie migracji jednoplikowego źródła danych do partycji
+- test_store_save_articles - Sprawdzenie zapisu i pomijania duplikatów w wielu partycjach
+- test_store_save_articles_skip_known - Sprawdzenie czy partycja nie jest ładowana ani zapisywana, gdy brak nowych
+  artykułów
+- test_store_save_articles_normalized - Sprawdzenie pomijania tytułów różniących się tylko zapisem
+- test_store_save_articles_lazy_bloom - Sprawdzenie czy filtry Blooma partycji nie są czytane dla nowych artykułów
+- test_store_search_articles - Sprawdzenie wyszukiwania artykułów niezależnie od zapisu tytułu
+- test_store_set_read - Sprawdzenie zmiany flagi read i liczników w manifeście
+- test_store_iter_articles_unread - Sprawdzenie odczytu tylko nieprzeczytanych artykułów
+- test_store_iter_articles_since - Sprawdzenie pomijania partycji z artykułami starszymi niż kursor eksportu
+- test_store_compact - Sprawdzenie przeniesienia przeczytanych artykułów do skompresowanego archiwum
+- test_store_set_bodies - Sprawdzenie zapisu skrótów treści artykułów
+- test_store_sync_source - Sprawdzenie zapisu zmian artykułów źródła względem migawki
+- test_store_sync_source_baseline - Sprawdzenie utworzenia migawki z artykułów zapisanych w archiwum
+- test_store_sync_source_stream - Sprawdzenie zapisu nowych artykułów na dysk jeszcze w trakcie odczytu listy
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Standard library imports
+import os
+import unicodedata
+from unittest.mock import patch
+
+# Local application import
+import article_reader.store_helper as helper
+
+LEGACY_XML = '<articles>' \
+             '<article id="1" read="true"><title>Tytuł 1</title><link>/1</link></article>' \
+             '<article id="2" read="false"><title>Tytuł 2</title><link>/2</link></article>' \
+             '</articles>'
+
+
+def test_store_open_migrate(tmp_path):
+    """ Sprawdzenie migracji jednoplikowego źródła danych do partycji """
+    store_dir = str(tmp_path)
+    (tmp_path / helper.LEGACY_NAME).write_text(LEGACY_XML, encoding='utf-8')
+
+    manifest = helper.store_open(store_dir, 'https://localhost')
+
+    assert manifest['next_id'] == 3
+    assert os.path.exists(os.path.join(store_dir, helper.LEGACY_NAME + '.migrated'))
+    assert not os.path.exists(os.path.join(store_dir, helper.LEGACY_NAME))
+    assert helper.store_info(store_dir) == (2, 1)
+    assert [(article['id'], article['read']) for article in helper.store_iter_articles(store_dir)] == \
+           [('1', 'true'), ('2', 'false')]
+
+
+def test_store_save_articles(tmp_path, monkeypatch):
+    """ Sprawdzenie zapisu i pomijania duplikatów w wielu partycjach """
+    store_dir = str(tmp_path)
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2021-01')
+    assert helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1'], ['Tytuł 2', '/2']]) == 2
+
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2021-02')
+    assert helper.store_save_articles(store_dir, 'https://b', [['Tytuł 2', '/2'], ['Tytuł 3', '/3']]) == 1
+
+    manifest = helper.store_load_manifest(store_dir)
+    assert len(manifest['partitions']) == 2
+    assert manifest['next_id'] == 4
+    assert [(article['id'], article['title'], article['source']) for article in helper.store_iter_articles(store_dir)] \
+        == [('1', 'Tytuł 1', 'https://a'), ('2', 'Tytuł 2', 'https://a'), ('3', 'Tytuł 3', 'https://b')]
+
+    manifest_path = os.path.join(store_dir, helper.MANIFEST_NAME)
+    mtime_ns = os.stat(manifest_path).st_mtime_ns
+    assert helper.store_save_articles(store_dir, 'https://b', [['Tytuł 1', '/1'], ['Tytuł 3', '/3']]) == 0
+    assert os.stat(manifest_path).st_mtime_ns == mtime_ns
+
+
+def test_store_save_articles_skip_known(tmp_path):
+    """ Sprawdzenie czy partycja nie jest ładowana ani zapisywana, gdy wszystkie artykuły są już zapisane
+
+    Pierwszy zapis tworzy filtr Blooma obok pliku partycji. Kolejny zapis tych samych artykułów korzysta z filtra i
+    dokładnego, strumieniowego sprawdzenia tytułów.
+    """
+    store_dir = str(tmp_path)
+    articles = [['tytuł 1', '/link1'], ['tytuł 2', '/link2']]
+    assert helper.store_save_articles(store_dir, 'https://a', articles) == 2
+
+    with patch.object(helper.xml_helper, 'xml_load_tree') as mock_xml_load_tree, \
+            patch.object(helper, '_write_tree') as mock_write_tree:
+        assert helper.store_save_articles(store_dir, 'https://a', articles) == 0
+        mock_xml_load_tree.assert_not_called()
+        mock_write_tree.assert_not_called()
+
+    assert helper.store_save_articles(store_dir, 'https://a', articles + [['tytuł 3', '/link3']]) == 1
+    assert helper.store_info(store_dir) == (3, 0)
+
+
+def test_store_save_articles_normalized(tmp_path):
+    """ Sprawdzenie pomijania tytułów różniących się tylko zapisem """
+    store_dir = str(tmp_path)
+    assert helper.store_save_articles(store_dir, 'https://a', [['Zwinność w „dużej” firmie', '/1']]) == 1
+
+    variants = [[unicodedata.normalize('NFD', 'Zwinność w "dużej" firmie'), '/1'], ['ZWINNOŚĆ  w dużej firmie', '/1']]
+    assert helper.store_save_articles(store_dir, 'https://b', variants) == 0
+    assert helper.store_save_articles(store_dir, 'https://b', variants + [['Zwinność w małej firmie', '/2']]) == 1
+    assert helper.store_info(store_dir) == (2, 0)
+
+
+def test_store_save_articles_lazy_bloom(tmp_path, monkeypatch):
+    """ Sprawdzenie czy filtry Blooma partycji (również archiwalnych) nie są czytane dla nowych artykułów. Usunięty
+    filtr kluczy wszystkich partycji jest budowany od nowa i duplikaty są nadal pomijane """
+    store_dir = str(tmp_path)
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2020-01')
+    helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1'], ['Tytuł 2', '/2']])
+    helper.store_set_read(store_dir, 1, True)
+    helper.store_compact(store_dir, 30, 'xz')
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2020-02')
+
+    with patch.object(helper, '_partition_bloom', side_effect=AssertionError) as mock_partition_bloom:
+        assert helper.store_save_articles(store_dir, 'https://a', [['Tytuł 3', '/3']]) == 1
+        mock_partition_bloom.assert_not_called()
+
+    os.remove(os.path.join(store_dir, helper.KEYS_BLOOM_NAME))
+    assert helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1'], ['Tytuł 3', '/3']]) == 0
+    assert helper.store_save_articles(store_dir, 'https://a', [['Tytuł 2', '/2'], ['Tytuł 4', '/4']]) == 1
+    assert helper.store_info(store_dir) == (4, 1)
+
+
+def test_store_search_articles(tmp_path):
+    """ Sprawdzenie wyszukiwania artykułów niezależnie od zapisu tytułu """
+    store_dir = str(tmp_path)
+    helper.store_save_articles(store_dir, 'https://a', [['Zwinność w „dużej” firmie', '/1'], ['Agile', '/2']])
+
+    found = list(helper.store_search_articles(store_dir, unicodedata.normalize('NFD', '"DUŻEJ"  firmie')))
+
+    assert [article['link'] for article in found] == ['https://www2.deloitte.com/1']
+
+
+def test_store_set_read(tmp_path):
+    """ Sprawdzenie zmiany flagi read i liczników w manifeście """
+    store_dir = str(tmp_path)
+    helper.store_save_articles(store_dir, 'https://a', [[f'Tytuł {i}', f'/{i}'] for i in range(1, 4)])
+
+    # flaga jest zmieniana w miejscu z użyciem indeksu partycji, bez ładowania i zapisu całego pliku
+    with patch.object(helper.xml_helper, 'xml_load_tree') as mock_xml_load_tree, \
+            patch.object(helper, '_write_tree') as mock_write_tree:
+        assert helper.store_set_read(store_dir, 2, True)
+        mock_xml_load_tree.assert_not_called()
+        mock_write_tree.assert_not_called()
+    assert helper.store_set_read(store_dir, 2, True)
+    assert helper.store_info(store_dir) == (3, 1)
+    assert helper.store_set_read(store_dir, 2, False)
+    assert helper.store_info(store_dir) == (3, 0)
+    assert helper.store_set_read(store_dir, 10, True) is None
+
+
+def test_store_iter_articles_unread(tmp_path, monkeypatch):
+    """ Sprawdzenie odczytu tylko nieprzeczytanych artykułów """
+    store_dir = str(tmp_path)
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2021-01')
+    helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1']])
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2021-02')
+    helper.store_save_articles(store_dir, 'https://a', [['Tytuł 2', '/2']])
+    helper.store_set_read(store_dir, 1, True)
+
+    assert [article['title'] for article in helper.store_iter_articles(store_dir, 'unread')] == ['Tytuł 2']
+    assert [article['title'] for article in helper.store_iter_articles(store_dir, 'read')] == ['Tytuł 1']
+
+
+def test_store_iter_articles_since(tmp_path, monkeypatch):
+    """ Sprawdzenie pomijania partycji z artykułami starszymi niż kursor eksportu """
+    store_dir = str(tmp_path)
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2021-01')
+    helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1'], ['Tytuł 2', '/2']])
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2021-02')
+    helper.store_save_articles(store_dir, 'https://a', [['Tytuł 3', '/3'], ['Tytuł 4', '/4']])
+    opened = []
+    iter_partition = helper.store_iter_partition
+    monkeypatch.setattr(helper, 'store_iter_partition',
+                        lambda store, partition: opened.append(partition['period']) or iter_partition(store, partition))
+
+    assert [article['id'] for article in helper.store_iter_articles(store_dir, since_id=3)] == ['4']
+    assert opened == ['2021-02']
+
+
+def test_store_compact(tmp_path, monkeypatch):
+    """ Sprawdzenie przeniesienia przeczytanych artykułów do skompresowanego archiwum """
+    store_dir = str(tmp_path)
+    monkeypatch.setattr(helper, 'store_current_period', lambda: '2020-01')
+    helper.store_save_articles(store_dir, 'https://a', [[f'Tytuł {i}', f'/{i}'] for i in range(1, 4)])
+    helper.store_set_read(store_dir, 1, True)
+    helper.store_set_read(store_dir, 3, True)
+
+    report = helper.store_compact(store_dir, 30, 'xz')
+
+    assert report['moved'] == 2
+    assert report['hot_bytes_after'] < report['hot_bytes_before']
+    # liczone są tylko pliki partycji - bez plików filtrów Blooma i indeksów
+    partitions = helper.store_load_manifest(store_dir)['partitions'].values()
+    assert report['bytes_after'] == sum(os.path.getsize(helper.store_partition_path(store_dir, partition))
+                                        for partition in partitions)
+    assert helper.store_info(store_dir) == (3, 2)
+    cold = [partition for partition in helper.store_load_manifest(store_dir)['partitions'].values()
+            if partition.get('tier') == 'cold']
+    assert [(partition['path'], partition['count']) for partition in cold] == \
+           [(f"cold/{helper.store_source_slug('https://a')}/2020-01.xml.xz", 2)]
+    assert sorted(article['id'] for article in helper.store_iter_articles(store_dir)) == ['1', '2', '3']
+    assert [article['id'] for article in helper.store_iter_articles(store_dir, 'unread')] == ['2']
+    assert [article['id'] for article in helper.store_search_articles(store_dir, 'tytuł 3')] == ['3']
+    assert helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1']]) == 0
+    assert helper.store_compact(store_dir, 30)['moved'] == 0
+
+    assert helper.store_set_read(store_dir, 3, False)
+    assert helper.store_info(store_dir) == (3, 1)
+    assert sorted(article['id'] for article in helper.store_iter_articles(store_dir, 'unread')) == ['2', '3']
+
+
+def test_store_set_bodies(tmp_path):
+    """ Sprawdzenie zapisu skrótów treści artykułów """
+    store_dir = str(tmp_path)
+    helper.store_save_articles(store_dir, 'https://a', [[f'Tytuł {i}', f'/{i}'] for i in range(1, 4)])
+
+    generation = helper.store_load_manifest(store_dir)['generation']
+    assert helper.store_set_bodies(store_dir, {2: 'abc', 10: 'def'}) == 1
+    assert helper.store_load_manifest(store_dir)['generation'] == generation + 1
+    assert helper.store_set_bodies(store_dir, {2: 'abc'}) == 0
+    assert helper.store_load_manifest(store_dir)['generation'] == generation + 1
+    assert [article.get('body') for article in helper.store_iter_articles(store_dir)] == [None, 'abc', None]
+    assert helper.store_set_read(store_dir, 2, True)
+    assert helper.store_save_articles(store_dir, 'https://a', [['Tytuł 2', '/2']]) == 0
+
+
+def test_store_sync_source(tmp_path):
+    """ Sprawdzenie zapisu zmian artykułów źródła względem migawki """
+    store_dir = str(tmp_path)
+    assert helper.store_sync_source(store_dir, 'https://a', [['Tytuł 1', '/1'], ['Tytuł 2', '/2'], ['Tytuł 3', '/3']]) \
+           == {'added': 3, 'updated': 0, 'removed': 0}
+    helper.store_set_read(store_dir, 2, True)
+
+    report = helper.store_sync_source(store_dir, 'https://a', [['Tytuł 4', '/4'], ['Tytuł 2 (nowy)', '/2'],
+                                                               ['Tytuł 3', '/3b']])
+
+    assert report == {'added': 1, 'updated': 2, 'removed': 1}
+    assert [(article['id'], article['read'], article['title'], article['link'])
+            for article in helper.store_iter_articles(store_dir)] == \
+           [('1', 'false', 'Tytuł 1', 'https://www2.deloitte.com/1'),
+            ('2', 'true', 'Tytuł 2 (nowy)', 'https://www2.deloitte.com/2'),
+            ('3', 'false', 'Tytuł 3', 'https://www2.deloitte.com/3b'),
+            ('4', 'false', 'Tytuł 4', 'https://www2.deloitte.com/4')]
+    assert [article['id'] for article in helper.store_search_articles(store_dir, 'nowy')] == ['2']
+    with open(os.path.join(store_dir, helper.CHANGE_LOG_NAME), encoding='utf-8') as log_file:
+        assert [line.split('"op":"')[1][:3] for line in log_file] == ['add'] * 3 + ['add', 'upd', 'upd', 'del']
+
+    assert helper.store_sync_source(store_dir, 'https://a', []) == {'added': 0, 'updated': 0, 'removed': 0}
+    assert len(helper.store_load_snapshot(store_dir, 'https://a')) == 3
+
+
+def test_store_sync_source_baseline(tmp_path):
+    """ Sprawdzenie utworzenia migawki z artykułów zapisanych w archiwum """
+    store_dir = str(tmp_path)
+    helper.store_save_articles(store_dir, 'https://a', [['Tytuł 1', '/1'], ['Tytuł 2', '/2']])
+    assert helper.store_load_snapshot(store_dir, 'https://a') is None
+
+    report = helper.store_sync_source(store_dir, 'https://a', [['Tytuł 2', '/2'], ['Tytuł 3', '/3']])
+
+    assert report == {'added': 1, 'updated': 0, 'removed': 0}
+    assert sorted(helper.store_load_snapshot(store_dir, 'https://a')) == ['tytuł 2', 'tytuł 3']
+    assert helper.store_info(store_dir) == (3, 0)
+
+
+def test_store_sync_source_stream(tmp_path, monkeypatch):
+    """ Sprawdzenie zapisu nowych artykułów na dysk jeszcze w trakcie odczytu listy """
+    store_dir = str(tmp_path)
+    monkeypatch.setattr(helper, 'FLUSH_SIZE', 1)
+    helper.store_sync_source(store_dir, 'https://a', [['Tytuł 1', '/1']])
+    stored_before_end = []
+
+    def listing():
+        yield ['Tytuł 2', '/2']
+        yield ['Tytuł 1', '/1b']
+        # generator jest wstrzymany - odczyt z dysku, a nie ze stanu w pamięci
+        stored_before_end.append([article['title'] for article in helper.store_iter_articles(store_dir)])
+        yield ['Tytuł 3', '/3']
+
+    report = helper.store_sync_source(store_dir, 'https://a', listing())
+
+    assert stored_before_end == [['Tytuł 1', 'Tytuł 2']]
+    assert report == {'added': 2, 'updated': 1, 'removed': 0}
+    assert [article['link'].rsplit('/', 1)[-1] for article in helper.store_iter_articles(store_dir)] == ['1b', '2', '3']
+    assert helper.store_load_manifest(store_dir)['next_id'] == 4
@@ -0,0 +1,71 @@
+"""
+Moduł zawiera testy jednostkowe funkcji znajdujących się w module stream_helper.py
+
+Klasy:
+- brak
+
+Funkcje:
+- read_chunks - Podział strony wzorcowej na kawałki o podanej wielkości
+- test_stream_articles_same_as_get_articles - Sprawdzenie czy parsowanie przyrostowe znajduje te same artykuły
+- test_stream_articles_emits_before_end - Sprawdzenie czy artykuł jest zwracany przed przekazaniem całej strony
+- test_stream_articles_empty - Sprawdzenie czy pojawia się wyjątek przy braku artykułów
+
+Wyjątki (exceptions):
+- brak
+
+Inne obiekty:
+- brak
+"""
+# Third party imports
+import pytest
+
+# Local application import
+import article_reader.article_reader as ar
+import article_reader.stream_helper as sh
+
+
+def read_chunks(size: int) -> list:
+    """ Podział strony wzorcowej na kawałki o podanej wielkości
+
+    :param size: Wielkość kawałka w bajtach
+    :type size: int
+    :return: Lista kawałków strony
+    :rtype: list[bytes]
+    """
+    with open('./data/test_data_get_articles.txt', 'rb') as data_file:
+        content = data_file.read()
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+def test_stream_articles_same_as_get_articles():
+    """ Sprawdzenie czy parsowanie przyrostowe znajduje te same artykuły co funkcja get_articles """
+    chunks = read_chunks(1000)
+
+    streamed = list(sh.stream_articles(chunks))
+    expected = [tuple(article) for article in ar.get_articles(b''.join(chunks))]
+
+    assert sorted(streamed) == sorted(expected)
+
+
+def test_stream_articles_emits_before_end():
+    """ Sprawdzenie czy pierwszy artykuł jest zwracany zanim parser otrzyma całą stronę """
+    chunks = read_chunks(1000)
+    consumed = []
+
+    def feed():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    first = next(sh.stream_articles(feed()))
+
+    assert first[0]
+    assert len(consumed) < len(chunks)
+
+
+def test_stream_articles_empty():
+    """ Sprawdzenie czy pojawia się wyjątek, gdy w stronie nie ma artykułów """
+    with pytest.raises(Exception):
+        list(sh.stream_articles([b'<html><body><p>brak</p></body></html>']))
+    with pytest.raises(Exception):
+        list(sh.stream_articles([]))
@@ -9,10 +9,7 @@ Funkcje:
 - create_node_from_string - Utworzenie jednego artykułu na potrzeby testów
 - test_xml_get_max_id - Sprawdzenie czy funkcja zwraca maksymalny numer id z pliku xml
 - test_xml_get_new_id - Sprawdzenie czy funkcja zwraca identyfikator o jeden większy od aktualnego
-- test_xml_modify_tree - Sprawdzenie czy funkcja zwraca ilość nowych artykułów
-- test_xml_modify_tree_2 - Sprawdzenie czy funkcja dodała nowe artykuły do istniejącego xml-a
 - test_xml_find_all_articles - Sprawdzenie czy funkcja zwraca prawidłową liczbę wszystkich i przeczytanych artykułów
-- test_xml_save_articles - Sprawdzenie czy funkcja zwraca prawidłową liczbę nowo dodanych artykułów
 - test_xml_create_article - Sprawdzenie czy funkcja generuje węzeł xml z prawidłową strukturą
 
 Wyjątki (exceptions):
@@ -96,40 +93,6 @@ def test_xml_get_new_id(mock_get_max_id):
     mock_get_max_id.assert_called_once()
 
 
-@patch('article_reader.xml_helper.xml_create_article')
-def test_xml_modify_tree(mock_xml_create_article):
-    """ Sprawdzenie czy funkcja zwraca ilość nowych artykułów
-
-    Test używa mocka i sprawdza czy mock został wywołany.
-    """
-    article_list = [['tytuł 1', 'link 1'], ['tytuł 2', 'link 2']]
-    elem = create_xml_from_string()
-
-    mock_xml_create_article.return_value = create_node_from_string()
-
-    assert helper.xml_modify_tree(article_list, elem) == 2
-    assert mock_xml_create_article.call_count == 2
-
-
-@patch('article_reader.xml_helper.xml_create_article')
-def test_xml_modify_tree_2(mock_xml_create_article):
-    """ Sprawdzenie czy funkcja dodała nowe artykuły do istniejącego xml-a
-
-    Test używa mocka i sprawdza czy mock został wywołany.
-    """
-    article_list = [['tytuł 1', 'link 1'], ['tytuł 2', 'link 2']]
-    elem = create_xml_from_string()
-    mock_xml_create_article.return_value = create_node_from_string()
-
-    helper.xml_modify_tree(article_list, elem)
-    count = 0
-    for elem in elem.iter():
-        if elem.tag == 'article':
-            count += 1
-    assert count == 6
-    mock_xml_create_article.assert_called()
-
-
 @patch('article_reader.xml_helper.xml_load_tree')
 def test_xml_find_all_articles(mock_xml_load_tree):
     """ Sprawdzenie czy funkcja zwraca prawidłową liczbę wszystkich i przeczytanych artykułów
@@ -146,28 +109,6 @@ def test_xml_find_all_articles(mock_xml_load_tree):
     mock_xml_load_tree.assert_called_once()
 
 
-@patch('article_reader.xml_helper.xml_load_tree')
-@patch('article_reader.xml_helper.xml_modify_tree')
-@patch('article_reader.xml_helper.xml_save_to_file')
-def test_xml_save_articles(mock_save_to_file, mock_xml_modify_tree, mock_xml_load_tree):
-    """ Sprawdzenie czy funkcja zwraca prawidłową liczbę nowo dodanych artykułów
-
-    Test używa trzech mocków i sprawdza czy zostały one wywołane. Ważna jest tutaj kolejność mocków w @patch oraz
-    w parametrach funkcji. Kolejność musi być taka, że @patch najbliżej definicji funkcji jest jednocześnie pierwszym
-    parametrem funkcji. W przeciwnym wypadku mocki się pomieszają. Widać to w trybie debug, w podglądzie zmiennych
-    """
-    mock_save_to_file.return_value = None
-    mock_xml_load_tree.return_value = ElementTree.ElementTree(create_xml_from_string())
-    mock_xml_modify_tree.return_value = 8
-
-    new_list = [['tyt', 'link'], ['tyt2', 'link2']]
-
-    assert helper.xml_save_articles(new_list, '') == 8
-    mock_xml_modify_tree.assert_called_once()
-    mock_xml_load_tree.assert_called_once()
-    mock_save_to_file.assert_called_once()
-
-
 def test_xml_create_article():
     """ Sprawdzenie czy funkcja generuje węzeł xml z prawidłową strukturą """
     title = "tytuł"
@@ -185,4 +126,3 @@ def test_xml_create_article():
     assert len(new_node.items()) == 2
     assert type(new_node.find('title')) is ElementTree.Element
     assert type(new_node.find('link')) is ElementTree.Element
-